@@ -6,6 +6,7 @@ import {
   isLocalRuntimePairingError,
   loadLocalRuntimePairingKey,
   normalizeLocalRuntimeBaseUrl,
+  parseServerTiming,
   removeLocalRuntimePairingKey,
   requireLocalRuntimePairingKey,
   resolveLocalRuntimeGatewayOrigin,
@@ -252,6 +253,18 @@ describe("local runtime connection boundary", () => {
     vi.useRealTimers();
   });
 
+  it("reads the gateway phase breakdown from Server-Timing", () => {
+    const header =
+      "queue_wait;dur=12.50, prefill;dur=340, decode;desc=x;dur=1200.25, bad, total;dur=1560";
+    expect(parseServerTiming(header)).toEqual({
+      queue_wait: 12.5,
+      prefill: 340,
+      decode: 1200.25,
+      total: 1560
+    });
+    expect(parseServerTiming(null)).toEqual({});
+  });
+
   it("maps a busy model to an actionable non-queuing error", async () => {
     vi.stubGlobal(
       "fetch",
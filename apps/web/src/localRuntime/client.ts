@@ -252,6 +252,21 @@ const localFetch = async (
   }
 };
 
+/** Gateway phase durations in milliseconds, keyed by phase (`queue_wait`, `prefill`, `total`, ...). */
+export type LocalRuntimeTimings = Record<string, number>;
+
+export const parseServerTiming = (header: string | null): LocalRuntimeTimings => {
+  const timings: LocalRuntimeTimings = {};
+  for (const entry of header?.split(",") ?? []) {
+    const [name, ...params] = entry.split(";").map((part) => part.trim());
+    const duration = params.find((param) => param.startsWith("dur="));
+    if (!name || !duration) continue;
+    const value = Number(duration.slice(4));
+    if (Number.isFinite(value)) timings[name] = value;
+  }
+  return timings;
+};
+
 export type LocalRuntimeHealth = {
   service: typeof GATEWAY_SERVICE_ID;
   protocol_version: typeof GATEWAY_PROTOCOL_VERSION;
@@ -304,6 +319,7 @@ export type LocalTranscription = {
   text: string;
   model: string;
   durationMs: number;
+  timings: LocalRuntimeTimings;
 };
 
 export const transcribeWithLocalRuntime = async ({
@@ -349,7 +365,8 @@ export const transcribeWithLocalRuntime = async ({
   return {
     text,
     model: payload.model ?? "local-stt",
-    durationMs: Math.round(performance.now() - startedAt)
+    durationMs: Math.round(performance.now() - startedAt),
+    timings: parseServerTiming(response.headers.get("Server-Timing"))
   };
 };
 
@@ -395,6 +412,7 @@ export type LocalEvaluation = {
   evaluation: EvaluationResult;
   model: string;
   durationMs: number;
+  timings: LocalRuntimeTimings;
 };
 
 export const evaluateWithLocalRuntime = async ({
@@ -460,6 +478,7 @@ export const evaluateWithLocalRuntime = async ({
   return {
     evaluation: validated.data,
     model: payload.model ?? "local-llm",
-    durationMs: Math.round(performance.now() - startedAt)
+    durationMs: Math.round(performance.now() - startedAt),
+    timings: parseServerTiming(response.headers.get("Server-Timing"))
   };
 };
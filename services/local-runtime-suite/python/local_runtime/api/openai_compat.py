@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import time
 import uuid
 from collections.abc import AsyncIterator, Iterable
@@ -9,6 +8,7 @@ from typing import Any
 from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 
 from local_runtime.core.loader import LoadedModel
+from local_runtime.core.sse import SSE_COALESCE_SECONDS, encode_event_stream
 
 
 def _build_response_payload(
@@ -60,13 +60,13 @@ def format_responses_create(
     return _build_response_payload(model, str(result), request_id=request_id, created_ts=created_ts)
 
 
-async def format_responses_stream(events_iter: AsyncIterator[dict]) -> AsyncIterator[str]:
-    """Render SSE output for Responses stream events."""
-    async for payload in events_iter:
-        event = payload.get("event", "message")
-        data = payload.get("data", {})
-        json_payload = json.dumps(data, ensure_ascii=False)
-        yield f"event: {event}\ndata: {json_payload}\n\n"
+def format_responses_stream(
+    events_iter: AsyncIterator[dict], *, coalesce_seconds: float | None = None
+) -> AsyncIterator[bytes]:
+    """Render SSE output for Responses stream events as pre-encoded bytes."""
+    if coalesce_seconds is None:
+        coalesce_seconds = SSE_COALESCE_SECONDS
+    return encode_event_stream(events_iter, coalesce_seconds=coalesce_seconds)
 
 
 def format_audio_speech_response(data: Any, content_type: str, stream: bool) -> Response:
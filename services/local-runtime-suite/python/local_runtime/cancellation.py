@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import heapq
+import itertools
+import os
 import re
 import threading
 import time
-from collections import OrderedDict
-from collections.abc import Iterator
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable, Iterator
 from contextlib import contextmanager
 from dataclasses import dataclass, field
+from typing import Any
 
 CLIENT_REQUEST_ID_PATTERN = re.compile(r"^lrq_[0-9a-f]{32}$")
 MODEL_LOCK_TIMEOUT_SECONDS = 0.1
 FINISHED_REQUEST_CACHE_SIZE = 256
+MODEL_QUEUE_MAX_DEPTH = int(os.getenv("LOCAL_RUNTIME_MODEL_QUEUE_DEPTH", "4") or "4")
+MODEL_QUEUE_MAX_WAIT_SECONDS = float(os.getenv("LOCAL_RUNTIME_MODEL_QUEUE_MAX_WAIT_SEC", "180") or "180")
 
 
 class InferenceCancelledError(RuntimeError):
@@ -22,7 +30,7 @@ class InferenceTimeoutError(InferenceCancelledError):
 
 
 class ModelBusyError(RuntimeError):
-    """Raised instead of queueing behind another inference request."""
+    """Raised when a model's request queue is full or the queue wait expires."""
 
 
 class RequestIdInUseError(RuntimeError):
@@ -31,14 +39,44 @@ class RequestIdInUseError(RuntimeError):
 
 @dataclass
 class CancellationToken:
+    """Cancellation state shared by the gateway, queue waiters and backend threads.
+
+    The first ``cancel`` wins and runs the registered callbacks exactly once; a deadline
+    is applied by ``DEADLINES`` when it passes. Decode loops call ``is_set``, a single
+    lock-free flag read. ``cancelled`` also compares the deadline with the clock, so
+    it stays exact between the deadline passing and the timer firing.
+    """
+
     request_id: str
     deadline: float | None = None
+    queue_position: int | None = None
+    queue_wait_ms: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
     _event: threading.Event = field(default_factory=threading.Event, repr=False)
     _reason: str = field(default="cancelled", repr=False)
+    _callbacks: list[Callable[[], None]] = field(default_factory=list, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.deadline is not None:
+            DEADLINES.schedule(self)
 
     def cancel(self, reason: str = "cancelled") -> None:
-        self._reason = reason
-        self._event.set()
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def reason(self) -> str:
+        return self._reason
 
     @property
     def cancelled(self) -> bool:
@@ -49,6 +87,41 @@ class CancellationToken:
             return True
         return False
 
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run ``callback`` on the cancelling thread, or now if already cancelled.
+
+        Returns a function that unregisters the callback.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock, contextlib.suppress(ValueError):
+            self._callbacks.remove(callback)
+
+    async def wait(self) -> None:
+        """Return once the token is cancelled, woken by its callback rather than polling."""
+        loop = asyncio.get_running_loop()
+        cancelled: asyncio.Future[None] = loop.create_future()
+
+        def _resolve() -> None:
+            if not cancelled.done():
+                cancelled.set_result(None)
+
+        def _wake() -> None:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_resolve)
+
+        remove = self.add_callback(_wake)
+        try:
+            await cancelled
+        finally:
+            remove()
+
     def raise_if_cancelled(self) -> None:
         if self.cancelled:
             if self._reason == "timeout":
@@ -56,6 +129,65 @@ class CancellationToken:
             raise InferenceCancelledError("The local inference request was cancelled.")
 
 
+class DeadlineTimer:
+    """Cancel tokens with reason ``"timeout"`` when their deadlines pass.
+
+    Deadlines wait in a min-heap served by one daemon thread. The thread sleeps until
+    the earliest is due, so an idle gateway never wakes it. Entries for tokens that
+    were cancelled first are dropped when they reach the top of the heap, or in a bulk
+    compaction once the heap doubles.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, CancellationToken]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition(threading.Lock())
+        self._compact_at = 256
+        self._thread: threading.Thread | None = None
+
+    def schedule(self, token: CancellationToken) -> None:
+        if token.deadline is None:
+            return
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cancellation-deadlines", daemon=True)
+                self._thread.start()
+            if len(self._heap) >= self._compact_at:
+                self._heap = [entry for entry in self._heap if not entry[2].is_set()]
+                heapq.heapify(self._heap)
+                self._compact_at = max(256, 2 * len(self._heap))
+            heapq.heappush(self._heap, (token.deadline, next(self._sequence), token))
+            if self._heap[0][2] is token:
+                self._condition.notify()
+
+    def pending(self) -> int:
+        with self._condition:
+            return sum(1 for _deadline, _sequence, token in self._heap if not token.is_set())
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    while self._heap and self._heap[0][2].is_set():
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                now = time.monotonic()
+                due: list[CancellationToken] = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap)[2])
+            for token in due:
+                token.cancel("timeout")
+
+
+DEADLINES = DeadlineTimer()
+
+
 class ActiveRequestRegistry:
     """Own cancellation tokens without retaining request content or credentials."""
 
@@ -91,11 +223,158 @@ class ActiveRequestRegistry:
             while len(self._finished) > self._finished_cache_size:
                 self._finished.popitem(last=False)
 
+    def active_count(self) -> int:
+        with self._lock:
+            return len(self._active)
+
     def is_active(self, request_id: str) -> bool:
         with self._lock:
             return request_id in self._active
 
 
+class DisconnectMonitor:
+    """Cancel request tokens the moment their client disconnects.
+
+    ASGI reports a disconnect only as an ``http.disconnect`` message on that request's
+    ``receive`` channel, so each watched request parks one waiter on it. The waiter
+    sleeps until the server delivers the message (no polling or timer wakeups) and
+    then cancels the token. The monitor owns every waiter so shutdown can stop them.
+    """
+
+    def __init__(self) -> None:
+        self._waiters: set[asyncio.Task[None]] = set()
+
+    def watch(self, receive: Callable[[], Awaitable[dict]], token: CancellationToken) -> asyncio.Task[None]:
+        """Start waiting for ``receive`` to report a disconnect; cancel the task to stop."""
+        waiter = asyncio.create_task(self._wait(receive, token), name=f"disconnect:{token.request_id}")
+        self._waiters.add(waiter)
+        waiter.add_done_callback(self._waiters.discard)
+        return waiter
+
+    @staticmethod
+    async def _wait(receive: Callable[[], Awaitable[dict]], token: CancellationToken) -> None:
+        # The body has been read before inference starts, so the next message is the disconnect.
+        while (await receive()).get("type") != "http.disconnect":
+            pass
+        token.cancel()
+
+    def watching(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def close(self) -> None:
+        waiters = list(self._waiters)
+        for waiter in waiters:
+            waiter.cancel()
+        for waiter in waiters:
+            with contextlib.suppress(asyncio.CancelledError):
+                await waiter
+
+
+class ModelRequestQueue:
+    """FIFO admission queue guarding exclusive access to one model instance.
+
+    Requests that arrive while the model is busy wait in arrival order instead of
+    failing fast. The queue is bounded by depth and by a maximum wait, and waiters
+    are woken the moment their cancellation token fires.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        *,
+        max_depth: int = MODEL_QUEUE_MAX_DEPTH,
+        max_wait_seconds: float = MODEL_QUEUE_MAX_WAIT_SECONDS,
+    ) -> None:
+        self.model_id = model_id
+        self.max_depth = max(0, max_depth)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+        # Reentrant: a token cancelled while this thread holds the lock notifies it again.
+        self._condition = threading.Condition(threading.RLock())
+        self._waiting: deque[object] = deque()
+        self._busy = False
+        self._admitted = 0
+        self._rejected = 0
+
+    def admit(self, token: CancellationToken | None = None, *, max_wait_seconds: float | None = None) -> int:
+        """Block until this caller owns the model and return its initial queue position."""
+        wait_seconds = self.max_wait_seconds if max_wait_seconds is None else max_wait_seconds
+        ticket = object()
+        with self._condition:
+            if not self._busy and not self._waiting:
+                self._busy = True
+                self._admitted += 1
+                return 0
+            if len(self._waiting) >= self.max_depth:
+                self._rejected += 1
+                raise ModelBusyError("The local model queue is full. Retry in a moment.")
+            self._waiting.append(ticket)
+            position = len(self._waiting)
+            give_up_at = time.monotonic() + wait_seconds
+            remove_callback = token.add_callback(self._wake) if token is not None else None
+            try:
+                while self._busy or self._waiting[0] is not ticket:
+                    if token is not None:
+                        token.raise_if_cancelled()
+                    remaining = give_up_at - time.monotonic()
+                    if token is not None and token.deadline is not None:
+                        remaining = min(remaining, token.deadline - time.monotonic())
+                    if remaining <= 0:
+                        if token is not None:
+                            token.raise_if_cancelled()
+                        self._rejected += 1
+                        raise ModelBusyError("The local model queue wait expired. Retry in a moment.")
+                    self._condition.wait(remaining)
+                self._busy = True
+                self._admitted += 1
+            finally:
+                if remove_callback is not None:
+                    remove_callback()
+                self._waiting.remove(ticket)
+                self._condition.notify_all()
+        return position
+
+    def _wake(self) -> None:
+        with self._condition:
+            self._condition.notify_all()
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if not blocking:
+            with self._condition:
+                if self._busy or self._waiting:
+                    return False
+                self._busy = True
+                self._admitted += 1
+                return True
+        try:
+            self.admit(max_wait_seconds=None if timeout < 0 else timeout)
+        except ModelBusyError:
+            return False
+        return True
+
+    def release(self) -> None:
+        with self._condition:
+            self._busy = False
+            self._condition.notify_all()
+
+    def __enter__(self) -> None:
+        if not self.acquire():
+            raise ModelBusyError("The local model queue is full. Retry in a moment.")
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.release()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._condition:
+            return {
+                "busy": self._busy,
+                "depth": len(self._waiting),
+                "max_depth": self.max_depth,
+                "max_wait_seconds": self.max_wait_seconds,
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+            }
+
+
 def validate_client_request_id(value: str) -> str:
     if not CLIENT_REQUEST_ID_PATTERN.fullmatch(value):
         raise ValueError("X-Request-ID must use the form lrq_ followed by 32 lowercase hex characters.")
@@ -104,15 +383,20 @@ def validate_client_request_id(value: str) -> str:
 
 @contextmanager
 def acquire_model_lock(
-    lock: threading.Lock,
+    lock: threading.Lock | ModelRequestQueue,
     token: CancellationToken | None,
     *,
     timeout_seconds: float = MODEL_LOCK_TIMEOUT_SECONDS,
 ) -> Iterator[None]:
     if token is not None:
         token.raise_if_cancelled()
-    acquired = lock.acquire(timeout=timeout_seconds)
-    if not acquired:
+    if isinstance(lock, ModelRequestQueue):
+        started = time.monotonic()
+        position = lock.admit(token)
+        if token is not None:
+            token.queue_position = position
+            token.queue_wait_ms += round((time.monotonic() - started) * 1000, 2)
+    elif not lock.acquire(timeout=timeout_seconds):
         raise ModelBusyError("The previous local model request is still finishing. Retry in a moment.")
     try:
         if token is not None:
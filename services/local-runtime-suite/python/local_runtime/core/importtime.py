@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+
+# What the gateway imports before it can answer /health: the app module plus adapter discovery.
+STARTUP_IMPORTS = (
+    "import local_runtime.main; from local_runtime.core.loader import load_models; load_models()"
+)
+DEFAULT_REPORT_ROWS = 25
+
+_LINE_PATTERN = re.compile(r"^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$")
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse the stderr of ``python -X importtime`` into one entry per imported module."""
+    timings: list[ImportTiming] = []
+    for line in output.splitlines():
+        match = _LINE_PATTERN.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        timings.append(
+            ImportTiming(
+                module=module,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=max(0, (len(indent) - 1) // 2),
+            )
+        )
+    return timings
+
+
+def profile_imports(statement: str = STARTUP_IMPORTS) -> list[ImportTiming]:
+    """Run ``statement`` in a fresh interpreter under ``-X importtime`` and parse the result."""
+    if getattr(sys, "frozen", False):
+        raise RuntimeError("Import profiling needs a Python interpreter; it is unavailable in frozen builds.")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        tail = completed.stderr.strip().splitlines()[-1:] or ["no output"]
+        raise RuntimeError(f"Import profiling failed: {tail[0]}")
+    return parse_importtime(completed.stderr)
+
+
+def format_report(timings: list[ImportTiming], *, rows: int = DEFAULT_REPORT_ROWS) -> str:
+    total_us = sum(timing.cumulative_us for timing in timings if timing.depth == 0)
+    lines = [
+        f"total import time: {total_us / 1000:.1f} ms across {len(timings)} modules",
+        "",
+        f"{'cumulative ms':>13}  {'self ms':>8}  module",
+    ]
+    for timing in sorted(timings, key=lambda timing: timing.cumulative_us, reverse=True)[:rows]:
+        lines.append(f"{timing.cumulative_us / 1000:>13.1f}  {timing.self_us / 1000:>8.1f}  {timing.module}")
+    return "\n".join(lines)
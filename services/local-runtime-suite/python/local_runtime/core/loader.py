@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import ast
 import importlib
 import pkgutil
 from collections.abc import Iterable
 from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any
 
 from local_runtime.core.errors import ValidationError
 from local_runtime.spec import ModelSpec, validate_spec
@@ -12,8 +16,49 @@ from local_runtime.spec import ModelSpec, validate_spec
 @dataclass
 class LoadedModel:
     name: str
-    module: object
+    module: Any
     spec: ModelSpec
+    # Top-level names of the adapter when they were read statically; None means "ask the module".
+    hook_names: frozenset[str] | None = None
+
+    def has_hook(self, hook: str) -> bool:
+        if self.hook_names is not None:
+            return hook in self.hook_names
+        return callable(getattr(self.module, hook, None))
+
+
+class LazyModule:
+    """Stand-in for an adapter module that imports it on first attribute access.
+
+    Attribute writes go to the real module, so ``monkeypatch.setattr(loaded.module, ...)``
+    patches the adapter exactly as it did when modules were imported eagerly.
+    """
+
+    def __init__(self, name: str) -> None:
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            object.__setattr__(self, "_module", importlib.import_module(self._name))
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyModule {self._name} ({state})>"
 
 
 def iter_model_modules() -> Iterable[str]:
@@ -23,9 +68,64 @@ def iter_model_modules() -> Iterable[str]:
             yield f"local_runtime.models.{module_info.name}"
 
 
-def load_models() -> list[LoadedModel]:
+def read_static_spec(module_name: str) -> tuple[dict[str, Any], frozenset[str]] | None:
+    """Read ``SPEC`` and the top-level names of an adapter from its source without importing it.
+
+    Returns None when the source is unavailable or ``SPEC`` is not a plain literal, in
+    which case the caller falls back to importing the module.
+    """
+    package = importlib.import_module("local_runtime.models")
+    filename = f"{module_name.rsplit('.', 1)[-1]}.py"
+    for directory in package.__path__:
+        path = Path(directory) / filename
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        except (OSError, SyntaxError, UnicodeDecodeError):
+            continue
+        break
+    else:
+        return None
+    spec: dict[str, Any] | None = None
+    names: set[str] = set()
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef):
+            names.add(node.name)
+        elif isinstance(node, ast.Import | ast.ImportFrom):
+            names.update((alias.asname or alias.name).split(".", 1)[0] for alias in node.names)
+        elif isinstance(node, ast.Assign | ast.AnnAssign):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if not isinstance(target, ast.Name):
+                    continue
+                names.add(target.id)
+                if target.id == "SPEC" and node.value is not None:
+                    try:
+                        spec = ast.literal_eval(node.value)
+                    except ValueError:
+                        return None
+    if not isinstance(spec, dict):
+        return None
+    return spec, frozenset(names)
+
+
+def load_models(*, lazy: bool = True) -> list[LoadedModel]:
+    """Discover adapters and validate their specs.
+
+    With ``lazy`` (the default) specs are parsed from source and each adapter is
+    imported only when it is first used, so startup never pays for backend modules.
+    """
     loaded: list[LoadedModel] = []
     for module_name in iter_model_modules():
+        static = read_static_spec(module_name) if lazy else None
+        if static is not None:
+            raw_spec, hook_names = static
+            spec = validate_spec(raw_spec)
+            loaded.append(
+                LoadedModel(
+                    name=module_name, module=LazyModule(module_name), spec=spec, hook_names=hook_names
+                )
+            )
+            continue
         module = importlib.import_module(module_name)
         if not hasattr(module, "SPEC"):
             raise ValidationError(f"{module_name} is missing SPEC")
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import math
+import threading
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+LOAD_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+RATE_BUCKETS = (1.0, 2.5, 5.0, 10.0, 15.0, 20.0, 30.0, 50.0, 75.0, 100.0, 200.0)
+RATIO_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 4.0)
+COUNT_BUCKETS = (1.0, 2.0, 3.0, 4.0, 5.0)
+# Observations are queued and folded into the families when this many are pending or on scrape.
+MAX_PENDING_OBSERVATIONS = 4096
+
+Labels = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class MetricFamily:
+    """A metric computed at scrape time (gauges and counters read from runtime state)."""
+
+    name: str
+    kind: str
+    help: str
+    samples: list[tuple[Mapping[str, Any], float]] = field(default_factory=list)
+
+
+@dataclass
+class _Histogram:
+    buckets: tuple[float, ...]
+    counts: list[int]
+    total: float = 0.0
+    count: int = 0
+
+
+@dataclass
+class _Family:
+    name: str
+    kind: str
+    help: str
+    buckets: tuple[float, ...] = ()
+    series: dict[Labels, Any] = field(default_factory=dict)
+
+
+class MetricsRegistry:
+    """Counters and histograms rendered in the Prometheus text format.
+
+    ``observe``/``inc`` only append to a deque (atomic under the GIL), so request
+    handlers and worker threads never contend on a lock. Observations are folded
+    into the families under a lock when ``render`` runs or the queue grows large.
+    Runtime state that already keeps its own counters (queues, caches, residency) is
+    read by collectors at scrape time instead of being mirrored here.
+    """
+
+    def __init__(self, namespace: str = "local_runtime") -> None:
+        self.namespace = namespace
+        self._families: dict[str, _Family] = {}
+        self._pending: deque[tuple[str, Labels, float]] = deque()
+        self._lock = threading.Lock()
+        self._collectors: dict[str, Callable[[], Iterable[MetricFamily]]] = {}
+
+    def counter(self, name: str, help: str) -> None:
+        self._families.setdefault(name, _Family(name=name, kind="counter", help=help))
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self._families.setdefault(
+            name, _Family(name=name, kind="histogram", help=help, buckets=tuple(sorted(buckets)))
+        )
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        if value is None or math.isnan(value):
+            return
+        self._pending.append((name, _labels(labels), float(value)))
+        if len(self._pending) > MAX_PENDING_OBSERVATIONS:
+            self._drain()
+
+    def inc(self, name: str, amount: float = 1.0, **labels: Any) -> None:
+        self.observe(name, amount, **labels)
+
+    def take_pending(self) -> list[tuple[str, Labels, float]]:
+        """Remove and return the queued observations, for a worker process to hand to the gateway."""
+        taken: list[tuple[str, Labels, float]] = []
+        while self._pending:
+            taken.append(self._pending.popleft())
+        return taken
+
+    def replay(self, observations: Iterable[tuple[str, Labels, float]]) -> None:
+        """Queue observations taken from another process's registry."""
+        self._pending.extend((name, tuple(map(tuple, labels)), value) for name, labels, value in observations)
+        if len(self._pending) > MAX_PENDING_OBSERVATIONS:
+            self._drain()
+
+    def set_collector(self, key: str, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        self._collectors[key] = collector
+
+    def remove_collector(self, key: str) -> None:
+        self._collectors.pop(key, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            for family in self._families.values():
+                family.series.clear()
+
+    def render(self) -> str:
+        self._drain()
+        lines: list[str] = []
+        with self._lock:
+            for family in self._families.values():
+                lines.extend(self._render_family(family))
+        for collector in list(self._collectors.values()):
+            for family in collector():
+                name = f"{self.namespace}_{family.name}"
+                lines.append(f"# HELP {name} {family.help}")
+                lines.append(f"# TYPE {name} {family.kind}")
+                for labels, value in family.samples:
+                    lines.append(f"{name}{_format_labels(_labels(labels))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _drain(self) -> None:
+        with self._lock:
+            while self._pending:
+                name, labels, value = self._pending.popleft()
+                family = self._families.get(name)
+                if family is None:
+                    continue
+                if family.kind == "counter":
+                    family.series[labels] = family.series.get(labels, 0.0) + value
+                    continue
+                histogram = family.series.get(labels)
+                if histogram is None:
+                    histogram = _Histogram(buckets=family.buckets, counts=[0] * len(family.buckets))
+                    family.series[labels] = histogram
+                index = bisect_left(family.buckets, value)
+                if index < len(family.buckets):
+                    histogram.counts[index] += 1
+                histogram.total += value
+                histogram.count += 1
+
+    def _render_family(self, family: _Family) -> list[str]:
+        name = f"{self.namespace}_{family.name}"
+        lines = [f"# HELP {name} {family.help}", f"# TYPE {name} {family.kind}"]
+        for labels, value in sorted(family.series.items()):
+            if family.kind == "counter":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(value.buckets, value.counts, strict=True):
+                cumulative += count
+                bucket_labels = (*labels, ("le", _format_value(bound)))
+                lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels((*labels, ('le', '+Inf')))} {value.count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value.total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {value.count}")
+        return lines
+
+
+def _labels(labels: Mapping[str, Any]) -> Labels:
+    return tuple(sorted((key, "" if value is None else str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+METRICS = MetricsRegistry()
+METRICS.histogram("request_duration_seconds", "Inference request latency by endpoint and model.")
+METRICS.histogram("queue_wait_seconds", "Time requests waited for a model's request queue.")
+METRICS.histogram("model_load_duration_seconds", "Model load (and warmup) duration.", LOAD_BUCKETS)
+METRICS.histogram("time_to_first_token_seconds", "Time from request start to the first streamed delta.")
+METRICS.histogram("tokens_per_second", "Decode throughput of completed generations.", RATE_BUCKETS)
+METRICS.histogram("stt_real_time_factor", "Transcription time divided by audio duration.", RATIO_BUCKETS)
+METRICS.histogram("structured_output_attempts", "Generation attempts per structured request.", COUNT_BUCKETS)
+METRICS.counter("structured_output_failures_total", "Structured requests that exhausted their attempts.")
+METRICS.counter("prompt_tokens_total", "Prompt tokens processed by language models.")
+METRICS.counter("generated_tokens_total", "Tokens generated by language models.")
+
+
+def observe_transcription(
+    model_id: str, segments: Iterable[Mapping[str, Any]], elapsed_seconds: float
+) -> None:
+    """Record the real-time factor of a finished transcription from its segment timestamps."""
+    audio_seconds = max((float(segment.get("end") or 0.0) for segment in segments), default=0.0)
+    if audio_seconds > 0:
+        METRICS.observe("stt_real_time_factor", elapsed_seconds / audio_seconds, model=model_id)
+
+
+def observe_generation(model_id: str, usage: Mapping[str, Any]) -> None:
+    """Record token counts and decode throughput from a generation's ``usage`` block."""
+    METRICS.inc("prompt_tokens_total", usage.get("input_tokens") or 0, model=model_id)
+    METRICS.inc("generated_tokens_total", usage.get("output_tokens") or 0, model=model_id)
+    if usage.get("decode_tokens_per_second"):
+        METRICS.observe("tokens_per_second", usage["decode_tokens_per_second"], model=model_id)
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Any
 
+TIMELINE_BAR_WIDTH = 40
+
 
 @dataclass
 class CheckResult:
@@ -13,6 +17,15 @@ class CheckResult:
     duration_ms: float | None = None
 
 
+@dataclass
+class PhaseTiming:
+    name: str
+    start_ms: float
+    end_ms: float | None = None
+    status: str = "running"
+    detail: str | None = None
+
+
 @dataclass
 class SelfTestState:
     status: str = "pending"
@@ -32,6 +45,8 @@ class ReadinessTracker:
         self.platform_id: str | None = None
         self.loaded_models: list[str] = []
         self.last_error: str | None = None
+        self.timeline: list[PhaseTiming] = []
+        self._origin = time.perf_counter()
 
     def mark_phase(
         self, name: str, status: str, detail: str | None = None, duration_ms: float | None = None
@@ -44,6 +59,48 @@ class ReadinessTracker:
         elif status == "degraded" and self.status != "error":
             self.status = "degraded"
 
+    @contextmanager
+    def timed_phase(self, name: str) -> Iterator[PhaseTiming]:
+        """Record when a startup step ran, relative to tracker creation, without touching status."""
+        phase = PhaseTiming(name=name, start_ms=self._elapsed_ms())
+        self.timeline.append(phase)
+        try:
+            yield phase
+        except BaseException as exc:
+            phase.status = "error"
+            phase.detail = phase.detail or (str(exc) or type(exc).__name__)
+            raise
+        else:
+            if phase.status == "running":
+                phase.status = "ok"
+        finally:
+            phase.end_ms = self._elapsed_ms()
+
+    def timeline_payload(self) -> list[dict[str, Any]]:
+        """Phases sorted by start with a text bar per phase, so overlapping steps line up."""
+        now = self._elapsed_ms()
+        span = max([phase.end_ms or now for phase in self.timeline] + [1.0])
+        payload = []
+        for phase in sorted(self.timeline, key=lambda item: item.start_ms):
+            end_ms = phase.end_ms if phase.end_ms is not None else now
+            first = min(TIMELINE_BAR_WIDTH - 1, int(phase.start_ms / span * TIMELINE_BAR_WIDTH))
+            last = min(TIMELINE_BAR_WIDTH, max(first + 1, round(end_ms / span * TIMELINE_BAR_WIDTH)))
+            payload.append(
+                {
+                    "name": phase.name,
+                    "status": phase.status,
+                    "detail": phase.detail,
+                    "start_ms": round(phase.start_ms, 2),
+                    "end_ms": round(phase.end_ms, 2) if phase.end_ms is not None else None,
+                    "duration_ms": round(end_ms - phase.start_ms, 2),
+                    "bar": " " * first + "#" * (last - first) + " " * (TIMELINE_BAR_WIDTH - last),
+                }
+            )
+        return payload
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._origin) * 1000
+
     def mark_ready(self) -> None:
         if self.status != "error":
             self.status = "ready"
@@ -94,4 +151,5 @@ class ReadinessTracker:
                 "checks": [check.__dict__ for check in self.self_test.checks],
             },
             "last_error": self.last_error,
+            "startup_timeline": self.timeline_payload(),
         }
@@ -8,7 +8,20 @@ from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from typing import Any
 
+from local_runtime.cancellation import ModelRequestQueue
 from local_runtime.core.loader import LoadedModel
+from local_runtime.core.metrics import METRICS
+from local_runtime.core.residency import (
+    MAX_PARALLEL_LOADS,
+    LoadGate,
+    ResidencyManager,
+    idle_ttl_seconds,
+    physical_memory_bytes,
+    process_rss_bytes,
+    release_memory,
+)
+from local_runtime.helpers.prefix_cache import PrefixKVCache
+from local_runtime.helpers.transcription_cache import TranscriptionCache
 
 
 @dataclass
@@ -28,6 +41,7 @@ class ModelRegistry:
         platform_id: str,
         logger: logging.Logger,
         enable_warmup: bool = False,
+        memory_budget_bytes: int | None = None,
     ):
         self.platform_id = platform_id
         self.logger = logger
@@ -44,6 +58,20 @@ class ModelRegistry:
             model_id: asyncio.Lock() for model_id in self._models_by_id
         }
         self._load_tasks: dict[str, asyncio.Task[Any]] = {}
+        self.residency = ResidencyManager.from_specs(
+            (loaded.spec for loaded in self._models), budget_bytes=memory_budget_bytes
+        )
+        self.load_gate = LoadGate(
+            capacity_bytes=self.residency.budget_bytes if self.residency.enabled else physical_memory_bytes(),
+            max_parallel=MAX_PARALLEL_LOADS,
+        )
+        self._request_pins: dict[str, str] = {}
+        self.idle_ttls: dict[str, float] = {
+            loaded.spec.id: ttl
+            for loaded in self._models
+            if (ttl := idle_ttl_seconds(loaded.spec)) is not None
+        }
+        self._idle_reaper: asyncio.Task[None] | None = None
 
     def _build_indexes(self) -> None:
         for loaded in self._models:
@@ -56,15 +84,25 @@ class ModelRegistry:
                 "supports_stream": loaded.spec.api.supports_stream,
                 "kind": loaded.spec.kind,
             }
-            self._hooks[loaded.spec.id] = LifecycleHooks(
-                startup=getattr(loaded.module, "startup", None),
-                load=getattr(loaded.module, "load", None),
-                warmup=getattr(loaded.module, "warmup", None),
-                shutdown=getattr(loaded.module, "shutdown", None),
-            )
         for endpoint in self.models_by_endpoint:
             self.models_by_endpoint[endpoint].sort(key=lambda lm: lm.spec.compat.priority, reverse=True)
 
+    def _lifecycle(self, model_id: str) -> LifecycleHooks | None:
+        """Resolve a model's hooks on first use; this is what imports a lazily loaded adapter."""
+        hooks = self._hooks.get(model_id)
+        if hooks is None:
+            loaded = self._models_by_id.get(model_id)
+            if loaded is None:
+                return None
+            hooks = LifecycleHooks(
+                **{
+                    name: getattr(loaded.module, name, None) if loaded.has_hook(name) else None
+                    for name in ("startup", "load", "warmup", "shutdown")
+                }
+            )
+            self._hooks[model_id] = hooks
+        return hooks
+
     def get_loaded(self, model_id: str) -> LoadedModel | None:
         return self._models_by_id.get(model_id)
 
@@ -74,21 +112,137 @@ class ModelRegistry:
     def list_models(self) -> list[LoadedModel]:
         return list(self._models)
 
-    async def run_startup_hooks(self, ctx_factory: Callable[[str], Any]) -> None:
-        for model_id, hooks in self._hooks.items():
-            if not hooks.startup:
+    def request_queue_status(self) -> dict[str, dict[str, Any]]:
+        statuses: dict[str, dict[str, Any]] = {}
+        for model_id, instance in list(self.model_instances.items()):
+            if not isinstance(instance, dict):
+                continue
+            status: dict[str, Any] = {}
+            queue = instance.get("lock")
+            if isinstance(queue, ModelRequestQueue):
+                status.update(queue.snapshot())
+            engine = instance.get("batch_engine")
+            if engine is not None:
+                status["batch"] = engine.snapshot()
+            if status:
+                statuses[model_id] = status
+        return statuses
+
+    def prefix_cache_status(self) -> dict[str, dict[str, Any]]:
+        statuses: dict[str, dict[str, Any]] = {}
+        for model_id, instance in list(self.model_instances.items()):
+            if not isinstance(instance, dict):
+                continue
+            prefix_cache = instance.get("prefix_cache")
+            if isinstance(prefix_cache, PrefixKVCache):
+                statuses[model_id] = prefix_cache.snapshot()
+        return statuses
+
+    def transcription_cache_status(self) -> dict[str, dict[str, Any]]:
+        statuses: dict[str, dict[str, Any]] = {}
+        for model_id, instance in list(self.model_instances.items()):
+            if not isinstance(instance, dict):
                 continue
-            ctx = ctx_factory(f"startup:{model_id}")
-            await self._call_hook(hooks.startup, ctx, model_id=model_id, phase="startup")
+            transcription_cache = instance.get("transcription_cache")
+            if isinstance(transcription_cache, TranscriptionCache):
+                statuses[model_id] = transcription_cache.snapshot()
+        return statuses
+
+    def residency_status(self) -> dict[str, Any]:
+        return self.residency.snapshot()
+
+    def pin(self, model_id: str, request_id: str) -> None:
+        """Keep ``model_id`` resident until ``unpin(request_id)``; pins may precede the load."""
+        self._request_pins[request_id] = model_id
+        self.residency.pin(model_id)
+
+    def unpin(self, request_id: str) -> str | None:
+        model_id = self._request_pins.pop(request_id, None)
+        if model_id is not None:
+            self.residency.unpin(model_id)
+        return model_id
+
+    async def unload(self, model_id: str, ctx: Any, *, reason: str) -> bool:
+        """Drop a resident, unpinned instance and run its shutdown hook."""
+        async with self._load_locks[model_id]:
+            if model_id not in self.model_instances or self.residency.pinned(model_id):
+                return False
+            instance = self.model_instances.pop(model_id)
+            footprint = self.residency.resident.get(model_id)
+            self.residency.forget(model_id)
+        self.logger.info(
+            "model.unload",
+            extra={
+                "model_id": model_id,
+                "reason": reason,
+                "footprint_bytes": footprint.footprint_bytes if footprint else None,
+            },
+        )
+        hooks = self._lifecycle(model_id)
+        if hooks and hooks.shutdown:
+            try:
+                await self._call_hook(hooks.shutdown, instance, ctx, model_id=model_id, phase="unload")
+            except Exception:  # noqa: BLE001 - the instance is already released; keep serving
+                self.logger.warning("model.unload.shutdown_failed", extra={"model_id": model_id})
+        del instance
+        await asyncio.to_thread(release_memory)
+        return True
+
+    async def unload_idle(self, ctx_factory: Callable[[str], Any]) -> list[str]:
+        """Unload every model whose idle TTL has passed; the next request reloads it."""
+        unloaded: list[str] = []
+        for model_id in self.residency.idle_candidates(self.idle_ttls):
+            if await self.unload(model_id, ctx_factory(f"idle_unload:{model_id}"), reason="idle_ttl"):
+                unloaded.append(model_id)
+        return unloaded
+
+    def start_idle_reaper(self, ctx_factory: Callable[[str], Any]) -> None:
+        if not self.idle_ttls or self._idle_reaper is not None:
+            return
+        interval = min(60.0, max(1.0, min(self.idle_ttls.values()) / 4))
+        self._idle_reaper = asyncio.create_task(
+            self._reap_idle(ctx_factory, interval), name="model-idle-reaper"
+        )
+
+    async def _reap_idle(self, ctx_factory: Callable[[str], Any], interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.unload_idle(ctx_factory)
+            except Exception:
+                self.logger.exception("model.idle_reaper.error")
+
+    async def _make_room(self, model_id: str, ctx: Any) -> None:
+        for victim in self.residency.eviction_candidates(keep=model_id):
+            await self.unload(victim, ctx, reason="memory_budget")
+        if self.residency.enabled and self.residency.used_bytes() > self.residency.budget_bytes:
+            self.logger.warning(
+                "model.residency.over_budget",
+                extra={
+                    "model_id": model_id,
+                    "used_bytes": self.residency.used_bytes(),
+                    "budget_bytes": self.residency.budget_bytes,
+                },
+            )
+
+    def has_startup_hook(self, model_id: str) -> bool:
+        loaded = self._models_by_id.get(model_id)
+        return bool(loaded and loaded.has_hook("startup"))
+
+    async def run_startup_hook(self, model_id: str, ctx_factory: Callable[[str], Any]) -> None:
+        hooks = self._lifecycle(model_id) if self.has_startup_hook(model_id) else None
+        if not hooks or not hooks.startup:
+            return
+        ctx = ctx_factory(f"startup:{model_id}")
+        await self._call_hook(hooks.startup, ctx, model_id=model_id, phase="startup")
+
+    async def run_startup_hooks(self, ctx_factory: Callable[[str], Any]) -> None:
+        await asyncio.gather(*(self.run_startup_hook(loaded.spec.id, ctx_factory) for loaded in self._models))
 
     async def preload(self, model_ids: Iterable[str], ctx_factory: Callable[[str], Any]) -> list[str]:
         targets = [m for m in dict.fromkeys(model_ids) if m in self._models_by_id]
-        loaded: list[str] = []
-        for model_id in targets:
-            success = await self._preload_model(model_id, ctx_factory)
-            if success:
-                loaded.append(model_id)
-        return loaded
+        results = await asyncio.gather(*(self._preload_model(model_id, ctx_factory) for model_id in targets))
+        return [model_id for model_id, success in zip(targets, results, strict=True) if success]
 
     async def preload_model(
         self,
@@ -100,12 +254,20 @@ class ModelRegistry:
         return await self._preload_model(model_id, ctx_factory, raise_errors=raise_errors)
 
     async def ensure_instance(self, model_id: str, ctx: Any) -> Any:
+        timings = getattr(ctx, "timings", None)
+        if timings is None:
+            return await self._ensure_instance(model_id, ctx)
+        with timings.phase("ensure_instance"):
+            return await self._ensure_instance(model_id, ctx)
+
+    async def _ensure_instance(self, model_id: str, ctx: Any) -> Any:
         if model_id in self.model_instances:
+            self.residency.touch(model_id)
             return self.model_instances[model_id]
         loaded = self._models_by_id.get(model_id)
         if not loaded:
             raise KeyError(f"Unknown model_id={model_id}")
-        hooks = self._hooks.get(model_id)
+        hooks = self._lifecycle(model_id)
         if not hooks or not hooks.load:
             self.logger.info(
                 "model.lazy_load",
@@ -161,16 +323,35 @@ class ModelRegistry:
         warmup_ctx: Any | None,
         run_warmup: bool,
     ) -> Any:
-        instance = await self._call_hook(hooks.load, ctx, model_id=model_id, phase=phase)
-        if run_warmup and hooks.warmup is not None:
-            await self._call_hook(
-                hooks.warmup,
-                instance,
-                warmup_ctx,
-                model_id=model_id,
-                phase="warmup",
+        async with self.load_gate.hold(self.residency.requirements.get(model_id, 0)):
+            measure = self.residency.begin_load(model_id)
+            try:
+                await self._make_room(model_id, ctx)
+                rss_before = process_rss_bytes() if measure else None
+                load_start = time.perf_counter()
+                instance = await self._call_hook(hooks.load, ctx, model_id=model_id, phase=phase)
+                if run_warmup and hooks.warmup is not None:
+                    await self._call_hook(
+                        hooks.warmup,
+                        instance,
+                        warmup_ctx,
+                        model_id=model_id,
+                        phase="warmup",
+                    )
+            except BaseException:
+                self.residency.abort_load(model_id)
+                raise
+            rss_after = process_rss_bytes() if rss_before is not None else None
+            # A delta is only attributable when no other model loaded at the same time.
+            measured = (
+                max(0, rss_after - rss_before)
+                if rss_before is not None and rss_after is not None and self.residency.loading == {model_id}
+                else None
             )
+            self.residency.finish_load(model_id, measured_bytes=measured)
+            METRICS.observe("model_load_duration_seconds", time.perf_counter() - load_start, model=model_id)
         self.model_instances[model_id] = instance
+        await self._make_room(model_id, ctx)
         return instance
 
     def _clear_load_task(self, model_id: str, completed: asyncio.Task[Any]) -> None:
@@ -178,8 +359,16 @@ class ModelRegistry:
             self._load_tasks.pop(model_id, None)
 
     async def shutdown(self, ctx_factory: Callable[[str], Any]) -> None:
-        for model_id, hooks in self._hooks.items():
-            if not hooks.shutdown or model_id not in self.model_instances:
+        if self._idle_reaper is not None:
+            self._idle_reaper.cancel()
+            try:
+                await self._idle_reaper
+            except asyncio.CancelledError:
+                pass
+            self._idle_reaper = None
+        for model_id in list(self.model_instances):
+            hooks = self._lifecycle(model_id)
+            if not hooks or not hooks.shutdown:
                 continue
             ctx = ctx_factory(f"shutdown:{model_id}")
             instance = self.model_instances[model_id]
@@ -192,7 +381,7 @@ class ModelRegistry:
         *,
         raise_errors: bool = False,
     ) -> bool:
-        hooks = self._hooks.get(model_id)
+        hooks = self._lifecycle(model_id)
         loaded = self._models_by_id.get(model_id)
         if not loaded:
             return False
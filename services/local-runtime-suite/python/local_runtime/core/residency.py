@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import os
+import sys
+import time
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+GIB = 1024**3
+# 0 disables the budget: models stay resident until shutdown, as before.
+MODEL_MEMORY_BUDGET_GB = float(os.getenv("LOCAL_RUNTIME_MODEL_MEMORY_BUDGET_GB", "0") or "0")
+# Overrides every spec's execution.idle_ttl_sec when set; 0 keeps idle models resident.
+MODEL_IDLE_TTL_OVERRIDE = os.getenv("LOCAL_RUNTIME_MODEL_IDLE_TTL_SEC", "").strip()
+# 0 leaves the number of concurrent loads bounded by memory alone.
+MAX_PARALLEL_LOADS = int(os.getenv("LOCAL_RUNTIME_MAX_PARALLEL_LOADS", "0") or "0")
+
+
+def process_rss_bytes() -> int | None:
+    """Current resident set size of this process, or None where it cannot be read cheaply."""
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm", encoding="ascii") as handle:
+                return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+    try:
+        import psutil  # type: ignore
+    except ImportError:
+        return None
+    return int(psutil.Process().memory_info().rss)
+
+
+def release_memory() -> None:
+    """Return freed tensors to the OS after an instance was dropped.
+
+    Only touches backends that are already imported; never triggers an import.
+    """
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        cuda = getattr(torch, "cuda", None)
+        if cuda is not None and cuda.is_available():
+            cuda.empty_cache()
+        mps = getattr(torch, "mps", None)
+        if mps is not None and hasattr(mps, "empty_cache") and torch.backends.mps.is_available():
+            mps.empty_cache()
+    mlx_core = sys.modules.get("mlx.core")
+    if mlx_core is not None:
+        clear_cache = getattr(mlx_core, "clear_cache", None) or getattr(
+            getattr(mlx_core, "metal", None), "clear_cache", None
+        )
+        if clear_cache is not None:
+            clear_cache()
+
+
+def idle_ttl_seconds(spec: Any) -> float | None:
+    if MODEL_IDLE_TTL_OVERRIDE:
+        ttl = float(MODEL_IDLE_TTL_OVERRIDE)
+    else:
+        ttl = getattr(spec.execution, "idle_ttl_sec", None)
+    return float(ttl) if ttl and ttl > 0 else None
+
+
+def physical_memory_bytes() -> int | None:
+    try:
+        return int(os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE"))
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+class LoadGate:
+    """Memory-aware semaphore for model loads.
+
+    A load may start while the estimated bytes of all loads in flight fit in
+    ``capacity_bytes`` (and, if set, fewer than ``max_parallel`` are running). A load
+    is always admitted when nothing else is loading, so one oversized model still loads.
+    """
+
+    def __init__(self, *, capacity_bytes: int | None, max_parallel: int = 0) -> None:
+        self.capacity_bytes = capacity_bytes
+        self.max_parallel = max(0, int(max_parallel))
+        self.active = 0
+        self.reserved_bytes = 0
+        self._condition = asyncio.Condition()
+
+    def _admits(self, nbytes: int) -> bool:
+        if not self.active:
+            return True
+        if self.max_parallel and self.active >= self.max_parallel:
+            return False
+        return self.capacity_bytes is None or self.reserved_bytes + nbytes <= self.capacity_bytes
+
+    @asynccontextmanager
+    async def hold(self, nbytes: int) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._admits(nbytes))
+            self.active += 1
+            self.reserved_bytes += nbytes
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.active -= 1
+                self.reserved_bytes -= nbytes
+                self._condition.notify_all()
+
+
+@dataclass
+class ResidentModel:
+    model_id: str
+    estimated_bytes: int
+    loaded_at: float
+    last_used: float
+    measured_bytes: int | None = None
+
+    @property
+    def footprint_bytes(self) -> int:
+        return max(self.estimated_bytes, self.measured_bytes or 0)
+
+
+class ResidencyManager:
+    """Tracks which model instances are resident and which ones may be evicted.
+
+    Each model is charged the larger of its spec's ``compat.requires_ram_gb`` and the
+    RSS growth measured while it loaded. Models that are still loading are charged
+    their estimate so concurrent loads cannot overshoot the budget together. Pinned
+    models (those serving a request) are never eviction candidates.
+    """
+
+    def __init__(self, *, budget_bytes: int, requirements: dict[str, int]) -> None:
+        self.budget_bytes = max(0, int(budget_bytes))
+        self.requirements = dict(requirements)
+        self.resident: dict[str, ResidentModel] = {}
+        self.loading: set[str] = set()
+        self._pins: dict[str, int] = {}
+        self._unloads = 0
+
+    @classmethod
+    def from_specs(cls, specs: Iterable[Any], *, budget_bytes: int | None = None) -> ResidencyManager:
+        if budget_bytes is None:
+            budget_bytes = int(MODEL_MEMORY_BUDGET_GB * GIB)
+        requirements = {spec.id: int(spec.compat.requires_ram_gb * GIB) for spec in specs}
+        return cls(budget_bytes=budget_bytes, requirements=requirements)
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_bytes > 0
+
+    def pin(self, model_id: str) -> None:
+        self._pins[model_id] = self._pins.get(model_id, 0) + 1
+        self.touch(model_id)
+
+    def unpin(self, model_id: str) -> None:
+        remaining = self._pins.get(model_id, 0) - 1
+        if remaining > 0:
+            self._pins[model_id] = remaining
+        else:
+            self._pins.pop(model_id, None)
+        self.touch(model_id)
+
+    def pinned(self, model_id: str) -> bool:
+        return self._pins.get(model_id, 0) > 0
+
+    def touch(self, model_id: str) -> None:
+        resident = self.resident.get(model_id)
+        if resident is not None:
+            resident.last_used = time.monotonic()
+
+    def begin_load(self, model_id: str) -> bool:
+        """Mark ``model_id`` as loading; True when it is the only load in flight."""
+        self.loading.add(model_id)
+        return len(self.loading) == 1
+
+    def finish_load(self, model_id: str, *, measured_bytes: int | None = None) -> None:
+        self.loading.discard(model_id)
+        now = time.monotonic()
+        self.resident[model_id] = ResidentModel(
+            model_id=model_id,
+            estimated_bytes=self.requirements.get(model_id, 0),
+            loaded_at=now,
+            last_used=now,
+            measured_bytes=measured_bytes,
+        )
+
+    def abort_load(self, model_id: str) -> None:
+        self.loading.discard(model_id)
+
+    def forget(self, model_id: str) -> None:
+        if self.resident.pop(model_id, None) is not None:
+            self._unloads += 1
+
+    def idle_candidates(self, idle_ttls: dict[str, float], *, now: float | None = None) -> list[str]:
+        """Unpinned resident models that have not been used within their idle TTL."""
+        now = time.monotonic() if now is None else now
+        return [
+            model_id
+            for model_id, resident in self.resident.items()
+            if model_id in idle_ttls
+            and not self.pinned(model_id)
+            and now - resident.last_used >= idle_ttls[model_id]
+        ]
+
+    def used_bytes(self) -> int:
+        loading = sum(self.requirements.get(model_id, 0) for model_id in self.loading)
+        return loading + sum(resident.footprint_bytes for resident in self.resident.values())
+
+    def eviction_candidates(self, *, needed_bytes: int = 0, keep: str | None = None) -> list[str]:
+        """Least-recently-used idle models whose eviction brings usage under the budget."""
+        if not self.enabled:
+            return []
+        excess = self.used_bytes() + needed_bytes - self.budget_bytes
+        if excess <= 0:
+            return []
+        victims: list[str] = []
+        idle = sorted(
+            (
+                resident
+                for resident in self.resident.values()
+                if resident.model_id != keep and not self.pinned(resident.model_id)
+            ),
+            key=lambda resident: resident.last_used,
+        )
+        for resident in idle:
+            if excess <= 0:
+                break
+            victims.append(resident.model_id)
+            excess -= resident.footprint_bytes
+        return victims
+
+    def snapshot(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "budget_bytes": self.budget_bytes,
+            "used_bytes": self.used_bytes(),
+            "unloads": self._unloads,
+            "loading": sorted(self.loading),
+            "models": {
+                model_id: {
+                    "estimated_bytes": resident.estimated_bytes,
+                    "measured_bytes": resident.measured_bytes,
+                    "pins": self._pins.get(model_id, 0),
+                    "idle_seconds": round(now - resident.last_used, 3),
+                }
+                for model_id, resident in self.resident.items()
+            },
+        }
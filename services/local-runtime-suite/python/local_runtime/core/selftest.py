@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import io
 import time
 import wave
@@ -90,99 +91,113 @@ def _validate_result(endpoint: str, run_request: RunRequest, result: Any, ctx: R
     raise AssertionError(f"Unsupported result type for endpoint {endpoint}")
 
 
-async def run_startup_self_test(
-    registry: ModelRegistry,
-    defaults: dict[str, str],
-    ctx_factory: ContextFactory,
-    readiness: ReadinessTracker,
-    strict: bool,
-) -> None:
-    readiness.begin_self_test()
-    failed = False
-    if not registry.models_by_endpoint:
-        readiness.finish_self_test("error" if strict else "degraded")
-        return
-
-    target_map: dict[str, list[LoadedModel]] = {}
+def self_test_targets(registry: ModelRegistry, defaults: dict[str, str]) -> list[tuple[str, LoadedModel]]:
+    targets: list[tuple[str, LoadedModel]] = []
     for endpoint, model_id in defaults.items():
         if not model_id:
             continue
         loaded_model = registry.get_loaded(model_id)
         if loaded_model:
-            target_map.setdefault(endpoint, []).append(loaded_model)
+            targets.append((endpoint, loaded_model))
+    return targets
 
-    for endpoint, models in target_map.items():
-        if not models:
-            readiness.record_self_test_check(endpoint, "skipped", detail="no models configured")
-            continue
-        for loaded in models:
-            ctx = ctx_factory(f"selftest.{endpoint}.{loaded.spec.id}", endpoint, loaded.spec.id)
-            try:
-                run_request = _build_run_request(loaded, stream=False)
-            except ValueError as exc:
-                readiness.record_self_test_check(f"{endpoint}:{loaded.spec.id}", "skipped", detail=str(exc))
-                continue
-            try:
-                result, duration_ms = await _invoke_model(loaded.module, run_request, ctx)
-                _validate_result(endpoint, run_request, result, ctx)
-                readiness.record_self_test_check(
-                    f"{endpoint}:{loaded.spec.id}", "ok", duration_ms=duration_ms
-                )
-            except Exception as exc:  # noqa: BLE001 - each backend must be reported without stopping the matrix
-                failed = True
-                readiness.record_self_test_check(f"{endpoint}:{loaded.spec.id}", "error", detail=str(exc))
-
-    # streaming coverage for responses
-    responses_stream_model = None
-    default_response_id = defaults.get("responses")
-    if default_response_id:
-        model = registry.get_loaded(default_response_id)
-        if model and model.spec.api.supports_stream:
-            responses_stream_model = model
-    if responses_stream_model:
-        ctx = ctx_factory("selftest.responses.stream", "responses", responses_stream_model.spec.id)
-        run_request = _build_run_request(responses_stream_model, stream=True)
-        try:
-            result_stream, duration_ms = await _invoke_model(responses_stream_model.module, run_request, ctx)
-            events = []
-            async for event in result_stream:
-                events.append(event.get("event"))
-            if not {"response.output_text.delta", "response.completed"}.issubset(set(events)):
-                raise AssertionError("missing response stream events")
-            readiness.record_self_test_check("responses_stream", "ok", duration_ms=duration_ms)
-        except Exception as exc:  # noqa: BLE001 - backend-specific stream errors become readiness evidence
-            failed = True
-            readiness.record_self_test_check("responses_stream", "error", detail=str(exc))
-
-    # streaming coverage for STT
-    stt_stream_model = None
-    default_stt_id = defaults.get("audio.transcriptions")
-    if default_stt_id:
-        model = registry.get_loaded(default_stt_id)
-        if model and model.spec.api.supports_stream:
-            stt_stream_model = model
-    if stt_stream_model:
-        ctx_stream = ctx_factory(
-            "selftest.audio.transcriptions.stream", "audio.transcriptions", stt_stream_model.spec.id
+
+async def _check_stream(
+    name: str,
+    loaded: LoadedModel,
+    ctx: RunContext,
+    readiness: ReadinessTracker,
+    expected_events: set[str],
+) -> bool:
+    run_request = _build_run_request(loaded, stream=True)
+    try:
+        result_stream, duration_ms = await _invoke_model(loaded.module, run_request, ctx)
+        events = []
+        async for event in result_stream:
+            events.append(event.get("event"))
+        if not expected_events.issubset(set(events)):
+            raise AssertionError(f"missing stream events: {sorted(expected_events - set(events))}")
+        readiness.record_self_test_check(name, "ok", duration_ms=duration_ms)
+        return True
+    except Exception as exc:  # noqa: BLE001 - backend-specific stream errors become readiness evidence
+        readiness.record_self_test_check(name, "error", detail=str(exc))
+        return False
+
+
+async def self_test_model(
+    endpoint: str,
+    loaded: LoadedModel,
+    defaults: dict[str, str],
+    ctx_factory: ContextFactory,
+    readiness: ReadinessTracker,
+) -> bool:
+    """Run every startup check for one model; returns False when any of them failed."""
+    model_id = loaded.spec.id
+    ok = True
+    ctx = ctx_factory(f"selftest.{endpoint}.{model_id}", endpoint, model_id)
+    try:
+        run_request = _build_run_request(loaded, stream=False)
+    except ValueError as exc:
+        readiness.record_self_test_check(f"{endpoint}:{model_id}", "skipped", detail=str(exc))
+        return True
+    try:
+        result, duration_ms = await _invoke_model(loaded.module, run_request, ctx)
+        _validate_result(endpoint, run_request, result, ctx)
+        readiness.record_self_test_check(f"{endpoint}:{model_id}", "ok", duration_ms=duration_ms)
+    except Exception as exc:  # noqa: BLE001 - each backend must be reported without stopping the matrix
+        ok = False
+        readiness.record_self_test_check(f"{endpoint}:{model_id}", "error", detail=str(exc))
+
+    if not loaded.spec.api.supports_stream or defaults.get(endpoint) != model_id:
+        return ok
+    # streaming coverage for the default responses and STT models
+    if endpoint == "responses":
+        ctx = ctx_factory("selftest.responses.stream", "responses", model_id)
+        ok = (
+            await _check_stream(
+                "responses_stream",
+                loaded,
+                ctx,
+                readiness,
+                {"response.output_text.delta", "response.completed"},
+            )
+            and ok
         )
-        run_request_stream = _build_run_request(stt_stream_model, stream=True)
-        try:
-            result_stream, duration_ms = await _invoke_model(
-                stt_stream_model.module, run_request_stream, ctx_stream
+    elif endpoint == "audio.transcriptions":
+        ctx = ctx_factory("selftest.audio.transcriptions.stream", "audio.transcriptions", model_id)
+        ok = (
+            await _check_stream(
+                "audio_transcriptions_stream", loaded, ctx, readiness, {"transcript.text.done"}
             )
-            events = []
-            async for event in result_stream:
-                events.append(event.get("event"))
-            if "transcript.text.done" not in events:
-                raise AssertionError("missing transcript done event")
-            readiness.record_self_test_check("audio_transcriptions_stream", "ok", duration_ms=duration_ms)
-        except Exception as exc:  # noqa: BLE001 - backend-specific stream errors become readiness evidence
-            failed = True
-            readiness.record_self_test_check("audio_transcriptions_stream", "error", detail=str(exc))
+            and ok
+        )
+    return ok
+
 
+def finish_startup_self_test(readiness: ReadinessTracker, *, failed: bool, strict: bool) -> None:
     final_status = "ok"
     if failed:
         final_status = "error" if strict else "degraded"
     readiness.finish_self_test(final_status)
     if failed and strict:
         raise RuntimeError("Self-tests failed")
+
+
+async def run_startup_self_test(
+    registry: ModelRegistry,
+    defaults: dict[str, str],
+    ctx_factory: ContextFactory,
+    readiness: ReadinessTracker,
+    strict: bool,
+) -> None:
+    readiness.begin_self_test()
+    if not registry.models_by_endpoint:
+        readiness.finish_self_test("error" if strict else "degraded")
+        return
+    results = await asyncio.gather(
+        *(
+            self_test_model(endpoint, loaded, defaults, ctx_factory, readiness)
+            for endpoint, loaded in self_test_targets(registry, defaults)
+        )
+    )
+    finish_startup_self_test(readiness, failed=not all(results), strict=strict)
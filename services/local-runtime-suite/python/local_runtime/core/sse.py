@@ -1,9 +1,116 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
+import os
+from collections.abc import AsyncIterator
 from typing import Any
 
+# Deltas produced within this window share one write; 0 sends every event as it arrives.
+SSE_COALESCE_SECONDS = max(0.0, float(os.getenv("LOCAL_RUNTIME_SSE_COALESCE_MS", "0") or "0") / 1000)
+
+TEXT_DELTA_EVENT = "response.output_text.delta"
+
+_STREAM_END = object()
+
 
 def format_sse_event(event: str, data: Any) -> str:
     payload = json.dumps(data, ensure_ascii=False)
     return f"event: {event}\ndata: {payload}\n\n"
+
+
+class SSEEncoder:
+    """Encodes stream events to UTF-8 SSE frames, byte-identical to ``format_sse_event``.
+
+    Text deltas (``{"id": ..., "delta": ...}``) repeat everything but the delta text, so
+    the frame up to the delta is encoded once per response id and only the delta is
+    escaped per token.
+    """
+
+    def __init__(self) -> None:
+        self._delta_id: str | None = None
+        self._delta_prefix = b""
+
+    def encode(self, event: str, data: Any) -> bytes:
+        if event == TEXT_DELTA_EVENT and type(data) is dict and len(data) == 2:
+            response_id = data.get("id")
+            delta = data.get("delta")
+            if isinstance(response_id, str) and isinstance(delta, str):
+                if response_id != self._delta_id:
+                    encoded_id = json.dumps(response_id, ensure_ascii=False)
+                    self._delta_prefix = f'event: {event}\ndata: {{"id": {encoded_id}, "delta": '.encode()
+                    self._delta_id = response_id
+                return b"".join(
+                    (self._delta_prefix, json.dumps(delta, ensure_ascii=False).encode(), b"}\n\n")
+                )
+        return format_sse_event(event, data).encode()
+
+    def encode_item(self, item: dict) -> bytes:
+        return self.encode(item.get("event", "message"), item.get("data", {}))
+
+
+async def encode_event_stream(
+    events: AsyncIterator[dict], *, coalesce_seconds: float = 0.0
+) -> AsyncIterator[bytes]:
+    """Encode stream events as SSE bytes, optionally batching ``*.delta`` frames.
+
+    With ``coalesce_seconds`` set, the first delta opens a window and every frame that
+    arrives before it closes goes out in the same chunk. Any other event flushes the
+    pending deltas together with itself, so lifecycle events are never delayed.
+    """
+    encoder = SSEEncoder()
+    if coalesce_seconds <= 0:
+        async for item in events:
+            yield encoder.encode_item(item)
+        return
+
+    # The source is read by a separate task so the window can close while it is waiting
+    # on the model; cancelling a pending ``__anext__`` directly would abort the source.
+    queue: asyncio.Queue[Any] = asyncio.Queue()
+
+    async def _pump() -> None:
+        try:
+            async for item in events:
+                queue.put_nowait(item)
+        except Exception as exc:  # noqa: BLE001 - re-raised by the consumer below
+            queue.put_nowait(exc)
+        finally:
+            queue.put_nowait(_STREAM_END)
+
+    loop = asyncio.get_running_loop()
+    pump = asyncio.create_task(_pump())
+    pending = bytearray()
+    deadline: float | None = None
+    try:
+        while True:
+            try:
+                if deadline is None:
+                    item = await queue.get()
+                else:
+                    item = await asyncio.wait_for(queue.get(), max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                yield bytes(pending)
+                pending.clear()
+                deadline = None
+                continue
+            if item is _STREAM_END:
+                break
+            if isinstance(item, Exception):
+                if pending:
+                    yield bytes(pending)
+                raise item
+            pending += encoder.encode_item(item)
+            if str(item.get("event", "")).endswith(".delta"):
+                if deadline is None:
+                    deadline = loop.time() + coalesce_seconds
+                continue
+            yield bytes(pending)
+            pending.clear()
+            deadline = None
+        if pending:
+            yield bytes(pending)
+    finally:
+        pump.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await pump
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from local_runtime.core.readiness import ReadinessTracker
+
+
+@dataclass
+class StartupStep:
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    after: tuple[str, ...] = ()
+
+
+@dataclass
+class StartupOutcome:
+    result: Any = None
+    error: BaseException | None = None
+
+
+async def run_startup_graph(
+    steps: Iterable[StartupStep], readiness: ReadinessTracker
+) -> dict[str, StartupOutcome]:
+    """Run startup steps concurrently, each one as soon as the steps it depends on finish.
+
+    Dependencies only order steps: a failed dependency does not skip its dependents,
+    which report their own errors (a self-test after a failed load fails on its own).
+    Dependencies on steps that are not part of the graph are ignored. Every step is
+    recorded on the readiness timeline.
+    """
+    steps = list(steps)
+    names = {step.name for step in steps}
+    tasks: dict[str, asyncio.Task[Any]] = {}
+    outcomes: dict[str, StartupOutcome] = {step.name: StartupOutcome() for step in steps}
+
+    async def _run(step: StartupStep) -> None:
+        dependencies = [tasks[name] for name in step.after if name in names]
+        if dependencies:
+            await asyncio.wait(dependencies)
+        outcome = outcomes[step.name]
+        try:
+            with readiness.timed_phase(step.name):
+                outcome.result = await step.run()
+        except Exception as exc:  # noqa: BLE001 - callers decide which failures abort startup
+            outcome.error = exc
+
+    for step in steps:
+        missing = [name for name in step.after if name in names and name not in tasks]
+        if missing:
+            raise ValueError(f"Startup step {step.name} depends on later steps: {missing}")
+        tasks[step.name] = asyncio.create_task(_run(step), name=f"startup:{step.name}")
+    try:
+        await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+    return outcomes
@@ -1,7 +1,30 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import logging
+import os
+import re
+import socket
+import sys
+import time
+from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Protocol
+
+from local_runtime.spec import LaunchSpec
+
+SUPERVISOR_PROBE_SECONDS = float(os.getenv("LOCAL_RUNTIME_SUPERVISOR_PROBE_SEC", "2") or "2")
+PROBE_TIMEOUT_SECONDS = 5.0
+# A live worker that fails this many probes in a row is killed and restarted.
+PROBE_FAILURES_BEFORE_RESTART = 3
+RESTART_BACKOFF_INITIAL_SECONDS = 0.5
+RESTART_BACKOFF_MAX_SECONDS = 30.0
+# A worker that stays up this long starts its next crash from the initial backoff again.
+STABLE_UPTIME_SECONDS = 60.0
+COMMAND_STOP_TIMEOUT_SECONDS = 5.0
+COMMAND_OUTPUT_TAIL_LINES = 50
 
 
 @dataclass
@@ -9,20 +32,387 @@ class WorkerStatus:
     name: str
     running: bool
     info: dict[str, Any] = field(default_factory=dict)
+    kind: str = "command"
+    state: str = "stopped"
+    pid: int | None = None
+    restarts: int = 0
+    last_error: str | None = None
+    rss_bytes: int | None = None
+    cpu_percent: float | None = None
+
+
+class SupervisedWorker(Protocol):
+    """A process the supervisor can start, probe and stop."""
+
+    name: str
+    kind: str
+
+    @property
+    def pid(self) -> int | None: ...
+
+    @property
+    def running(self) -> bool: ...
+
+    async def start(self, ctx: Any) -> None: ...
+
+    async def probe(self) -> bool: ...
+
+    async def stop(self) -> None: ...
+
+
+def process_usage(pid: int) -> tuple[int | None, float | None]:
+    """Resident set size in bytes and total CPU seconds of ``pid``, where they can be read cheaply."""
+    if sys.platform.startswith("linux"):
+        try:
+            with open(f"/proc/{pid}/statm", encoding="ascii") as handle:
+                rss = int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            with open(f"/proc/{pid}/stat", encoding="ascii") as handle:
+                # The command name may contain spaces; the fixed fields follow its closing paren.
+                fields = handle.read().rsplit(")", 1)[1].split()
+            return rss, (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+        except (OSError, ValueError, IndexError):
+            return None, None
+    try:
+        import psutil  # type: ignore
+    except ImportError:
+        return None, None
+    try:
+        process = psutil.Process(pid)
+        times = process.cpu_times()
+        return int(process.memory_info().rss), float(times.user + times.system)
+    except psutil.Error:
+        return None, None
+
+
+def restart_delay(attempt: int) -> float:
+    return min(RESTART_BACKOFF_MAX_SECONDS, RESTART_BACKOFF_INITIAL_SECONDS * 2**attempt)
+
+
+@dataclass
+class _Entry:
+    worker: SupervisedWorker
+    status: WorkerStatus
+    # Started by the supervisor (stopped by ``close``) rather than adopted from its owner.
+    owned: bool
+    started_at: float | None = None
+    failures: int = 0
+    attempts: int = 0
+    restart_at: float | None = None
+    cpu_sample: tuple[float, float] | None = None
 
 
 class Supervisor:
-    def __init__(self) -> None:
-        self._workers: dict[str, WorkerStatus] = {}
+    """Owns worker processes: starts them, probes them and restarts them when they fail.
+
+    Every ``probe_interval`` seconds each worker is checked. A worker whose process has
+    exited, or that fails ``PROBE_FAILURES_BEFORE_RESTART`` probes in a row, is stopped
+    and restarted after an exponential backoff, so a crashed or leaking backend recovers
+    without restarting the gateway. Each round also samples RSS and CPU use per worker.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger | None = None,
+        ctx_factory: Callable[[str], Any] | None = None,
+        *,
+        probe_interval: float = SUPERVISOR_PROBE_SECONDS,
+    ) -> None:
+        self.logger = logger or logging.getLogger("local-runtime")
+        self.ctx_factory = ctx_factory or (lambda _request_id: None)
+        self.probe_interval = probe_interval
+        self._entries: dict[str, _Entry] = {}
+        self._loop_task: asyncio.Task[None] | None = None
+        self._tasks: set[asyncio.Task[Any]] = set()
+
+    def start(self) -> None:
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._run(), name="worker-supervisor")
 
-    def start_worker(self, name: str) -> WorkerStatus:
-        status = WorkerStatus(name=name, running=True)
-        self._workers[name] = status
-        return status
+    async def close(self) -> None:
+        """Stop probing, stop the workers the supervisor started and forget adopted ones."""
+        tasks = [task for task in (self._loop_task, *self._tasks) if task is not None]
+        self._loop_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        entries, self._entries = self._entries, {}
+        await asyncio.gather(
+            *(self._stop(entry) for entry in entries.values() if entry.owned), return_exceptions=True
+        )
 
-    def stop_worker(self, name: str) -> None:
-        if name in self._workers:
-            self._workers[name].running = False
+    async def start_worker(self, worker: SupervisedWorker) -> WorkerStatus:
+        """Start ``worker`` and supervise it; a failed start is retried with backoff."""
+        entry = self._register(worker, owned=True)
+        entry.status.state = "starting"
+        await self._start(entry, restarting=False)
+        return entry.status
+
+    def launch(self, worker: SupervisedWorker) -> WorkerStatus:
+        """Start ``worker`` in the background, so a slow readiness check never blocks the caller."""
+        entry = self._register(worker, owned=True)
+        self._begin_start(entry)
+        return entry.status
+
+    def adopt(self, worker: SupervisedWorker) -> WorkerStatus:
+        """Supervise a worker that its owner has already started."""
+        entry = self._register(worker, owned=False)
+        self._mark_running(entry)
+        return entry.status
+
+    def forget(self, name: str) -> None:
+        """Stop supervising ``name`` without stopping it, before its owner shuts it down."""
+        self._entries.pop(name, None)
+
+    async def stop_worker(self, name: str) -> None:
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            await self._stop(entry)
 
     def status(self) -> list[WorkerStatus]:
-        return list(self._workers.values())
+        return [entry.status for entry in self._entries.values()]
+
+    async def check(self) -> None:
+        """Run one probe round: sample usage, and restart workers that died or stopped answering."""
+        await asyncio.gather(*(self._check(entry) for entry in list(self._entries.values())))
+
+    def _register(self, worker: SupervisedWorker, *, owned: bool) -> _Entry:
+        entry = _Entry(
+            worker=worker, status=WorkerStatus(name=worker.name, running=False, kind=worker.kind), owned=owned
+        )
+        self._entries[worker.name] = entry
+        return entry
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            try:
+                await self.check()
+            except Exception:
+                self.logger.exception("supervisor.check.error")
+
+    async def _check(self, entry: _Entry) -> None:
+        if entry.restart_at is not None:
+            if time.monotonic() >= entry.restart_at:
+                self._begin_start(entry)
+            return
+        if entry.status.state == "starting":
+            return
+        if not entry.worker.running:
+            await self._fail(entry, "exited")
+            return
+        try:
+            healthy = await asyncio.wait_for(entry.worker.probe(), PROBE_TIMEOUT_SECONDS)
+        except Exception:  # noqa: BLE001 - a failing probe is an unhealthy worker
+            healthy = False
+        if healthy:
+            entry.failures = 0
+            if entry.started_at is not None and time.monotonic() - entry.started_at >= STABLE_UPTIME_SECONDS:
+                entry.attempts = 0
+            self._sample(entry)
+            return
+        entry.failures += 1
+        if entry.failures >= PROBE_FAILURES_BEFORE_RESTART:
+            await self._fail(entry, "unresponsive")
+
+    async def _fail(self, entry: _Entry, reason: str) -> None:
+        status = entry.status
+        self.logger.warning(
+            "worker.failed",
+            extra={"worker": status.name, "reason": reason, "pid": status.pid, "restarts": status.restarts},
+        )
+        status.last_error = reason
+        await self._stop(entry)
+        self._schedule_restart(entry)
+
+    def _schedule_restart(self, entry: _Entry) -> None:
+        delay = restart_delay(entry.attempts)
+        entry.attempts += 1
+        entry.restart_at = time.monotonic() + delay
+        entry.status.state = "backoff"
+        entry.status.info["restart_in_seconds"] = round(delay, 3)
+
+    def _begin_start(self, entry: _Entry) -> None:
+        """Start in a task, so a slow load or readiness check never delays other probes."""
+        restarting = entry.restart_at is not None
+        entry.restart_at = None
+        entry.status.state = "starting"
+        task = asyncio.create_task(
+            self._start(entry, restarting=restarting), name=f"start-worker:{entry.status.name}"
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _start(self, entry: _Entry, *, restarting: bool) -> None:
+        status = entry.status
+        status.info.pop("restart_in_seconds", None)
+        try:
+            await entry.worker.start(self.ctx_factory(f"supervisor:{status.name}"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001 - backend start-up errors are retried
+            status.last_error = str(exc) or type(exc).__name__
+            self.logger.warning(
+                "worker.start_failed", extra={"worker": status.name, "error": status.last_error}
+            )
+            if self._entries.get(status.name) is entry:
+                self._schedule_restart(entry)
+            return
+        if self._entries.get(status.name) is not entry:
+            # Forgotten or stopped while starting; do not leave the new process behind.
+            await entry.worker.stop()
+            return
+        if restarting:
+            status.restarts += 1
+            self.logger.info("worker.restarted", extra={"worker": status.name, "restarts": status.restarts})
+        self._mark_running(entry)
+
+    def _mark_running(self, entry: _Entry) -> None:
+        entry.started_at = time.monotonic()
+        entry.failures = 0
+        entry.cpu_sample = None
+        entry.status.state = "running"
+        entry.status.running = True
+        entry.status.pid = entry.worker.pid
+        self._sample(entry)
+
+    async def _stop(self, entry: _Entry) -> None:
+        entry.status.running = False
+        entry.status.state = "stopped"
+        entry.status.rss_bytes = entry.status.cpu_percent = None
+        try:
+            await entry.worker.stop()
+        except Exception:  # noqa: BLE001 - the process is being replaced either way
+            self.logger.warning("worker.stop_failed", extra={"worker": entry.status.name})
+
+    def _sample(self, entry: _Entry) -> None:
+        pid = entry.worker.pid
+        entry.status.pid = pid
+        if pid is None:
+            return
+        rss, cpu_seconds = process_usage(pid)
+        entry.status.rss_bytes = rss
+        if cpu_seconds is None:
+            return
+        now = time.monotonic()
+        if entry.cpu_sample is not None and now > entry.cpu_sample[0]:
+            previous_at, previous_cpu = entry.cpu_sample
+            entry.status.cpu_percent = round(
+                max(0.0, cpu_seconds - previous_cpu) / (now - previous_at) * 100, 1
+            )
+        entry.cpu_sample = (now, cpu_seconds)
+
+
+def _free_loopback_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return int(probe.getsockname()[1])
+
+
+class CommandWorker:
+    """A backend process started from a model's ``LaunchSpec``.
+
+    ``{port}`` in the command, environment and readiness URL is replaced by a free
+    loopback port. The process is ready once ``ready.http_url`` answers without a
+    server error, or once a line of its output matches ``ready.log_regex``, within
+    ``ready.timeout_sec``. Later probes repeat the HTTP check.
+    """
+
+    kind = "command"
+
+    def __init__(self, name: str, launch: LaunchSpec) -> None:
+        self.name = name
+        self.launch = launch
+        self.port: int | None = None
+        self.output: deque[str] = deque(maxlen=COMMAND_OUTPUT_TAIL_LINES)
+        self._process: asyncio.subprocess.Process | None = None
+        self._reader: asyncio.Task[None] | None = None
+        self._ready = asyncio.Event()
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid if self._process is not None else None
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    @property
+    def http_url(self) -> str | None:
+        url = self.launch.ready.http_url
+        return self._fill(url) if url else None
+
+    def _fill(self, value: str) -> str:
+        return value.replace("{port}", str(self.port)) if self.port is not None else value
+
+    async def start(self, ctx: Any = None) -> None:
+        launch = self.launch
+        templated = [*launch.cmd, *launch.env.values(), launch.ready.http_url or ""]
+        self.port = _free_loopback_port() if any("{port}" in value for value in templated) else None
+        self._ready = asyncio.Event()
+        self._process = await asyncio.create_subprocess_exec(
+            *(self._fill(part) for part in launch.cmd),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            env={**os.environ, **{key: self._fill(value) for key, value in launch.env.items()}},
+        )
+        pattern = launch.ready.log_regex if launch.ready.kind == "log" else None
+        self._reader = asyncio.create_task(self._read_output(re.compile(pattern) if pattern else None))
+        try:
+            await asyncio.wait_for(self._wait_ready(), launch.ready.timeout_sec)
+        except BaseException:
+            await self.stop()
+            raise
+
+    async def _read_output(self, pattern: re.Pattern[str] | None) -> None:
+        assert self._process is not None and self._process.stdout is not None
+        async for raw in self._process.stdout:
+            line = raw.decode("utf-8", errors="replace").rstrip()
+            self.output.append(line)
+            if pattern is None or pattern.search(line):
+                self._ready.set()
+
+    async def _wait_ready(self) -> None:
+        process = self._process
+        assert process is not None
+        while process.returncode is None:
+            if self.launch.ready.kind == "http" and self.http_url:
+                if await self.probe():
+                    return
+                await asyncio.sleep(0.2)
+                continue
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._ready.wait(), 0.2)
+            if self._ready.is_set():
+                return
+        raise RuntimeError(f"{self.name} exited with code {process.returncode} before it was ready")
+
+    async def probe(self) -> bool:
+        if not self.running:
+            return False
+        url = self.http_url
+        if self.launch.ready.kind != "http" or not url:
+            return True
+        import httpx
+
+        try:
+            async with httpx.AsyncClient(timeout=PROBE_TIMEOUT_SECONDS) as client:
+                response = await client.get(url)
+        except httpx.HTTPError:
+            return False
+        return response.status_code < 500
+
+    async def stop(self) -> None:
+        process, self._process = self._process, None
+        if process is not None and process.returncode is None:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), COMMAND_STOP_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        if self._reader is not None:
+            self._reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader
+            self._reader = None
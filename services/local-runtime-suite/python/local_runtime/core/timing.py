@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Any
+
+# Phases in the order a request passes through them; others are reported after these.
+PHASE_ORDER = (
+    "body_read",
+    "multipart_parse",
+    "model_selection",
+    "ensure_instance",
+    "queue_wait",
+    "tokenize",
+    "prefill",
+    "decode",
+    "transcribe",
+    "validation",
+    "serialization",
+)
+
+
+class RequestTimings:
+    """Named phase durations for one request, reported in ``Server-Timing`` and ``timings``.
+
+    A phase that runs more than once (a structured-output retry, say) accumulates.
+    Phases are recorded from the event loop and from adapter worker threads, but
+    never concurrently for the same request, so no lock is needed.
+    """
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + max(0.0, seconds)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def _ordered(self) -> list[tuple[str, float]]:
+        known = [(name, self.phases[name]) for name in PHASE_ORDER if name in self.phases]
+        extra = [(name, seconds) for name, seconds in self.phases.items() if name not in PHASE_ORDER]
+        return known + extra
+
+    def as_payload(self) -> dict[str, float]:
+        payload = {name: round(seconds * 1000, 2) for name, seconds in self._ordered()}
+        payload["total"] = round(self.elapsed_ms(), 2)
+        return payload
+
+    def server_timing(self) -> str:
+        entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self._ordered()]
+        entries.append(f"total;dur={self.elapsed_ms():.2f}")
+        return ", ".join(entries)
+
+
+def timed(timings: RequestTimings | None, name: str) -> AbstractContextManager[None]:
+    """``timings.phase(name)``, or a no-op for callers that run without request timings."""
+    return timings.phase(name) if timings is not None else nullcontext()
+
+
+class GenerationClock:
+    """Token counts and timing for one generation.
+
+    ``start`` is called once the model is free to run (after the request queue), ``token``
+    for every generated token and ``finish`` when generation stops, from any thread.
+    Prefill runs until the first token and decode after it; both are recorded on the
+    request timings, and ``usage`` reports them with the token counts.
+    """
+
+    def __init__(self, timings: RequestTimings | None = None, *, requested_at: float | None = None) -> None:
+        self.timings = timings
+        if requested_at is None:
+            requested_at = timings.started_at if timings is not None else time.perf_counter()
+        self.requested_at = requested_at
+        self.started_at: float | None = None
+        self.first_token_at: float | None = None
+        self.finished_at: float | None = None
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+
+    def phase(self, name: str) -> AbstractContextManager[None]:
+        return timed(self.timings, name)
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+
+    def token(self, count: int = 1) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.output_tokens += count
+
+    def finish(self) -> None:
+        if self.started_at is None or self.finished_at is not None:
+            return
+        self.finished_at = time.perf_counter()
+        if self.timings is not None:
+            self.timings.record("prefill", self.prefill_seconds)
+            self.timings.record("decode", self.decode_seconds)
+
+    @property
+    def prefill_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        end = self.first_token_at or self.finished_at or time.perf_counter()
+        return max(0.0, end - self.started_at)
+
+    @property
+    def decode_seconds(self) -> float:
+        if self.first_token_at is None:
+            return 0.0
+        return max(0.0, (self.finished_at or time.perf_counter()) - self.first_token_at)
+
+    def usage(self) -> dict[str, Any]:
+        """OpenAI Responses ``usage`` plus time to first token, prefill time and decode rate."""
+        time_to_first_token = None
+        if self.first_token_at is not None:
+            time_to_first_token = round((self.first_token_at - self.requested_at) * 1000, 2)
+        # The first token comes out of prefill, so the decode rate counts the tokens after it.
+        decode_tokens_per_second = None
+        if self.output_tokens > 1 and self.decode_seconds > 0:
+            decode_tokens_per_second = round((self.output_tokens - 1) / self.decode_seconds, 2)
+        return {
+            "input_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.prompt_tokens + self.output_tokens,
+            "time_to_first_token_ms": time_to_first_token,
+            "prefill_ms": round(self.prefill_seconds * 1000, 2),
+            "decode_tokens_per_second": decode_tokens_per_second,
+        }
@@ -0,0 +1,461 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from local_runtime.cancellation import CancellationToken, InferenceCancelledError, ModelBusyError
+from local_runtime.helpers.json_constraint import (
+    IncrementalJsonValidator,
+    TokenConstraint,
+    torch_restrict_logits,
+)
+from local_runtime.helpers.prefix_cache import (
+    PrefixKVCache,
+    build_dynamic_cache,
+    hf_prefill_prefix,
+    hf_retain_sequence,
+    kv_layers,
+)
+
+
+class BatchBackend(Protocol):
+    """Model-specific half of the continuous batching engine.
+
+    The backend owns the merged KV state. Rows are kept in the same order as the
+    engine's active sequences: ``join`` appends a row, ``drop`` keeps only the given
+    rows, and ``step`` feeds one token per row and returns one logits row each.
+    ``retain`` is called for finished rows that asked to keep their KV state.
+    """
+
+    eos_token_ids: set[int]
+
+    def join(self, prompt_ids: Sequence[int]) -> Any: ...
+
+    def step(self, token_ids: Sequence[int]) -> Sequence[Any]: ...
+
+    def drop(self, keep: Sequence[int]) -> None: ...
+
+    def reset(self) -> None: ...
+
+    def sample(self, logits: Any, params: dict[str, Any]) -> int: ...
+
+    def restrict(self, logits: Any, constraint: TokenConstraint) -> Any: ...
+
+    def retain(self, row: int, token_ids: Sequence[int]) -> None: ...
+
+    def decode(self, token_ids: Sequence[int]) -> str: ...
+
+
+class IncrementalDetokenizer:
+    """Turn a growing token list into text deltas without re-emitting earlier text.
+
+    Decoding restarts from a short suffix window, so the cost per token stays constant,
+    and output is held back while the tail is an incomplete multi-byte character.
+    """
+
+    def __init__(self, decode: Callable[[Sequence[int]], str]) -> None:
+        self._decode = decode
+        self.token_ids: list[int] = []
+        self._prefix_offset = 0
+        self._read_offset = 0
+
+    def push(self, token_id: int) -> str:
+        self.token_ids.append(token_id)
+        prefix_text = self._decode(self.token_ids[self._prefix_offset : self._read_offset])
+        new_text = self._decode(self.token_ids[self._prefix_offset :])
+        if len(new_text) <= len(prefix_text) or new_text.endswith("\ufffd"):
+            return ""
+        self._prefix_offset = self._read_offset
+        self._read_offset = len(self.token_ids)
+        return new_text[len(prefix_text) :]
+
+    def flush(self) -> str:
+        if self._read_offset >= len(self.token_ids):
+            return ""
+        prefix_text = self._decode(self.token_ids[self._prefix_offset : self._read_offset])
+        new_text = self._decode(self.token_ids[self._prefix_offset :])
+        self._prefix_offset = self._read_offset = len(self.token_ids)
+        return new_text[len(prefix_text) :]
+
+
+@dataclass
+class BatchSequence:
+    prompt_ids: list[int]
+    params: dict[str, Any]
+    on_text: Callable[[str], None]
+    on_done: Callable[[Exception | None], None]
+    token: CancellationToken | None = None
+    submitted_at: float = field(default_factory=time.monotonic)
+    generated: int = 0
+    pending_token: int | None = None
+    detokenizer: IncrementalDetokenizer | None = field(default=None, repr=False)
+    constraint: TokenConstraint | None = field(default=None, repr=False)
+    validator: IncrementalJsonValidator | None = field(default=None, repr=False)
+    retain_kv: bool = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token is not None and self.token.is_set()
+
+
+class ContinuousBatchEngine:
+    """Run concurrent generations through one shared decode loop.
+
+    Sequences join at token boundaries (prefill runs alone, then the new row is merged
+    into the batch) and leave as soon as they finish or are cancelled, so a slow or
+    abandoned request never stalls the others. One daemon thread owns the backend.
+    """
+
+    def __init__(
+        self,
+        backend: BatchBackend,
+        *,
+        max_batch_size: int,
+        max_pending: int,
+        logger: Any | None = None,
+        name: str = "batch-engine",
+    ) -> None:
+        self.backend = backend
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_pending = max(0, max_pending)
+        self.logger = logger
+        self._pending: deque[BatchSequence] = deque()
+        self._active: list[BatchSequence] = []
+        self._condition = threading.Condition(threading.Lock())
+        self._stopped = False
+        self._steps = 0
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, sequence: BatchSequence) -> None:
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("The batching engine has been shut down.")
+            free_slots = self.max_batch_size - len(self._active)
+            if len(self._pending) >= free_slots + self.max_pending:
+                raise ModelBusyError("The local model queue is full. Retry in a moment.")
+            if sequence.token is not None:
+                sequence.token.queue_position = max(0, len(self._pending) + 1 - free_slots)
+            self._pending.append(sequence)
+            self._condition.notify_all()
+
+    def shutdown(self, timeout: float | None = 5.0) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.join(timeout=timeout)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._condition:
+            return {
+                "active": len(self._active),
+                "pending": len(self._pending),
+                "max_batch_size": self.max_batch_size,
+                "steps": self._steps,
+            }
+
+    def _loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped and not self._pending and not self._active:
+                    self._condition.wait()
+                if self._stopped:
+                    abandoned = list(self._pending) + self._active
+                    self._pending.clear()
+                    self._active = []
+                    break
+                # Taken off ``_pending`` but not yet in ``_active``: a failure must still reach these.
+                joining: deque[BatchSequence] = deque()
+                while self._pending and len(self._active) + len(joining) < self.max_batch_size:
+                    joining.append(self._pending.popleft())
+                waiting = list(self._pending)
+            try:
+                self._expire_waiting(waiting)
+                while joining:
+                    self._join(joining[0])
+                    joining.popleft()
+                if self._active:
+                    self._step()
+            except Exception as exc:  # noqa: BLE001 - a backend failure must reach every waiting caller
+                self._fail_all(exc, joining)
+        for sequence in abandoned:
+            sequence.on_done(InferenceCancelledError("The local inference request was cancelled."))
+        self.backend.reset()
+
+    def _expire_waiting(self, waiting: list[BatchSequence]) -> None:
+        expired = [sequence for sequence in waiting if sequence.cancelled]
+        if not expired:
+            return
+        with self._condition:
+            for sequence in expired:
+                if sequence in self._pending:
+                    self._pending.remove(sequence)
+        for sequence in expired:
+            sequence.on_done(self._cancellation_error(sequence))
+
+    def _join(self, sequence: BatchSequence) -> None:
+        if sequence.token is not None:
+            sequence.token.queue_wait_ms += round((time.monotonic() - sequence.submitted_at) * 1000, 2)
+        if sequence.cancelled:
+            sequence.on_done(self._cancellation_error(sequence))
+            return
+        sequence.detokenizer = IncrementalDetokenizer(self.backend.decode)
+        logits = self.backend.join(sequence.prompt_ids)
+        self._active.append(sequence)
+        self._accept(sequence, self._choose(sequence, logits))
+        self._retire_finished()
+
+    def _step(self) -> None:
+        rows = self.backend.step([sequence.pending_token for sequence in self._active])
+        self._steps += 1
+        for sequence, logits in zip(self._active, rows, strict=True):
+            self._accept(sequence, self._choose(sequence, logits))
+        self._retire_finished()
+
+    def _choose(self, sequence: BatchSequence, logits: Any) -> int:
+        # Sample unmasked first and only build the schema mask when that token is rejected;
+        # resampling from the masked row yields exactly the masked distribution.
+        token_id = self.backend.sample(logits, sequence.params)
+        constraint = sequence.constraint
+        if constraint is None:
+            return token_id
+        if not constraint.allows(token_id):
+            token_id = self.backend.sample(self.backend.restrict(logits, constraint), sequence.params)
+        constraint.advance(token_id)
+        return token_id
+
+    def _accept(self, sequence: BatchSequence, token_id: int) -> None:
+        if sequence.cancelled or token_id in self.backend.eos_token_ids:
+            sequence.pending_token = None
+            return
+        sequence.generated += 1
+        assert sequence.detokenizer is not None
+        delta = sequence.detokenizer.push(token_id)
+        if delta:
+            sequence.on_text(delta)
+            if sequence.validator is not None:
+                sequence.validator.feed(delta)
+        max_new_tokens = int(sequence.params.get("max_new_tokens") or 1)
+        finished = (sequence.constraint is not None and sequence.constraint.finished) or (
+            sequence.validator is not None and sequence.validator.stopped
+        )
+        sequence.pending_token = token_id if sequence.generated < max_new_tokens and not finished else None
+
+    def _retire_finished(self) -> None:
+        keep = [index for index, sequence in enumerate(self._active) if sequence.pending_token is not None]
+        if len(keep) == len(self._active):
+            return
+        finished = [sequence for sequence in self._active if sequence.pending_token is None]
+        for row, sequence in enumerate(self._active):
+            if sequence.retain_kv and sequence.pending_token is None and not sequence.cancelled:
+                assert sequence.detokenizer is not None
+                self.backend.retain(row, sequence.prompt_ids + sequence.detokenizer.token_ids)
+        self._active = [self._active[index] for index in keep]
+        if self._active:
+            self.backend.drop(keep)
+        else:
+            self.backend.reset()
+        for sequence in finished:
+            if sequence.cancelled:
+                sequence.on_done(self._cancellation_error(sequence))
+                continue
+            assert sequence.detokenizer is not None
+            tail = sequence.detokenizer.flush()
+            if tail:
+                sequence.on_text(tail)
+            sequence.on_done(None)
+
+    def _fail_all(self, exc: Exception, joining: Sequence[BatchSequence] = ()) -> None:
+        if self.logger is not None:
+            self.logger.exception("batch_engine.step_failed", extra={"error": str(exc)})
+        with self._condition:
+            active = {id(sequence) for sequence in self._active}
+            failed = (
+                self._active
+                + [sequence for sequence in joining if id(sequence) not in active]
+                + list(self._pending)
+            )
+            self._active = []
+            self._pending.clear()
+        self.backend.reset()
+        for sequence in failed:
+            sequence.on_done(exc)
+
+    @staticmethod
+    def _cancellation_error(sequence: BatchSequence) -> Exception:
+        try:
+            if sequence.token is not None:
+                sequence.token.raise_if_cancelled()
+        except InferenceCancelledError as exc:
+            return exc
+        return InferenceCancelledError("The local inference request was cancelled.")
+
+
+class HFBatchBackend:
+    """Merged-KV batching for Transformers causal language models.
+
+    Each joining prompt is prefilled alone, starting from the longest shared prefix in
+    the optional prefix cache; its KV tensors are then left-padded to the
+    batch length and concatenated on the batch dimension. Padding is masked through the
+    2-D attention mask and RoPE positions are passed explicitly, so every row decodes
+    exactly as it would alone.
+    """
+
+    def __init__(
+        self,
+        torch: Any,
+        model: Any,
+        tokenizer: Any,
+        device: str,
+        *,
+        prefix_cache: PrefixKVCache | None = None,
+    ) -> None:
+        self.torch = torch
+        self.model = model
+        self.tokenizer = tokenizer
+        self.device = device
+        self.prefix_cache = prefix_cache
+        self.eos_token_ids = collect_eos_token_ids(model, tokenizer)
+        self._layers: list[tuple[Any, Any]] = []
+        self._cache: Any | None = None
+        self._attention_mask: Any | None = None
+        self._positions: Any | None = None
+
+    def decode(self, token_ids: Sequence[int]) -> str:
+        return self.tokenizer.decode(list(token_ids), skip_special_tokens=True)
+
+    def reset(self) -> None:
+        self._layers = []
+        self._cache = None
+        self._attention_mask = None
+        self._positions = None
+
+    def join(self, prompt_ids: Sequence[int]) -> Any:
+        torch = self.torch
+        input_ids = torch.tensor([list(prompt_ids)], dtype=torch.long, device=self.device)
+        with torch.inference_mode():
+            prefix, cached_length = hf_prefill_prefix(self.model, self.prefix_cache, input_ids)
+            output = self.model(
+                input_ids=input_ids[:, cached_length:], past_key_values=prefix, use_cache=True
+            )
+        layers = kv_layers(output.past_key_values)
+        length = input_ids.shape[-1]
+        mask = torch.ones((1, length), dtype=torch.long, device=self.device)
+        positions = torch.tensor([length], dtype=torch.long, device=self.device)
+        if self._attention_mask is None:
+            self._layers, self._attention_mask, self._positions = layers, mask, positions
+        else:
+            target = max(length, self._attention_mask.shape[-1])
+            batch_layers = [self._pad_layer(layer, target) for layer in self._layers]
+            new_layers = [self._pad_layer(layer, target) for layer in layers]
+            self._layers = [
+                (torch.cat([old_k, new_k], dim=0), torch.cat([old_v, new_v], dim=0))
+                for (old_k, old_v), (new_k, new_v) in zip(batch_layers, new_layers, strict=True)
+            ]
+            self._attention_mask = torch.cat(
+                [self._pad_mask(self._attention_mask, target), self._pad_mask(mask, target)], dim=0
+            )
+            self._positions = torch.cat([self._positions, positions], dim=0)
+        self._cache = build_dynamic_cache(self._layers)
+        return output.logits[0, -1, :]
+
+    def step(self, token_ids: Sequence[int]) -> Sequence[Any]:
+        torch = self.torch
+        input_ids = torch.tensor([[token] for token in token_ids], dtype=torch.long, device=self.device)
+        ones = torch.ones((len(token_ids), 1), dtype=torch.long, device=self.device)
+        self._attention_mask = torch.cat([self._attention_mask, ones], dim=-1)
+        with torch.inference_mode():
+            output = self.model(
+                input_ids=input_ids,
+                attention_mask=self._attention_mask,
+                position_ids=self._positions[:, None],
+                past_key_values=self._cache,
+                use_cache=True,
+            )
+        self._cache = output.past_key_values
+        self._layers = kv_layers(self._cache)
+        self._positions = self._positions + 1
+        return output.logits[:, -1, :]
+
+    def drop(self, keep: Sequence[int]) -> None:
+        torch = self.torch
+        index = torch.tensor(list(keep), dtype=torch.long, device=self.device)
+        mask = self._attention_mask.index_select(0, index)
+        start = int((mask.sum(dim=0) > 0).nonzero()[0].item())
+        self._attention_mask = mask[:, start:]
+        self._positions = self._positions.index_select(0, index)
+        self._layers = [
+            (keys.index_select(0, index)[:, :, start:, :], values.index_select(0, index)[:, :, start:, :])
+            for keys, values in self._layers
+        ]
+        self._cache = build_dynamic_cache(self._layers)
+
+    def sample(self, logits: Any, params: dict[str, Any]) -> int:
+        return sample_token(self.torch, logits, params)
+
+    def restrict(self, logits: Any, constraint: TokenConstraint) -> Any:
+        return torch_restrict_logits(self.torch, logits, constraint)
+
+    def retain(self, row: int, token_ids: Sequence[int]) -> None:
+        # Rows are left-padded, so the row's own tokens are its last ``length`` positions.
+        length = int(self._attention_mask[row].sum().item())
+        layers = [
+            (keys[row : row + 1, :, -length:, :], values[row : row + 1, :, -length:, :])
+            for keys, values in self._layers
+        ]
+        hf_retain_sequence(self.prefix_cache, token_ids, layers)
+
+    def _pad_layer(self, layer: tuple[Any, Any], target: int) -> tuple[Any, Any]:
+        keys, values = layer
+        missing = target - keys.shape[2]
+        if missing <= 0:
+            return keys, values
+        functional = self.torch.nn.functional
+        return functional.pad(keys, (0, 0, missing, 0)), functional.pad(values, (0, 0, missing, 0))
+
+    def _pad_mask(self, mask: Any, target: int) -> Any:
+        missing = target - mask.shape[-1]
+        if missing <= 0:
+            return mask
+        return self.torch.nn.functional.pad(mask, (missing, 0), value=0)
+
+
+def sample_token(torch: Any, logits: Any, params: dict[str, Any]) -> int:
+    """Sample one token with the adapter's temperature/top-k/top-p semantics."""
+    temperature = float(params.get("temperature") or 0.0)
+    if temperature <= 0:
+        return int(torch.argmax(logits).item())
+    scores = logits.float() / temperature
+    top_k = int(params.get("top_k") or 0)
+    if 0 < top_k < scores.shape[-1]:
+        kth = torch.topk(scores, top_k).values[-1]
+        scores = scores.masked_fill(scores < kth, float("-inf"))
+    top_p = float(params.get("top_p") or 1.0)
+    if top_p < 1.0:
+        sorted_scores, sorted_indices = torch.sort(scores, descending=True)
+        cumulative = torch.softmax(sorted_scores, dim=-1).cumsum(dim=-1)
+        remove = cumulative > top_p
+        remove[1:] = remove[:-1].clone()
+        remove[0] = False
+        removed = torch.zeros_like(remove).scatter(0, sorted_indices, remove)
+        scores = scores.masked_fill(removed, float("-inf"))
+    probabilities = torch.softmax(scores, dim=-1)
+    return int(torch.multinomial(probabilities, num_samples=1).item())
+
+
+def collect_eos_token_ids(model: Any, tokenizer: Any) -> set[int]:
+    eos: set[int] = set()
+    candidates = [
+        getattr(tokenizer, "eos_token_id", None),
+        getattr(getattr(model, "generation_config", None), "eos_token_id", None),
+    ]
+    for candidate in candidates:
+        if isinstance(candidate, int):
+            eos.add(candidate)
+        elif isinstance(candidate, (list, tuple, set)):
+            eos.update(int(item) for item in candidate if item is not None)
+    return eos
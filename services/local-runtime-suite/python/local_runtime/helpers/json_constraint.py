@@ -0,0 +1,646 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+MASK_CACHE_SIZE = 1024
+MAX_NUMBER_CHARS = 24
+MAX_FREE_KEY_CHARS = 256
+
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+_SIMPLE_ESCAPES = frozenset('"\\/bfnrt')
+_DIGITS = frozenset("0123456789")
+_NUMBER_END_PHASES = frozenset({"zero", "int", "frac", "exp"})
+_DONE = ("done",)
+# Leading whitespace and an opening code fence are tolerated because postprocessing strips them.
+_PREAMBLE_PATTERN = re.compile(r"\s*(?:`{1,3}[A-Za-z0-9_-]*\s*)?")
+
+# A parser state is a tuple of alternative stacks ("threads"); each stack is a tuple of frames
+# with the innermost frame last. Frames are plain tuples so states hash cheaply for mask caching.
+State = tuple[tuple[tuple[Any, ...], ...], ...]
+
+
+@dataclass(frozen=True)
+class _Node:
+    kind: str
+    options: tuple[int, ...] = ()
+    properties: tuple[tuple[str, str, int], ...] = ()
+    required: frozenset[str] = frozenset()
+    additional: int | None = None
+    items: int = -1
+    min_items: int = 0
+    max_items: int | None = None
+    min_length: int = 0
+    max_length: int | None = None
+    integer: bool = False
+    texts: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class TokenMask:
+    """Tokens allowed next: every plain string token when ``include_plain``, plus ``token_ids``."""
+
+    include_plain: bool
+    token_ids: tuple[int, ...]
+
+
+class JsonSchemaAutomaton:
+    """Character-level pushdown automaton accepting JSON documents that fit a schema.
+
+    The structural keywords (type, properties, required, additionalProperties, items,
+    min/maxItems, min/maxLength, enum, const, anyOf/oneOf) are enforced while the text is
+    produced; value-level keywords such as ``pattern`` or ``minimum`` are left to the final
+    ``validate_against_schema`` pass. In constrained mode whitespace is limited to a single
+    space between tokens and integers may not carry a fraction, which keeps masked decoding
+    from wandering; validation mode accepts any JSON whitespace.
+    """
+
+    def __init__(self, schema: dict[str, Any], *, constrained: bool) -> None:
+        self.constrained = constrained
+        self._whitespace = frozenset(" ") if constrained else frozenset(" \t\n\r")
+        self._whitespace_limit = 1 if constrained else None
+        self._nodes: list[_Node] = []
+        self._any = self._compile_any()
+        self.root = self._compile(schema)
+        self._mask_cache: OrderedDict[tuple[TokenVocabulary, State], TokenMask] = OrderedDict()
+        self._mask_lock = threading.Lock()
+
+    def initial_state(self) -> State:
+        return ((_DONE, ("v", self.root, 0)),)
+
+    def advance(self, state: State, char: str) -> State:
+        threads: dict[tuple[Any, ...], None] = {}
+        for stack in state:
+            for advanced in self._step(stack, char):
+                threads[advanced] = None
+        return tuple(threads)
+
+    def advance_text(self, state: State, text: str) -> State:
+        for char in text:
+            state = self.advance(state, char)
+            if not state:
+                break
+        return state
+
+    def is_complete(self, state: State) -> bool:
+        """True when the text so far is a whole document (it may still be extendable)."""
+        return any(self._stack_complete(stack) for stack in state)
+
+    def is_finished(self, state: State) -> bool:
+        """True when the root value has closed and nothing but the end of output may follow."""
+        return bool(state) and all(stack == (_DONE,) for stack in state)
+
+    def accepts_plain_text(self, state: State) -> bool:
+        return any(self._is_free_string(stack[-1]) for stack in state)
+
+    def allowed_tokens(self, state: State, vocabulary: TokenVocabulary) -> TokenMask:
+        key = (vocabulary, state)
+        with self._mask_lock:
+            cached = self._mask_cache.get(key)
+            if cached is not None:
+                self._mask_cache.move_to_end(key)
+                return cached
+        mask = self._compute_mask(state, vocabulary)
+        with self._mask_lock:
+            self._mask_cache[key] = mask
+            while len(self._mask_cache) > MASK_CACHE_SIZE:
+                self._mask_cache.popitem(last=False)
+        return mask
+
+    def _compute_mask(self, state: State, vocabulary: TokenVocabulary) -> TokenMask:
+        include_plain = self.accepts_plain_text(state)
+        token_ids: list[int] = []
+        if self.is_complete(state):
+            token_ids.extend(sorted(vocabulary.eos_token_ids))
+        if not self.is_finished(state):
+            texts, ids = vocabulary.special_entries if include_plain else vocabulary.entries
+            token_ids.extend(self._walk(state, texts, ids))
+        return TokenMask(include_plain=include_plain, token_ids=tuple(token_ids))
+
+    def _walk(self, state: State, texts: list[str], ids: list[tuple[int, ...]]) -> list[int]:
+        """Collect tokens whose text the automaton accepts, sharing work across common prefixes.
+
+        ``texts`` is sorted, so consecutive entries share prefixes; ``states[d]`` is the state
+        after the first ``d`` characters of ``prefix``. A dead prefix skips every token that
+        starts with it in one bisect.
+        """
+        allowed: list[int] = []
+        states = [state]
+        prefix = ""
+        index = 0
+        while index < len(texts):
+            text = texts[index]
+            depth = 0
+            limit = min(len(prefix), len(text))
+            while depth < limit and prefix[depth] == text[depth]:
+                depth += 1
+            del states[depth + 1 :]
+            dead = False
+            while depth < len(text):
+                advanced = self.advance(states[depth], text[depth])
+                if not advanced:
+                    dead = True
+                    break
+                states.append(advanced)
+                depth += 1
+            if dead:
+                prefix = text[:depth]
+                index = bisect_left(texts, text[: depth + 1] + "\U0010ffff", index + 1)
+                continue
+            allowed.extend(ids[index])
+            prefix = text
+            index += 1
+        return allowed
+
+    def _step(self, stack: tuple[Any, ...], char: str) -> list[tuple[Any, ...]]:
+        frame = stack[-1]
+        results = [stack[:-1] + replacement for replacement in self._advance_frame(frame, char)]
+        if len(stack) > 1 and self._can_end(frame):
+            results.extend(self._step(stack[:-1], char))
+        return results
+
+    def _stack_complete(self, stack: tuple[Any, ...]) -> bool:
+        while stack[-1] != _DONE:
+            if not self._can_end(stack[-1]):
+                return False
+            stack = stack[:-1]
+        return True
+
+    def _whitespace_step(self, count: int) -> int | None:
+        if self._whitespace_limit is None:
+            return 0
+        return count + 1 if count < self._whitespace_limit else None
+
+    @staticmethod
+    def _can_end(frame: tuple[Any, ...]) -> bool:
+        if frame[0] == "n":
+            return frame[2] in _NUMBER_END_PHASES
+        if frame[0] == "l":
+            return any(len(text) == frame[2] for text in frame[1])
+        return False
+
+    @staticmethod
+    def _is_free_string(frame: tuple[Any, ...]) -> bool:
+        return frame[0] == "s" and frame[2] == 0 and frame[3] is None
+
+    def _advance_frame(self, frame: tuple[Any, ...], char: str) -> list[tuple[tuple[Any, ...], ...]]:
+        tag = frame[0]
+        if tag in {"v", "ok", "oc", "oa", "a[", "aa"} and char in self._whitespace:
+            count = self._whitespace_step(frame[-1])
+            return [] if count is None else [(frame[:-1] + (count,),)]
+        if tag == "v":
+            return self._start_value(frame[1], char)
+        if tag == "s":
+            return self._advance_string(frame, char)
+        if tag == "n":
+            return self._advance_number(frame, char)
+        if tag == "l":
+            return self._advance_literal(frame[1], frame[2], char)
+        if tag == "ok":
+            _, node_id, seen, first, _ = frame
+            node = self._nodes[node_id]
+            if char == '"' and self._keys_available(node, seen):
+                return [(("k", node_id, seen, ""),)]
+            if char == "}" and first and node.required <= seen:
+                return [()]
+            return []
+        if tag == "k":
+            return self._advance_key(frame, char)
+        if tag == "oc":
+            _, node_id, seen, value_id, _ = frame
+            return [(("oa", node_id, seen, 0), ("v", value_id, 0))] if char == ":" else []
+        if tag == "oa":
+            _, node_id, seen, _ = frame
+            node = self._nodes[node_id]
+            if char == "," and self._keys_available(node, seen):
+                return [(("ok", node_id, seen, False, 0),)]
+            if char == "}" and node.required <= seen:
+                return [()]
+            return []
+        if tag == "a[":
+            node = self._nodes[frame[1]]
+            if char == "]":
+                return [()] if node.min_items == 0 else []
+            if node.max_items is not None and node.max_items < 1:
+                return []
+            return [(("aa", frame[1], 1, 0),) + started for started in self._start_value(node.items, char)]
+        if tag == "aa":
+            _, node_id, count, _ = frame
+            node = self._nodes[node_id]
+            if char == "," and (node.max_items is None or count < node.max_items):
+                return [(("aa", node_id, count + 1, 0), ("v", node.items, 0))]
+            if char == "]" and count >= node.min_items:
+                return [()]
+            return []
+        return []
+
+    def _start_value(self, node_id: int, char: str) -> list[tuple[tuple[Any, ...], ...]]:
+        node = self._nodes[node_id]
+        kind = node.kind
+        if kind == "union":
+            started: list[tuple[tuple[Any, ...], ...]] = []
+            for option in node.options:
+                started.extend(self._start_value(option, char))
+            return started
+        if kind == "object":
+            return [(("ok", node_id, frozenset(), True, 0),)] if char == "{" else []
+        if kind == "array":
+            return [(("a[", node_id, 0),)] if char == "[" else []
+        if kind == "string":
+            if char != '"':
+                return []
+            length = 0 if node.min_length or node.max_length is not None else None
+            return [(("s", node_id, 0, length),)]
+        if kind == "number":
+            if char == "-":
+                return [(("n", node_id, "sign", 1),)]
+            if char == "0":
+                return [(("n", node_id, "zero", 1),)]
+            if char in _DIGITS:
+                return [(("n", node_id, "int", 1),)]
+            return []
+        if kind == "literal":
+            return self._advance_literal(node.texts, 0, char)
+        return []
+
+    def _advance_literal(self, texts: tuple[str, ...], position: int, char: str) -> list[tuple[Any, ...]]:
+        remaining = tuple(text for text in texts if len(text) > position and text[position] == char)
+        if not remaining:
+            return []
+        if all(len(text) == position + 1 for text in remaining):
+            return [()]
+        return [(("l", remaining, position + 1),)]
+
+    def _advance_string(self, frame: tuple[Any, ...], char: str) -> list[tuple[tuple[Any, ...], ...]]:
+        _, node_id, escape, length = frame
+        node = self._nodes[node_id]
+        if escape == 0:
+            if char == '"':
+                return [()] if length is None or length >= node.min_length else []
+            if char == "\\":
+                if length is not None and node.max_length is not None and length >= node.max_length:
+                    return []
+                return [(("s", node_id, 1, length),)]
+            if ord(char) < 0x20:
+                return []
+            return self._string_char(node_id, node, length)
+        if escape == 1:
+            if char in _SIMPLE_ESCAPES:
+                return self._string_char(node_id, node, length)
+            return [(("s", node_id, 5, length),)] if char == "u" else []
+        if char not in _HEX_DIGITS:
+            return []
+        if escape == 2:
+            return self._string_char(node_id, node, length)
+        return [(("s", node_id, escape - 1, length),)]
+
+    @staticmethod
+    def _string_char(node_id: int, node: _Node, length: int | None) -> list[tuple[tuple[Any, ...], ...]]:
+        if length is None:
+            return [(("s", node_id, 0, None),)]
+        if node.max_length is not None:
+            if length >= node.max_length:
+                return []
+            return [(("s", node_id, 0, length + 1),)]
+        return [(("s", node_id, 0, min(length + 1, node.min_length)),)]
+
+    def _advance_number(self, frame: tuple[Any, ...], char: str) -> list[tuple[tuple[Any, ...], ...]]:
+        _, node_id, phase, length = frame
+        if length >= MAX_NUMBER_CHARS:
+            return []
+        integer = self._nodes[node_id].integer
+        following: str | None = None
+        if char in _DIGITS:
+            following = {
+                "sign": "zero" if char == "0" else "int",
+                "int": "int",
+                "frac0": "frac",
+                "frac": "frac",
+                "exp0": "exp",
+                "exp1": "exp",
+                "exp": "exp",
+            }.get(phase)
+        elif char == "." and phase in {"zero", "int"} and not integer:
+            following = "frac0"
+        elif char in "eE" and phase in {"zero", "int", "frac"} and not integer:
+            following = "exp0"
+        elif char in "+-" and phase == "exp0":
+            following = "exp1"
+        if following is None:
+            return []
+        return [(("n", node_id, following, length + 1),)]
+
+    def _advance_key(self, frame: tuple[Any, ...], char: str) -> list[tuple[tuple[Any, ...], ...]]:
+        _, node_id, seen, text = frame
+        node = self._nodes[node_id]
+        if char == '"':
+            for name, escaped, value_id in node.properties:
+                if escaped == text:
+                    return [] if name in seen else [(("oc", node_id, seen | {name}, value_id, 0),)]
+            if node.additional is not None and text not in seen:
+                return [(("oc", node_id, seen | {text}, node.additional, 0),)]
+            return []
+        if ord(char) < 0x20:
+            return []
+        extended = text + char
+        if any(escaped.startswith(extended) and name not in seen for name, escaped, _ in node.properties):
+            return [(("k", node_id, seen, extended),)]
+        if node.additional is not None and char != "\\" and len(extended) <= MAX_FREE_KEY_CHARS:
+            return [(("k", node_id, seen, extended),)]
+        return []
+
+    @staticmethod
+    def _keys_available(node: _Node, seen: frozenset[str]) -> bool:
+        return node.additional is not None or any(name not in seen for name, _, _ in node.properties)
+
+    def _add(self, node: _Node) -> int:
+        self._nodes.append(node)
+        return len(self._nodes) - 1
+
+    def _compile_any(self) -> int:
+        any_id = self._add(_Node(kind="union"))
+        options = (
+            self._add(_Node(kind="object", additional=any_id)),
+            self._add(_Node(kind="array", items=any_id)),
+            self._add(_Node(kind="string")),
+            self._add(_Node(kind="number")),
+            self._add(_Node(kind="literal", texts=("false", "null", "true"))),
+        )
+        self._nodes[any_id] = _Node(kind="union", options=options)
+        return any_id
+
+    def _literal(self, values: Iterable[Any]) -> int:
+        texts = sorted({json.dumps(value, ensure_ascii=False, separators=(",", ":")) for value in values})
+        if not texts:
+            return self._add(_Node(kind="union"))
+        return self._add(_Node(kind="literal", texts=tuple(texts)))
+
+    def _compile(self, schema: Any) -> int:
+        if schema is True or not isinstance(schema, dict):
+            return self._any if schema is not False else self._add(_Node(kind="union"))
+        if "const" in schema:
+            return self._literal([schema["const"]])
+        if isinstance(schema.get("enum"), list):
+            return self._literal(schema["enum"])
+        for branch_key in ("anyOf", "oneOf"):
+            branches = schema.get(branch_key)
+            if isinstance(branches, list) and branches:
+                return self._add(
+                    _Node(kind="union", options=tuple(self._compile(branch) for branch in branches))
+                )
+        declared = schema.get("type")
+        if declared is None:
+            if "properties" in schema:
+                declared = "object"
+            elif "items" in schema:
+                declared = "array"
+            else:
+                return self._any
+        types = declared if isinstance(declared, list) else [declared]
+        options = tuple(self._compile_typed(str(kind), schema) for kind in types)
+        if len(options) == 1:
+            return options[0]
+        return self._add(_Node(kind="union", options=options))
+
+    def _compile_typed(self, kind: str, schema: dict[str, Any]) -> int:
+        if kind == "object":
+            properties = schema.get("properties") if isinstance(schema.get("properties"), dict) else {}
+            required = [name for name in schema.get("required") or [] if isinstance(name, str)]
+            compiled = {name: self._compile(subschema) for name, subschema in properties.items()}
+            for name in required:
+                compiled.setdefault(name, self._any)
+            additional_schema = schema.get("additionalProperties", True)
+            additional = None if additional_schema is False else self._compile(additional_schema)
+            return self._add(
+                _Node(
+                    kind="object",
+                    properties=tuple(
+                        (name, json.dumps(name, ensure_ascii=False)[1:-1], value_id)
+                        for name, value_id in compiled.items()
+                    ),
+                    required=frozenset(required),
+                    additional=additional,
+                )
+            )
+        if kind == "array":
+            items = schema.get("items")
+            return self._add(
+                _Node(
+                    kind="array",
+                    items=self._compile(items) if isinstance(items, (dict, bool)) else self._any,
+                    min_items=int(schema.get("minItems") or 0),
+                    max_items=int(schema["maxItems"]) if schema.get("maxItems") is not None else None,
+                )
+            )
+        if kind == "string":
+            return self._add(
+                _Node(
+                    kind="string",
+                    min_length=int(schema.get("minLength") or 0),
+                    max_length=int(schema["maxLength"]) if schema.get("maxLength") is not None else None,
+                )
+            )
+        if kind in {"number", "integer"}:
+            return self._add(_Node(kind="number", integer=kind == "integer" and self.constrained))
+        if kind == "boolean":
+            return self._literal([False, True])
+        if kind == "null":
+            return self._literal([None])
+        return self._any
+
+
+@lru_cache(maxsize=64)
+def _cached_automaton(schema_key: str, constrained: bool) -> JsonSchemaAutomaton:
+    return JsonSchemaAutomaton(json.loads(schema_key), constrained=constrained)
+
+
+def compile_json_schema(schema: dict[str, Any], *, constrained: bool) -> JsonSchemaAutomaton:
+    schema_key = json.dumps(schema, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    return _cached_automaton(schema_key, constrained)
+
+
+class TokenVocabulary:
+    """Decoded text of every token, sorted so constraint walks share common prefixes.
+
+    "Plain" tokens are those that may appear anywhere inside an unconstrained JSON string
+    (no quote, backslash, or control characters); free-string masks include them in bulk
+    and only walk the remaining special tokens.
+    """
+
+    def __init__(self, texts: Sequence[str | None], eos_token_ids: Iterable[int]) -> None:
+        self.size = len(texts)
+        self.texts = list(texts)
+        self.eos_token_ids = frozenset(int(token_id) for token_id in eos_token_ids)
+        grouped: dict[str, list[int]] = {}
+        special: dict[str, list[int]] = {}
+        plain = array("q")
+        for token_id, text in enumerate(self.texts):
+            if not text or token_id in self.eos_token_ids:
+                continue
+            grouped.setdefault(text, []).append(token_id)
+            if any(char in '"\\' or ord(char) < 0x20 for char in text):
+                special.setdefault(text, []).append(token_id)
+            else:
+                plain.append(token_id)
+        self.plain_token_ids = plain
+        self.entries = self._sorted(grouped)
+        self.special_entries = self._sorted(special)
+        self._framework_masks: dict[Any, Any] = {}
+
+    @staticmethod
+    def _sorted(grouped: dict[str, list[int]]) -> tuple[list[str], list[tuple[int, ...]]]:
+        texts = sorted(grouped)
+        return texts, [tuple(grouped[text]) for text in texts]
+
+    @classmethod
+    def from_tokenizer(cls, tokenizer: Any, eos_token_ids: Iterable[int]) -> TokenVocabulary:
+        eos = set(eos_token_ids)
+        special_ids = set(getattr(tokenizer, "all_special_ids", None) or []) - eos
+        size = len(tokenizer)
+        texts = tokenizer.batch_decode(
+            [[token_id] for token_id in range(size)],
+            skip_special_tokens=False,
+            clean_up_tokenization_spaces=False,
+        )
+        return cls([None if token_id in special_ids else text for token_id, text in enumerate(texts)], eos)
+
+    def framework_mask(self, key: Any, build: Any) -> Any:
+        """Cache a framework tensor derived from the vocabulary (e.g. plain token indices)."""
+        cached = self._framework_masks.get(key)
+        if cached is None:
+            cached = self._framework_masks[key] = build()
+        return cached
+
+
+class TokenConstraint:
+    """Tracks one generation against a compiled schema and answers which tokens may follow."""
+
+    def __init__(self, automaton: JsonSchemaAutomaton, vocabulary: TokenVocabulary) -> None:
+        self.automaton = automaton
+        self.vocabulary = vocabulary
+        self.state = automaton.initial_state()
+        self.consumed = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.automaton.is_finished(self.state)
+
+    @property
+    def failed(self) -> bool:
+        return not self.state
+
+    def allows(self, token_id: int) -> bool:
+        if token_id in self.vocabulary.eos_token_ids:
+            return self.automaton.is_complete(self.state)
+        text = self.vocabulary.texts[token_id] if 0 <= token_id < self.vocabulary.size else None
+        return bool(text) and bool(self.automaton.advance_text(self.state, text))
+
+    def advance(self, token_id: int) -> None:
+        self.consumed += 1
+        if token_id in self.vocabulary.eos_token_ids:
+            return
+        text = self.vocabulary.texts[token_id] if 0 <= token_id < self.vocabulary.size else None
+        self.state = self.automaton.advance_text(self.state, text) if text else ()
+
+    def consume(self, token_ids: Iterable[int]) -> None:
+        for token_id in token_ids:
+            self.advance(int(token_id))
+
+    def resume(self, text: str) -> bool:
+        """Advance over text that is already part of the output, e.g. a continuation prefix."""
+        self.state = self.automaton.advance_text(self.state, text)
+        return bool(self.state)
+
+    def allowed(self) -> TokenMask:
+        if not self.state:
+            return TokenMask(include_plain=False, token_ids=tuple(sorted(self.vocabulary.eos_token_ids)))
+        return self.automaton.allowed_tokens(self.state, self.vocabulary)
+
+
+class IncrementalJsonValidator:
+    """Check generated text against a schema as it streams and say when to stop early.
+
+    ``feed`` returns ``"rejected"`` as soon as the text can no longer become a valid
+    document (prose before the root value, an unknown key, a wrong type) and
+    ``"complete"`` once the root value has closed, so adapters can stop decoding instead
+    of spending the rest of ``max_output_tokens``. ``valid_chars`` counts the fed
+    characters that were accepted, i.e. the length of the longest valid prefix, and
+    ``root_offset`` is where the root value starts once a preamble has been skipped.
+    """
+
+    PENDING = "pending"
+    COMPLETE = "complete"
+    REJECTED = "rejected"
+
+    def __init__(self, schema: dict[str, Any]) -> None:
+        self.automaton = compile_json_schema(schema, constrained=False)
+        self.state = self.automaton.initial_state()
+        self.status = self.PENDING
+        self.valid_chars = 0
+        self.root_offset: int | None = None
+        self._preamble = ""
+
+    def feed(self, text: str) -> str:
+        for char in text:
+            if self.status != self.PENDING:
+                break
+            advanced = self.automaton.advance(self.state, char)
+            if advanced:
+                self.state = advanced
+                if self.root_offset is None and char not in " \t\n\r":
+                    self.root_offset = self.valid_chars
+            elif self.root_offset is None and _PREAMBLE_PATTERN.fullmatch(self._preamble + char):
+                self._preamble += char
+            else:
+                self.status = self.REJECTED
+                break
+            self.valid_chars += 1
+            if self.automaton.is_finished(self.state):
+                self.status = self.COMPLETE
+        return self.status
+
+    @property
+    def stopped(self) -> bool:
+        return self.status != self.PENDING
+
+    def valid_prefix(self, text: str) -> str:
+        """Return the accepted part of ``text`` (the string fed so far) without its preamble."""
+        if self.root_offset is None:
+            return ""
+        return text[self.root_offset : self.valid_chars]
+
+
+def torch_restrict_logits(torch: Any, logits: Any, constraint: TokenConstraint) -> Any:
+    """Set every logit the constraint forbids to ``-inf``; works for ``[V]`` and ``[1, V]`` rows."""
+    mask = constraint.allowed()
+    vocabulary = constraint.vocabulary
+    allowed = torch.zeros(logits.shape[-1], dtype=torch.bool, device=logits.device)
+    if mask.include_plain:
+        plain = vocabulary.framework_mask(
+            ("torch", str(logits.device)),
+            lambda: torch.tensor(vocabulary.plain_token_ids, dtype=torch.long, device=logits.device),
+        )
+        allowed[plain] = True
+    if mask.token_ids:
+        allowed[torch.tensor(mask.token_ids, dtype=torch.long, device=logits.device)] = True
+    return logits.masked_fill(~allowed, float("-inf"))
+
+
+def mlx_restrict_logits(mx: Any, logits: Any, constraint: TokenConstraint) -> Any:
+    import numpy as np
+
+    mask = constraint.allowed()
+    allowed = np.zeros(logits.shape[-1], dtype=bool)
+    if mask.include_plain:
+        allowed[np.frombuffer(constraint.vocabulary.plain_token_ids, dtype=np.int64)] = True
+    if mask.token_ids:
+        allowed[list(mask.token_ids)] = True
+    return mx.where(mx.array(allowed), logits, float("-inf"))
@@ -1,27 +1,177 @@
 from __future__ import annotations
 
+import io
 from typing import Any
 
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+# Allowance on top of the file limit for boundaries, part headers and small form fields.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+MAX_FORM_PARTS = 32
+
 
 class UploadedFile:
-    def __init__(self, filename: str, content_type: str, data: bytes) -> None:
+    def __init__(self, filename: str, content_type: str, data: bytes | bytearray | memoryview) -> None:
         self.filename = filename
         self.content_type = content_type
         self.data = data
 
 
+class BufferReader(io.RawIOBase):
+    """Seekable read-only file over an upload buffer that, unlike ``io.BytesIO``, never copies it.
+
+    Shared-memory uploads reach worker processes as ``memoryview`` objects; decoders
+    that want a file object read them through this.
+    """
+
+    def __init__(self, data: bytes | bytearray | memoryview) -> None:
+        super().__init__()
+        self._view = memoryview(data).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        target = memoryview(buffer).cast("B")
+        chunk = self._view[self._position : self._position + len(target)]
+        size = len(chunk)
+        target[:size] = chunk
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"Invalid whence: {whence}")
+        if offset < 0:
+            raise ValueError("Negative seek position")
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        self._view.release()
+        super().close()
+
+
+class UploadTooLargeError(ValueError):
+    def __init__(self, max_mb: int) -> None:
+        super().__init__(f"File exceeds {max_mb}MB limit")
+        self.max_mb = max_mb
+
+
 def enforce_max_size(file_obj: UploadedFile, max_mb: int) -> None:
     if len(file_obj.data) > max_mb * 1024 * 1024:
-        raise ValueError(f"File exceeds {max_mb}MB limit")
+        raise UploadTooLargeError(max_mb)
+
+
+class _FormCollector:
+    """python-multipart callbacks that buffer each part once and enforce the size limits."""
+
+    def __init__(self, max_mb: int) -> None:
+        self.max_mb = max_mb
+        self.max_file_bytes = max_mb * 1024 * 1024
+        self.file_bytes = 0
+        self.fields: dict[str, Any] = {}
+        self.files: dict[str, UploadedFile] = {}
+        self.parts = 0
+        self._headers: dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._name = ""
+        self._upload: UploadedFile | None = None
+        self._value = bytearray()
+
+    def callbacks(self) -> dict[str, Any]:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self) -> None:
+        self.parts += 1
+        if self.parts > MAX_FORM_PARTS:
+            raise ValueError(f"Multipart body has more than {MAX_FORM_PARTS} parts")
+        self._headers = {}
+        self._upload = None
+        self._value = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
 
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
 
-def extract_form_fields(form: Any) -> tuple[dict, dict]:
-    files: dict[str, UploadedFile] = {}
-    fields: dict[str, Any] = {}
-    for key, value in form.items():
-        if hasattr(value, "filename"):
-            data = value.file.read()
-            files[key] = UploadedFile(value.filename, value.content_type or "application/octet-stream", data)
+    def on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if b"name" not in options:
+            raise ValueError("Multipart part is missing a field name")
+        self._name = options[b"name"].decode("utf-8", errors="replace")
+        if b"filename" in options:
+            content_type = self._headers.get(b"content-type", b"").decode("latin-1")
+            self._upload = UploadedFile(
+                options[b"filename"].decode("utf-8", errors="replace"),
+                content_type or "application/octet-stream",
+                self._value,
+            )
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._upload is not None:
+            self.file_bytes += end - start
+            if self.file_bytes > self.max_file_bytes:
+                raise UploadTooLargeError(self.max_mb)
+        elif len(self._value) + end - start > MULTIPART_OVERHEAD_BYTES:
+            raise ValueError(f"Form field '{self._name}' is too large")
+        self._value += data[start:end]
+
+    def on_part_end(self) -> None:
+        if self._upload is not None:
+            self.files[self._name] = self._upload
         else:
-            fields[key] = value
-    return fields, files
+            self.fields[self._name] = self._value.decode("utf-8", errors="replace")
+
+
+async def read_multipart_form(request: Any, max_mb: int) -> tuple[dict, dict[str, UploadedFile]]:
+    """Parse a multipart/form-data body as it streams in.
+
+    The declared Content-Length is checked before any byte is read and the file limit
+    is enforced as chunks arrive, so oversized uploads are rejected without being
+    buffered. Each file part lands in a single ``bytearray`` that adapters use as is.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise ValueError("Expected a multipart/form-data body")
+    max_body_bytes = max_mb * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES
+    declared_length = request.headers.get("content-length")
+    if declared_length and declared_length.isdigit() and int(declared_length) > max_body_bytes:
+        raise UploadTooLargeError(max_mb)
+    collector = _FormCollector(max_mb)
+    parser = MultipartParser(boundary, collector.callbacks())
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_body_bytes:
+            raise UploadTooLargeError(max_mb)
+        parser.write(chunk)
+    parser.finalize()
+    return collector.fields, collector.files
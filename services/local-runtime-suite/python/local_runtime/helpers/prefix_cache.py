@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+PREFIX_CACHE_MAX_MB = int(os.getenv("LOCAL_RUNTIME_PREFIX_CACHE_MB", "512") or "512")
+PREFIX_CACHE_BLOCK_TOKENS = max(1, int(os.getenv("LOCAL_RUNTIME_PREFIX_CACHE_BLOCK_TOKENS", "64") or "64"))
+
+
+@dataclass(frozen=True)
+class PrefixHit:
+    """A cached KV state whose first ``length`` tokens match the looked-up prompt.
+
+    ``state`` covers ``state_length`` tokens; callers crop it to ``length`` before use.
+    """
+
+    length: int
+    state: Any
+    state_length: int
+
+
+@dataclass
+class _PrefixEntry:
+    key: bytes
+    length: int
+    state: Any
+    nbytes: int
+    block_hashes: list[bytes]
+
+
+class PrefixKVCache:
+    """LRU store of prefilled KV states keyed by token-prefix hashes.
+
+    Prompts are hashed in fixed-size token blocks, each hash chaining the previous one,
+    so a block hash identifies the whole prefix up to that block. An entry registers
+    every block boundary it covers, which lets a prompt that only shares the evaluator
+    system prompt with an earlier request reuse the matching part of that entry.
+    Entries are evicted least-recently-used first once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, *, max_bytes: int, block_size: int = PREFIX_CACHE_BLOCK_TOKENS) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.block_size = max(1, int(block_size))
+        self._entries: OrderedDict[bytes, _PrefixEntry] = OrderedDict()
+        self._index: dict[bytes, dict[bytes, None]] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._reused_tokens = 0
+
+    @classmethod
+    def from_env(cls) -> PrefixKVCache | None:
+        if PREFIX_CACHE_MAX_MB <= 0:
+            return None
+        return cls(max_bytes=PREFIX_CACHE_MAX_MB * 1024 * 1024)
+
+    def boundary(self, length: int) -> int:
+        """Longest block-aligned prefix that still leaves one prompt token to prefill."""
+        if length <= 1:
+            return 0
+        return ((length - 1) // self.block_size) * self.block_size
+
+    def lookup(self, token_ids: Sequence[int]) -> PrefixHit | None:
+        hashes = self._block_hashes(token_ids, self.boundary(len(token_ids)))
+        with self._lock:
+            for block_count in range(len(hashes), 0, -1):
+                keys = self._index.get(hashes[block_count - 1])
+                if not keys:
+                    continue
+                entry = self._entries[next(reversed(keys))]
+                self._entries.move_to_end(entry.key)
+                length = block_count * self.block_size
+                self._hits += 1
+                self._reused_tokens += length
+                return PrefixHit(length=length, state=entry.state, state_length=entry.length)
+            self._misses += 1
+        return None
+
+    def store(self, token_ids: Sequence[int], state: Any, nbytes: int) -> bool:
+        length = len(token_ids)
+        if length == 0 or length % self.block_size or nbytes > self.max_bytes:
+            return False
+        hashes = self._block_hashes(token_ids, length)
+        key = hashes[-1]
+        with self._lock:
+            existing = self._entries.pop(key, None)
+            if existing is not None:
+                self._forget(existing)
+            entry = _PrefixEntry(key=key, length=length, state=state, nbytes=nbytes, block_hashes=hashes)
+            self._entries[key] = entry
+            self._bytes += nbytes
+            for block_hash in hashes:
+                self._index.setdefault(block_hash, {})[key] = None
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._forget(evicted)
+                self._evictions += 1
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._index.clear()
+            self._bytes = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "block_size": self.block_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "reused_tokens": self._reused_tokens,
+            }
+
+    def _forget(self, entry: _PrefixEntry) -> None:
+        self._bytes -= entry.nbytes
+        for block_hash in entry.block_hashes:
+            keys = self._index.get(block_hash)
+            if keys is None:
+                continue
+            keys.pop(entry.key, None)
+            if not keys:
+                del self._index[block_hash]
+
+    def _block_hashes(self, token_ids: Sequence[int], length: int) -> list[bytes]:
+        hashes: list[bytes] = []
+        previous = b""
+        for start in range(0, length, self.block_size):
+            block = array("q", token_ids[start : start + self.block_size]).tobytes()
+            previous = hashlib.blake2b(previous + block, digest_size=16).digest()
+            hashes.append(previous)
+        return hashes
+
+
+def kv_layers(cache: Any) -> list[tuple[Any, Any]]:
+    """Per-layer ``(keys, values)`` tensors from any Transformers cache layout."""
+    layers = getattr(cache, "layers", None)
+    if layers is not None:
+        return [(layer.keys, layer.values) for layer in layers]
+    if hasattr(cache, "key_cache"):
+        return list(zip(cache.key_cache, cache.value_cache, strict=True))
+    return [(keys, values) for keys, values in cache]
+
+
+def build_dynamic_cache(layers: Sequence[tuple[Any, Any]]) -> Any:
+    from transformers import DynamicCache  # type: ignore
+
+    cache = DynamicCache()
+    for index, (keys, values) in enumerate(layers):
+        cache.update(keys, values, index)
+    return cache
+
+
+def kv_layers_nbytes(layers: Sequence[tuple[Any, Any]]) -> int:
+    return sum(
+        keys.numel() * keys.element_size() + values.numel() * values.element_size() for keys, values in layers
+    )
+
+
+def crop_kv_layers(layers: Sequence[tuple[Any, Any]], length: int) -> list[tuple[Any, Any]]:
+    return [(keys[:, :, :length, :], values[:, :, :length, :]) for keys, values in layers]
+
+
+def hf_prefill_prefix(
+    model: Any, prefix_cache: PrefixKVCache | None, input_ids: Any
+) -> tuple[Any | None, int]:
+    """Return a DynamicCache covering the reusable prefix of ``input_ids`` and its length.
+
+    A cached prefix is extended up to the prompt's last block boundary before it is
+    returned, and the extended state is stored for the next request. Stored tensors
+    are never written to: DynamicCache concatenates into new tensors on update.
+    Must be called under ``torch.inference_mode()`` while holding the model lock.
+    """
+    if prefix_cache is None:
+        return None, 0
+    token_ids = input_ids[0].tolist()
+    target = prefix_cache.boundary(len(token_ids))
+    hit = prefix_cache.lookup(token_ids)
+    cached_length = hit.length if hit is not None else 0
+    layers = crop_kv_layers(hit.state, cached_length) if hit is not None else None
+    if target > cached_length:
+        cache = build_dynamic_cache(layers) if layers else build_dynamic_cache([])
+        output = model(input_ids=input_ids[:, cached_length:target], past_key_values=cache, use_cache=True)
+        layers = kv_layers(output.past_key_values)
+        cached_length = target
+        prefix_cache.store(token_ids[:target], layers, kv_layers_nbytes(layers))
+    if not cached_length:
+        return None, 0
+    return build_dynamic_cache(layers), cached_length
+
+
+def hf_retain_sequence(
+    prefix_cache: PrefixKVCache | None, token_ids: Sequence[int], layers: Sequence[tuple[Any, Any]]
+) -> bool:
+    """Store the KV state of a finished prompt + output so a continuation can resume from it.
+
+    ``layers`` hold one row whose length may trail ``token_ids`` by the last sampled
+    token. The block-aligned part is cloned, so the stored state never keeps a larger
+    (e.g. batched) tensor alive.
+    """
+    if prefix_cache is None or not layers:
+        return False
+    length = min(len(token_ids), layers[0][0].shape[2])
+    target = prefix_cache.boundary(length + 1)
+    if not target:
+        return False
+    stored = [(keys.clone(), values.clone()) for keys, values in crop_kv_layers(layers, target)]
+    return prefix_cache.store(list(token_ids[:target]), stored, kv_layers_nbytes(stored))
@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from typing import Any
 
 from local_runtime.core.loader import LoadedModel
+from local_runtime.helpers.json_constraint import IncrementalJsonValidator
 from local_runtime.helpers.responses_helpers import stream_events
 from local_runtime.helpers.structured_output import (
     build_retry_feedback,
@@ -19,6 +20,23 @@ from local_runtime.runtime_types import RunContext, RunRequest
 
 MAX_SCHEMA_BYTES = int(os.getenv("LOCAL_RUNTIME_STRUCTURED_SCHEMA_MAX_BYTES", str(256 * 1024)))
 DEFAULT_MAX_ATTEMPTS = int(os.getenv("LOCAL_RUNTIME_STRUCTURED_MAX_ATTEMPTS", "4") or "4")
+# Adapters that support it mask logits with the schema so the first attempt is already valid;
+# otherwise they validate incrementally and stop as soon as the output cannot become valid.
+CONSTRAINED_DECODING = os.getenv("LOCAL_RUNTIME_STRUCTURED_CONSTRAINED", "1").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+# Models that advertise api.supports_continuation repair a failed attempt by resuming after its
+# longest valid JSON prefix (reusing the retained KV state) before falling back to regeneration.
+CONTINUATION_REPAIR = os.getenv("LOCAL_RUNTIME_STRUCTURED_CONTINUATION", "1").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+MIN_CONTINUATION_CHARS = 16
 
 
 def _coerce_bool(value: Any, default: bool) -> bool:
@@ -44,6 +62,8 @@ class StructuredEnforcementResult:
     canonical_text: str
     parsed: Any
     attempts: int
+    # Token counts summed over all attempts; latency figures are from the last attempt.
+    usage: dict[str, Any] | None = None
 
 
 class StructuredOutputFailure(RuntimeError):
@@ -155,6 +175,17 @@ def _apply_retry_sampling(payload: dict) -> None:
     payload["top_p"] = min(top_p, 0.5)
 
 
+def _merge_usage(total: dict[str, Any] | None, usage: Any) -> dict[str, Any] | None:
+    if not isinstance(usage, dict):
+        return total
+    if total is None:
+        return dict(usage)
+    merged = dict(usage)
+    for key in ("input_tokens", "output_tokens", "total_tokens"):
+        merged[key] = (total.get(key) or 0) + (usage.get(key) or 0)
+    return merged
+
+
 def _safe_failure_category(error: str) -> str:
     if error == "missing_output_text":
         return error
@@ -186,29 +217,50 @@ class StructuredOutputEnforcer:
         base_messages = normalized_messages + [guard_message]
         retry_messages: list[dict[str, str]] = []
         last_error = "structured_output_failed"
+        continuation = ""
+        attempt_messages: list[dict[str, Any]] = []
+        usage: dict[str, Any] | None = None
         for attempt in range(1, self.max_attempts + 1):
-            attempt_messages = [copy.deepcopy(msg) for msg in base_messages + retry_messages]
+            if not continuation:
+                attempt_messages = [copy.deepcopy(msg) for msg in base_messages + retry_messages]
             attempt_payload = copy.deepcopy(base_payload)
             attempt_payload["messages"] = attempt_messages
             attempt_payload["stream"] = False
             if attempt >= 2:
                 _apply_retry_sampling(attempt_payload)
             run_request = RunRequest(
-                endpoint="responses", model=self.selected.spec.id, json=attempt_payload, stream=False
+                endpoint="responses",
+                model=self.selected.spec.id,
+                json=attempt_payload,
+                stream=False,
+                response_schema=self.config.effective_schema,
+                constrained_decoding=CONSTRAINED_DECODING,
+                assistant_prefix=continuation or None,
             )
             self.logger.info(
                 "structured_output.attempt",
-                extra={"request_id": self.request_id, "model_id": self.selected.spec.id, "attempt": attempt},
+                extra={
+                    "request_id": self.request_id,
+                    "model_id": self.selected.spec.id,
+                    "attempt": attempt,
+                    "constrained": CONSTRAINED_DECODING,
+                    "continuation_chars": len(continuation),
+                },
             )
             result = await self.selected.module.run(run_request, self.ctx)
+            if isinstance(result, dict):
+                usage = _merge_usage(usage, result.get("usage"))
             output_text = extract_output_text(result)
+            if continuation:
+                output_text = continuation + (output_text or "")
             if not output_text:
                 last_error = "missing_output_text"
             else:
                 try:
-                    canonical, parsed = parse_and_validate_structured_output(
-                        output_text, self.config.effective_schema
-                    )
+                    with self.ctx.timings.phase("validation"):
+                        canonical, parsed = parse_and_validate_structured_output(
+                            output_text, self.config.effective_schema
+                        )
                     self.logger.info(
                         "structured_output.valid",
                         extra={
@@ -218,12 +270,29 @@ class StructuredOutputEnforcer:
                         },
                     )
                     return StructuredEnforcementResult(
-                        canonical_text=canonical, parsed=parsed, attempts=attempt
+                        canonical_text=canonical, parsed=parsed, attempts=attempt, usage=usage
                     )
                 except ValueError as exc:
                     last_error = str(exc)
             if attempt >= self.max_attempts:
                 break
+            # Resume after the valid prefix while each continuation makes progress; otherwise
+            # regenerate from scratch with feedback.
+            prefix = self._continuation_prefix(output_text or "")
+            if len(prefix) > len(continuation):
+                continuation = prefix
+                self.logger.warning(
+                    "structured_output.continue",
+                    extra={
+                        "request_id": self.request_id,
+                        "model_id": self.selected.spec.id,
+                        "attempt": attempt,
+                        "reason": _safe_failure_category(last_error),
+                        "continuation_chars": len(continuation),
+                    },
+                )
+                continue
+            continuation = ""
             snippet = _clean_snippet(output_text or "")
             retry_feedback = build_retry_feedback(attempt, last_error, snippet)
             retry_messages.append({"role": "system", "content": retry_feedback})
@@ -238,7 +307,21 @@ class StructuredOutputEnforcer:
             )
         raise StructuredOutputFailure(last_error)
 
+    def _continuation_prefix(self, output_text: str) -> str:
+        if not CONTINUATION_REPAIR or not self.selected.spec.api.supports_continuation:
+            return ""
+        validator = IncrementalJsonValidator(self.config.effective_schema)
+        if validator.feed(output_text) == validator.COMPLETE:
+            # The document closed but failed a check the automaton does not model.
+            return ""
+        prefix = validator.valid_prefix(output_text)
+        return prefix if len(prefix) >= MIN_CONTINUATION_CHARS else ""
+
 
-async def stream_validated_json(model_id: str, text: str, request_id: str | None = None):
+async def stream_validated_json(
+    model_id: str, text: str, request_id: str | None = None, usage: dict[str, Any] | None = None
+):
     for event, data in stream_events(model_id, text, request_id=request_id):
+        if event == "response.completed" and usage is not None:
+            data = {**data, "usage": usage}
         yield {"event": event, "data": data}
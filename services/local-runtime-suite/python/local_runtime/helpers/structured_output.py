@@ -6,11 +6,6 @@ import re
 from functools import lru_cache
 from typing import Any
 
-try:  # pragma: no cover - import guard exercised in tests
-    from jsonschema import Draft7Validator
-except ImportError:  # pragma: no cover
-    Draft7Validator = None  # type: ignore
-
 THINKING_PATTERN = re.compile(r"<\s*(thinking|think)\s*>(.*?)<\s*/\s*\1\s*>", re.IGNORECASE | re.DOTALL)
 CODE_FENCE_START = re.compile(r"^```[a-z0-9_-]*\s*", re.IGNORECASE)
 CODE_FENCE_END = re.compile(r"\s*```$", re.IGNORECASE)
@@ -153,8 +148,12 @@ def make_openai_strict_schema(schema: dict) -> dict:
 
 @lru_cache(maxsize=64)
 def _get_validator(schema_key: str):
-    if Draft7Validator is None:
-        raise RuntimeError("jsonschema is required for structured outputs. Install jsonschema>=4.22.0")
+    try:  # imported on first use: jsonschema is slow to import and most requests never need it
+        from jsonschema import Draft7Validator
+    except ImportError as exc:  # pragma: no cover
+        raise RuntimeError(
+            "jsonschema is required for structured outputs. Install jsonschema>=4.22.0"
+        ) from exc
     schema = json.loads(schema_key)
     return Draft7Validator(schema)
 
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import copy
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+# Opt-in: 0 disables the cache. The budget covers the compressed files on disk.
+TRANSCRIPTION_CACHE_MAX_MB = int(os.getenv("LOCAL_RUNTIME_TRANSCRIPTION_CACHE_MB", "0") or "0")
+TRANSCRIPTION_CACHE_MEMORY_ENTRIES = int(
+    os.getenv("LOCAL_RUNTIME_TRANSCRIPTION_CACHE_MEMORY_ENTRIES", "64") or "64"
+)
+_ENTRY_SUFFIX = ".json.gz"
+
+
+def transcription_cache_key(
+    audio: bytes | bytearray | memoryview, *, model_id: str, revision: str | None, **params: Any
+) -> str:
+    """SHA-256 over the audio bytes and everything else that changes the transcript."""
+    digest = hashlib.sha256(audio)
+    settings = {"model_id": model_id, "revision": revision, **params}
+    digest.update(b"\0" + json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class TranscriptionCache:
+    """Content-addressed store of finished transcription results.
+
+    Results are kept as gzip-compressed JSON files under ``directory`` with a small
+    in-memory tier in front. The disk tier is bounded by ``max_bytes``; the least
+    recently used files (tracked by an index rebuilt from mtimes at startup) are
+    evicted first. Safe to call from worker threads.
+    """
+
+    def __init__(self, directory: str | Path, *, max_bytes: int, memory_entries: int = 64) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max(0, int(max_bytes))
+        self.memory_entries = max(0, int(memory_entries))
+        self._memory: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._disk: OrderedDict[str, int] | None = None
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @classmethod
+    def from_env(cls, cache_dir: str, name: str) -> TranscriptionCache | None:
+        if TRANSCRIPTION_CACHE_MAX_MB <= 0:
+            return None
+        return cls(
+            Path(cache_dir) / "transcriptions" / name,
+            max_bytes=TRANSCRIPTION_CACHE_MAX_MB * 1024 * 1024,
+            memory_entries=TRANSCRIPTION_CACHE_MEMORY_ENTRIES,
+        )
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                return copy.deepcopy(result)
+            disk = self._disk_index()
+            if key not in disk:
+                self._misses += 1
+                return None
+            path = self._path(key)
+            try:
+                result = json.loads(gzip.decompress(path.read_bytes()))
+                os.utime(path)
+            except (OSError, ValueError):
+                self._bytes -= disk.pop(key)
+                self._misses += 1
+                return None
+            disk.move_to_end(key)
+            self._remember(key, result)
+            self._disk_hits += 1
+            return copy.deepcopy(result)
+
+    def put(self, key: str, result: dict[str, Any]) -> bool:
+        payload = gzip.compress(
+            json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), compresslevel=6
+        )
+        if len(payload) > self.max_bytes:
+            return False
+        with self._lock:
+            disk = self._disk_index()
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=path.parent, prefix=".", suffix=".tmp", delete=False
+            ) as handle:
+                handle.write(payload)
+            os.replace(handle.name, path)
+            self._bytes += len(payload) - disk.pop(key, 0)
+            disk[key] = len(payload)
+            self._remember(key, copy.deepcopy(result))
+            while self._bytes > self.max_bytes and disk:
+                evicted, size = disk.popitem(last=False)
+                self._memory.pop(evicted, None)
+                self._path(evicted).unlink(missing_ok=True)
+                self._bytes -= size
+                self._evictions += 1
+        return True
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._disk_index()),
+                "memory_entries": len(self._memory),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._memory_hits + self._disk_hits,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{_ENTRY_SUFFIX}"
+
+    def _remember(self, key: str, result: dict[str, Any]) -> None:
+        if not self.memory_entries:
+            return
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_index(self) -> OrderedDict[str, int]:
+        if self._disk is None:
+            entries: list[tuple[float, str, int]] = []
+            for path in self.directory.glob(f"*/*{_ENTRY_SUFFIX}"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, path.name.removesuffix(_ENTRY_SUFFIX), stat.st_size))
+            entries.sort()
+            self._disk = OrderedDict((key, size) for _, key, size in entries)
+            self._bytes = sum(size for _, _, size in entries)
+        return self._disk
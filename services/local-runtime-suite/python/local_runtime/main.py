@@ -8,12 +8,13 @@ import time
 import uuid
 from collections.abc import AsyncIterator, Callable
 from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import httpx
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
 
 from local_runtime.api.openai_compat import (
     format_audio_transcription_response,
@@ -25,6 +26,7 @@ from local_runtime.api.openai_compat import (
 from local_runtime.cancellation import (
     ActiveRequestRegistry,
     CancellationToken,
+    DisconnectMonitor,
     InferenceCancelledError,
     InferenceTimeoutError,
     ModelBusyError,
@@ -37,12 +39,19 @@ from local_runtime.core.errors import ModelNotFoundError
 from local_runtime.core.load_manager import ModelLoadManager
 from local_runtime.core.loader import LoadedModel, load_models
 from local_runtime.core.logging import configure_logging, get_recent_logs, pop_log_context, push_log_context
+from local_runtime.core.metrics import METRICS, MetricFamily
 from local_runtime.core.readiness import ReadinessTracker
 from local_runtime.core.registry import ModelRegistry
 from local_runtime.core.selector import SelectionStrategy, detect_platform, is_platform_supported
-from local_runtime.core.selftest import run_startup_self_test
-from local_runtime.core.supervisor import Supervisor
-from local_runtime.helpers.multipart_helpers import enforce_max_size, extract_form_fields
+from local_runtime.core.selftest import finish_startup_self_test, self_test_model, self_test_targets
+from local_runtime.core.startup import StartupStep, run_startup_graph
+from local_runtime.core.supervisor import CommandWorker, Supervisor
+from local_runtime.core.timing import RequestTimings
+from local_runtime.helpers.multipart_helpers import (
+    UploadTooLargeError,
+    enforce_max_size,
+    read_multipart_form,
+)
 from local_runtime.helpers.structured_enforcer import (
     StructuredOutputEnforcer,
     StructuredOutputFailure,
@@ -50,9 +59,12 @@ from local_runtime.helpers.structured_enforcer import (
     stream_validated_json,
 )
 from local_runtime.runtime_types import RunContext, RunRequest
+from local_runtime.workers.pool import WorkerSettings, isolate_models
+
+if TYPE_CHECKING:
+    import httpx
 
 LOGGER = configure_logging()
-CLIENT_DISCONNECT_POLL_SECONDS = 0.1
 DEFAULT_INFERENCE_TIMEOUT_SECONDS = 300.0
 
 
@@ -68,17 +80,29 @@ async def lifespan(app: FastAPI):
         config.ensure_dirs()
         app.state.config = config
         app.state.active_requests = ActiveRequestRegistry()
+        app.state.disconnect_monitor = DisconnectMonitor()
         platform_id = detect_platform()
         app.state.platform_id = platform_id
         readiness.platform_id = platform_id
         logger.info("startup.platform", extra={"platform_id": platform_id})
 
-        models = load_models()
+        supervisor = Supervisor(logger, lambda rid: _ctx_factory(rid))
+        app.state.supervisor = supervisor
+        models = isolate_models(
+            load_models(),
+            WorkerSettings(
+                data_dir=config.data_dir,
+                cache_dir=config.cache_dir,
+                platform=platform_id,
+                supervisor=supervisor,
+            ),
+        )
         readiness.mark_phase("discover_models", "ok", detail=f"models={len(models)}")
         warmup_enabled = _env_flag("LOCAL_RUNTIME_WARMUP_ON_START", False)
         logger.info("startup.warmup_config", extra={"enabled": warmup_enabled})
         registry = ModelRegistry(models, platform_id, logger, enable_warmup=warmup_enabled)
         app.state.registry = registry
+        METRICS.set_collector("runtime", lambda: _runtime_metrics(app))
 
         selection = SelectionStrategy(platform_id)
         app.state.selection = selection
@@ -110,15 +134,22 @@ async def lifespan(app: FastAPI):
         readiness.defaults = defaults
         readiness.mark_phase("select_defaults", "ok", detail=str(defaults))
 
+        import httpx
+
         app.state.http_client = httpx.AsyncClient(timeout=30)
-        app.state.supervisor = Supervisor()
+        supervisor.start()
+        for loaded in registry.list_models():
+            launch = loaded.spec.launch
+            if (
+                launch.enabled
+                and launch.type == "command"
+                and is_platform_supported(loaded.spec, platform_id)
+            ):
+                supervisor.launch(CommandWorker(loaded.spec.id, launch))
         app.state.started_at = time.time()
         load_manager = ModelLoadManager(registry, lambda rid: _ctx_factory(rid), readiness, logger)
         app.state.load_manager = load_manager
 
-        await registry.run_startup_hooks(lambda rid: _ctx_factory(rid))
-        readiness.mark_phase("startup_hooks", "ok")
-
         preload_all = _env_flag("LOCAL_RUNTIME_PRELOAD_ALL", False)
         preload_defaults = _env_flag("LOCAL_RUNTIME_PRELOAD_DEFAULTS", False)
         if preload_all:
@@ -127,19 +158,69 @@ async def lifespan(app: FastAPI):
             targets = list(dict.fromkeys(defaults.values()))
         else:
             targets = []
+        selftest_enabled = _env_flag("LOCAL_RUNTIME_SELFTEST", False)
+        strict_selftest = _env_flag("LOCAL_RUNTIME_SELFTEST_STRICT", False)
+
+        # Each model's startup hook, preload and self-test form a chain; chains run concurrently,
+        # with loads bounded by the registry's memory-aware load gate.
+        steps: list[StartupStep] = []
+        for loaded in registry.list_models():
+            if registry.has_startup_hook(loaded.spec.id):
+                steps.append(
+                    StartupStep(
+                        f"startup:{loaded.spec.id}",
+                        partial(registry.run_startup_hook, loaded.spec.id, lambda rid: _ctx_factory(rid)),
+                    )
+                )
+        for model_id in targets:
+            steps.append(
+                StartupStep(
+                    f"preload:{model_id}",
+                    partial(registry.preload_model, model_id, lambda rid: _ctx_factory(rid)),
+                    after=(f"startup:{model_id}",),
+                )
+            )
+        selftest_targets = self_test_targets(registry, defaults) if selftest_enabled else []
+        if selftest_enabled:
+            readiness.begin_self_test()
+        for endpoint, loaded in selftest_targets:
+            model_id = loaded.spec.id
+            steps.append(
+                StartupStep(
+                    f"selftest:{endpoint}:{model_id}",
+                    partial(self_test_model, endpoint, loaded, defaults, _ctx_factory, readiness),
+                    after=(f"startup:{model_id}", f"preload:{model_id}"),
+                )
+            )
+        outcomes = await run_startup_graph(steps, readiness)
+
+        hook_errors = [
+            outcome.error
+            for name, outcome in outcomes.items()
+            if name.startswith("startup:") and outcome.error
+        ]
+        if hook_errors:
+            readiness.mark_phase("startup_hooks", "error", detail=str(hook_errors[0]))
+            raise hook_errors[0]
+        readiness.mark_phase("startup_hooks", "ok")
+        registry.start_idle_reaper(lambda rid: _ctx_factory(rid))
         if targets:
-            job = load_manager.create_job(targets)
-            await load_manager.wait_for_job(job.id)
+            preloaded = sum(1 for model_id in targets if outcomes[f"preload:{model_id}"].result is True)
             readiness.loaded_models = sorted(registry.model_instances.keys())
-            readiness.mark_phase("preload", "ok", detail=f"job_id={job.id} status={job.status}")
+            readiness.mark_phase("preload", "ok", detail=f"loaded={preloaded}/{len(targets)}")
         else:
             readiness.mark_phase("preload", "skipped", detail="models load on demand")
 
-        selftest_enabled = _env_flag("LOCAL_RUNTIME_SELFTEST", False)
-        strict_selftest = _env_flag("LOCAL_RUNTIME_SELFTEST_STRICT", False)
         if selftest_enabled:
             try:
-                await run_startup_self_test(registry, defaults, _ctx_factory, readiness, strict_selftest)
+                if not registry.models_by_endpoint:
+                    readiness.finish_self_test("error" if strict_selftest else "degraded")
+                else:
+                    failed = any(
+                        outcomes[f"selftest:{endpoint}:{loaded.spec.id}"].result is not True
+                        for endpoint, loaded in selftest_targets
+                    )
+                    finish_startup_self_test(readiness, failed=failed, strict=strict_selftest)
             except Exception as exc:
                 logger.exception("selftest.failed", extra={"error": str(exc)})
                 if strict_selftest:
@@ -154,6 +235,14 @@ async def lifespan(app: FastAPI):
         readiness.mark_error("startup_failure")
         raise
     finally:
+        METRICS.remove_collector("runtime")
+        monitor: DisconnectMonitor | None = getattr(app.state, "disconnect_monitor", None)
+        if monitor:
+            await monitor.close()
+        supervisor: Supervisor | None = getattr(app.state, "supervisor", None)
+        if supervisor:
+            # Stop restarting workers before the registry shuts the model workers down.
+            await supervisor.close()
         registry: ModelRegistry | None = getattr(app.state, "registry", None)
         if registry:
             await registry.shutdown(lambda rid: _ctx_factory(rid))
@@ -206,6 +295,7 @@ app.add_middleware(
     allow_origin_regex=cors_regex,
     allow_methods=["GET", "POST", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type", "X-Request-ID"],
+    expose_headers=["X-Request-ID", "X-Queue-Position", "X-Queue-Wait-Ms", "Server-Timing"],
     allow_credentials=False,
     allow_private_network=True,
     max_age=600,
@@ -224,6 +314,7 @@ def _build_context(
     endpoint: str | None = None,
     model_id: str | None = None,
     cancellation_token: CancellationToken | None = None,
+    timings: RequestTimings | None = None,
 ) -> RunContext:
     config: RuntimeConfig = app.state.config
     return RunContext(
@@ -235,6 +326,7 @@ def _build_context(
         registry=app.state.registry,
         http_client=app.state.http_client,
         cancellation_token=cancellation_token,
+        timings=timings if timings is not None else RequestTimings(),
     )
 
 
@@ -250,12 +342,14 @@ def _ctx_factory(
     endpoint: str | None = None,
     model_id: str | None = None,
     cancellation_token: CancellationToken | None = None,
+    timings: RequestTimings | None = None,
 ) -> RunContext:
     return _build_context(
         request_id,
         endpoint=endpoint,
         model_id=model_id,
         cancellation_token=cancellation_token,
+        timings=timings,
     )
 
 
@@ -276,7 +370,9 @@ def _is_allowed_origin(origin: str | None) -> bool:
 
 
 def _requires_access_token(path: str) -> bool:
-    return path.startswith(("/v1/", "/logs", "/doctor", "/load_models", "/health/details", "/runtime/config"))
+    return path.startswith(
+        ("/v1/", "/logs", "/doctor", "/load_models", "/health/details", "/runtime/config", "/metrics")
+    )
 
 
 def _access_denied(status_code: int, message: str) -> JSONResponse:
@@ -393,23 +489,18 @@ async def request_context_middleware(request: Request, call_next: Callable):
         pop_log_context(token)
 
 
-async def _watch_request_disconnect(request: Request, token: CancellationToken) -> None:
-    while not token.cancelled:
-        if await request.is_disconnected():
-            token.cancel()
-            return
-        await asyncio.sleep(CLIENT_DISCONNECT_POLL_SECONDS)
-
-
 def _begin_inference(
     request: Request,
     *,
+    model_id: str,
     timeout_seconds: float,
 ) -> tuple[str, CancellationToken, asyncio.Task[None]]:
     request_id = getattr(request.state, "request_id", f"req_{uuid.uuid4().hex}")
     registry: ActiveRequestRegistry = app.state.active_requests
     token = registry.register(request_id, timeout_seconds=timeout_seconds)
-    watcher = asyncio.create_task(_watch_request_disconnect(request, token))
+    app.state.registry.pin(model_id, request_id)
+    monitor: DisconnectMonitor = app.state.disconnect_monitor
+    watcher = monitor.watch(request.receive, token)
     return request_id, token, watcher
 
 
@@ -432,6 +523,14 @@ async def _finish_inference(
         pass
     registry: ActiveRequestRegistry = app.state.active_requests
     registry.finish(request_id)
+    model_id = app.state.registry.unpin(request_id)
+    if model_id is not None:
+        loaded = app.state.registry.get_loaded(model_id)
+        endpoint = loaded.spec.api.endpoint if loaded else "unknown"
+        METRICS.observe(
+            "request_duration_seconds", time.monotonic() - token.started_at, endpoint=endpoint, model=model_id
+        )
+        METRICS.observe("queue_wait_seconds", token.queue_wait_ms / 1000, model=model_id)
 
 
 async def _finalize_inference_stream(
@@ -439,9 +538,18 @@ async def _finalize_inference_stream(
     request_id: str,
     token: CancellationToken,
     watcher: asyncio.Task[None],
+    *,
+    model_id: str | None = None,
 ) -> AsyncIterator:
+    first_delta_at: float | None = None
     try:
         async for item in source:
+            event = item.get("event", "") if isinstance(item, dict) else ""
+            if first_delta_at is None and event.endswith(".delta"):
+                first_delta_at = time.monotonic()
+                METRICS.observe(
+                    "time_to_first_token_seconds", first_delta_at - token.started_at, model=model_id
+                )
             yield item
     except InferenceTimeoutError as exc:
         yield {
@@ -473,6 +581,41 @@ async def _finalize_inference_stream(
         await _finish_inference(request_id, token, watcher)
 
 
+def _queue_headers(token: CancellationToken) -> dict[str, str]:
+    if token.queue_position is None:
+        return {}
+    return {
+        "X-Queue-Position": str(token.queue_position),
+        "X-Queue-Wait-Ms": f"{token.queue_wait_ms:.2f}",
+    }
+
+
+STREAM_COMPLETION_EVENTS = frozenset({"response.completed", "transcript.text.done"})
+
+
+def _timings_requested(request: Request) -> bool:
+    return request.query_params.get("timings", "").lower() in {"1", "true"}
+
+
+def _record_queue_wait(timings: RequestTimings, token: CancellationToken) -> None:
+    if token.queue_position is not None and "queue_wait" not in timings.phases:
+        timings.record("queue_wait", token.queue_wait_ms / 1000)
+
+
+def _with_timing_headers(response: Response, timings: RequestTimings, token: CancellationToken) -> Response:
+    response.headers.update(_queue_headers(token))
+    response.headers["Server-Timing"] = timings.server_timing()
+    return response
+
+
+async def _attach_stream_timings(events: AsyncIterator[dict], timings: RequestTimings) -> AsyncIterator[dict]:
+    """Add the phase breakdown to the data of the stream's final event."""
+    async for item in events:
+        if isinstance(item, dict) and item.get("event") in STREAM_COMPLETION_EVENTS:
+            item = {**item, "data": {**item["data"], "timings": timings.as_payload()}}
+        yield item
+
+
 def _format_inference_error(exc: Exception) -> JSONResponse:
     if isinstance(exc, ModelBusyError):
         return format_error(
@@ -516,9 +659,81 @@ async def health_details() -> JSONResponse:
     data["protocol_version"] = GATEWAY_PROTOCOL_VERSION
     workers = [worker.__dict__ for worker in app.state.supervisor.status()]
     data["workers"] = workers
+    registry: ModelRegistry = app.state.registry
+    data["queues"] = registry.request_queue_status()
+    data["prefix_caches"] = registry.prefix_cache_status()
+    data["transcription_caches"] = registry.transcription_cache_status()
+    data["loaded_models"] = sorted(registry.model_instances.keys())
+    data["residency"] = registry.residency_status()
     return JSONResponse(data)
 
 
+def _runtime_metrics(app: FastAPI) -> list[MetricFamily]:
+    registry: ModelRegistry = app.state.registry
+    active: ActiveRequestRegistry = app.state.active_requests
+    families = [
+        MetricFamily(
+            "active_requests", "gauge", "Inference requests in flight.", [({}, active.active_count())]
+        ),
+    ]
+    queues = registry.request_queue_status()
+    for name, kind, key, help_text in (
+        ("queue_depth", "gauge", "depth", "Requests waiting for a model's request queue."),
+        ("queue_busy", "gauge", "busy", "Whether a model is currently running a request."),
+        ("queue_admitted_total", "counter", "admitted", "Requests admitted by a model's request queue."),
+        ("queue_rejected_total", "counter", "rejected", "Requests rejected because the queue was full."),
+    ):
+        samples = [
+            ({"model": model_id}, float(status[key])) for model_id, status in queues.items() if key in status
+        ]
+        families.append(MetricFamily(name, kind, help_text, samples))
+    for cache, statuses in (
+        ("prefix", registry.prefix_cache_status()),
+        ("transcription", registry.transcription_cache_status()),
+    ):
+        for outcome in ("hits", "misses"):
+            families.append(
+                MetricFamily(
+                    f"{cache}_cache_{outcome}_total",
+                    "counter",
+                    f"{cache.capitalize()} cache {outcome}.",
+                    [({"model": model_id}, status[outcome]) for model_id, status in statuses.items()],
+                )
+            )
+    residency = registry.residency_status()
+    families.extend(
+        [
+            MetricFamily(
+                "resident_models", "gauge", "Models currently loaded.", [({}, len(residency["models"]))]
+            ),
+            MetricFamily(
+                "resident_bytes",
+                "gauge",
+                "Estimated memory held by loaded models.",
+                [({}, residency["used_bytes"])],
+            ),
+            MetricFamily(
+                "memory_budget_bytes",
+                "gauge",
+                "Model memory budget (0 = unlimited).",
+                [({}, residency["budget_bytes"])],
+            ),
+            MetricFamily(
+                "model_unloads_total",
+                "counter",
+                "Models unloaded to free memory or when idle.",
+                [({}, residency["unloads"])],
+            ),
+        ]
+    )
+    return families
+
+
+@app.get("/metrics")
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/logs")
 async def logs(limit: int = 200) -> JSONResponse:
     safe_limit = 200
@@ -662,6 +877,20 @@ def _select_model(endpoint: str, requested: str | None) -> LoadedModel:
     return selection.select(models, endpoint, requested=requested_id)
 
 
+def _max_upload_mb(endpoint: str) -> int:
+    # The model field may follow the file in the body, so stream against the largest limit
+    # on the endpoint and check the selected model's own limit once it is known.
+    registry: ModelRegistry = app.state.registry
+    models = registry.models_by_endpoint.get(endpoint, [])
+    if not models:
+        raise ModelNotFoundError(f"No models available for endpoint {endpoint}")
+    return max(model.spec.limits.max_input_mb for model in models)
+
+
+def _upload_too_large(exc: UploadTooLargeError) -> JSONResponse:
+    return format_error(str(exc), err_type="invalid_request_error", code="file_too_large", status_code=413)
+
+
 @app.post("/v1/requests/cancel")
 async def cancel_inference_request(request: Request) -> JSONResponse:
     try:
@@ -700,11 +929,15 @@ async def cancel_inference_request(request: Request) -> JSONResponse:
 
 @app.post("/v1/responses")
 async def responses(request: Request) -> Response:
-    payload = await request.json()
+    timings = RequestTimings()
+    include_timings = _timings_requested(request)
+    with timings.phase("body_read"):
+        payload = await request.json()
     stream = bool(payload.get("stream"))
     request_id = getattr(request.state, "request_id", f"req_{uuid.uuid4().hex}")
     try:
-        selected = _select_model("responses", payload.get("model"))
+        with timings.phase("model_selection"):
+            selected = _select_model("responses", payload.get("model"))
     except ModelNotFoundError as exc:
         return format_error(str(exc), err_type="not_found", status_code=404)
     model_id = selected.spec.id
@@ -715,6 +948,7 @@ async def responses(request: Request) -> Response:
     try:
         request_id, cancellation_token, disconnect_watcher = _begin_inference(
             request,
+            model_id=model_id,
             timeout_seconds=_inference_timeout_seconds(selected),
         )
     except RequestIdInUseError as exc:
@@ -729,6 +963,7 @@ async def responses(request: Request) -> Response:
         endpoint="responses",
         model_id=model_id,
         cancellation_token=cancellation_token,
+        timings=timings,
     )
     start = time.perf_counter()
     if structured_config:
@@ -740,6 +975,7 @@ async def responses(request: Request) -> Response:
         except (InferenceCancelledError, ModelBusyError) as exc:
             return _format_inference_error(exc)
         except StructuredOutputFailure as exc:
+            METRICS.inc("structured_output_failures_total", model=model_id)
             return format_error(str(exc), err_type="invalid_request_error", status_code=422)
         except RuntimeError as exc:  # jsonschema missing or unexpected enforcement failure
             return format_error(str(exc), status_code=500)
@@ -756,17 +992,29 @@ async def responses(request: Request) -> Response:
                 "attempts": structured_result.attempts,
             },
         )
+        METRICS.observe("structured_output_attempts", structured_result.attempts, model=model_id)
+        _record_queue_wait(timings, cancellation_token)
         if stream:
-            return StreamingResponse(
-                format_responses_stream(
-                    stream_validated_json(model_id, structured_result.canonical_text, request_id=request_id)
-                ),
-                media_type="text/event-stream",
+            events = stream_validated_json(
+                model_id,
+                structured_result.canonical_text,
+                request_id=request_id,
+                usage=structured_result.usage,
             )
-        payload_out = format_responses_create(
-            structured_result.canonical_text, model_id, request_id=request_id
-        )
-        return JSONResponse(payload_out)
+            if include_timings:
+                events = _attach_stream_timings(events, timings)
+            response = StreamingResponse(format_responses_stream(events), media_type="text/event-stream")
+            return _with_timing_headers(response, timings, cancellation_token)
+        with timings.phase("serialization"):
+            payload_out = format_responses_create(
+                structured_result.canonical_text, model_id, request_id=request_id
+            )
+            if structured_result.usage is not None:
+                payload_out["usage"] = structured_result.usage
+            if include_timings:
+                payload_out["timings"] = timings.as_payload()
+            response = JSONResponse(payload_out)
+        return _with_timing_headers(response, timings, cancellation_token)
     run_request = RunRequest(endpoint="responses", model=model_id, json=payload, stream=stream)
     stream_owns_cleanup = False
     try:
@@ -776,22 +1024,26 @@ async def responses(request: Request) -> Response:
             "responses.run",
             extra={"request_id": request_id, "model_id": model_id, "duration_ms": duration_ms},
         )
+        _record_queue_wait(timings, cancellation_token)
         if stream:
-            response = StreamingResponse(
-                format_responses_stream(
-                    _finalize_inference_stream(
-                        result,
-                        request_id,
-                        cancellation_token,
-                        disconnect_watcher,
-                    )
-                ),
-                media_type="text/event-stream",
+            events = _finalize_inference_stream(
+                result,
+                request_id,
+                cancellation_token,
+                disconnect_watcher,
+                model_id=model_id,
             )
+            if include_timings:
+                events = _attach_stream_timings(events, timings)
+            response = StreamingResponse(format_responses_stream(events), media_type="text/event-stream")
             stream_owns_cleanup = True
-            return response
-        payload_out = format_responses_create(result, model_id, request_id=request_id)
-        return JSONResponse(payload_out)
+            return _with_timing_headers(response, timings, cancellation_token)
+        with timings.phase("serialization"):
+            payload_out = format_responses_create(result, model_id, request_id=request_id)
+            if include_timings:
+                payload_out["timings"] = timings.as_payload()
+            response = JSONResponse(payload_out)
+        return _with_timing_headers(response, timings, cancellation_token)
     except (InferenceCancelledError, ModelBusyError) as exc:
         return _format_inference_error(exc)
     finally:
@@ -814,19 +1066,32 @@ async def audio_speech(request: Request) -> JSONResponse:
 
 @app.post("/v1/audio/transcriptions")
 async def audio_transcriptions(request: Request) -> Response:
-    form = await request.form()
-    fields, files = extract_form_fields(form)
+    timings = RequestTimings()
+    include_timings = _timings_requested(request)
+    try:
+        with timings.phase("multipart_parse"):
+            fields, files = await read_multipart_form(request, _max_upload_mb("audio.transcriptions"))
+    except ModelNotFoundError as exc:
+        return format_error(str(exc), err_type="not_found", status_code=404)
+    except UploadTooLargeError as exc:
+        return _upload_too_large(exc)
+    except ValueError as exc:
+        return format_error(str(exc), err_type="invalid_request_error", status_code=400)
     stream = str(fields.get("stream", "false")).lower() == "true"
     response_format = fields.get("response_format", "json")
     request_id = getattr(request.state, "request_id", f"req_{uuid.uuid4().hex}")
     try:
-        selected = _select_model("audio.transcriptions", fields.get("model"))
+        with timings.phase("model_selection"):
+            selected = _select_model("audio.transcriptions", fields.get("model"))
     except ModelNotFoundError as exc:
         return format_error(str(exc), err_type="not_found", status_code=404)
     model_id = selected.spec.id
     if "file" not in files:
         return format_error("Missing file", err_type="invalid_request_error", status_code=400)
-    enforce_max_size(files["file"], selected.spec.limits.max_input_mb)
+    try:
+        enforce_max_size(files["file"], selected.spec.limits.max_input_mb)
+    except UploadTooLargeError as exc:
+        return _upload_too_large(exc)
     run_request = RunRequest(
         endpoint="audio.transcriptions",
         model=model_id,
@@ -837,6 +1102,7 @@ async def audio_transcriptions(request: Request) -> Response:
     try:
         request_id, cancellation_token, disconnect_watcher = _begin_inference(
             request,
+            model_id=model_id,
             timeout_seconds=_inference_timeout_seconds(selected),
         )
     except RequestIdInUseError as exc:
@@ -851,6 +1117,7 @@ async def audio_transcriptions(request: Request) -> Response:
         endpoint="audio.transcriptions",
         model_id=model_id,
         cancellation_token=cancellation_token,
+        timings=timings,
     )
     start = time.perf_counter()
     stream_owns_cleanup = False
@@ -861,20 +1128,25 @@ async def audio_transcriptions(request: Request) -> Response:
             "audio.transcriptions.run",
             extra={"request_id": request_id, "model_id": model_id, "duration_ms": duration_ms},
         )
+        _record_queue_wait(timings, cancellation_token)
         if stream:
-            response = format_audio_transcription_response(
-                _finalize_inference_stream(
-                    result,
-                    request_id,
-                    cancellation_token,
-                    disconnect_watcher,
-                ),
-                response_format,
-                True,
+            events = _finalize_inference_stream(
+                result,
+                request_id,
+                cancellation_token,
+                disconnect_watcher,
+                model_id=model_id,
             )
+            if include_timings:
+                events = _attach_stream_timings(events, timings)
+            response = format_audio_transcription_response(events, response_format, True)
             stream_owns_cleanup = True
-            return response
-        return format_audio_transcription_response(result, response_format, False)
+            return _with_timing_headers(response, timings, cancellation_token)
+        with timings.phase("serialization"):
+            if include_timings and isinstance(result, dict) and response_format not in {"text", "srt", "vtt"}:
+                result = {**result, "timings": timings.as_payload()}
+            response = format_audio_transcription_response(result, response_format, False)
+        return _with_timing_headers(response, timings, cancellation_token)
     except (InferenceCancelledError, ModelBusyError) as exc:
         return _format_inference_error(exc)
     finally:
@@ -884,19 +1156,32 @@ async def audio_transcriptions(request: Request) -> Response:
 
 @app.post("/v1/audio/translations")
 async def audio_translations(request: Request) -> Response:
-    form = await request.form()
-    fields, files = extract_form_fields(form)
+    timings = RequestTimings()
+    include_timings = _timings_requested(request)
+    try:
+        with timings.phase("multipart_parse"):
+            fields, files = await read_multipart_form(request, _max_upload_mb("audio.translations"))
+    except ModelNotFoundError as exc:
+        return format_error(str(exc), err_type="not_found", status_code=404)
+    except UploadTooLargeError as exc:
+        return _upload_too_large(exc)
+    except ValueError as exc:
+        return format_error(str(exc), err_type="invalid_request_error", status_code=400)
     stream = str(fields.get("stream", "false")).lower() == "true"
     response_format = fields.get("response_format", "json")
     request_id = getattr(request.state, "request_id", f"req_{uuid.uuid4().hex}")
     try:
-        selected = _select_model("audio.translations", fields.get("model"))
+        with timings.phase("model_selection"):
+            selected = _select_model("audio.translations", fields.get("model"))
     except ModelNotFoundError as exc:
         return format_error(str(exc), err_type="not_found", status_code=404)
     model_id = selected.spec.id
     if "file" not in files:
         return format_error("Missing file", err_type="invalid_request_error", status_code=400)
-    enforce_max_size(files["file"], selected.spec.limits.max_input_mb)
+    try:
+        enforce_max_size(files["file"], selected.spec.limits.max_input_mb)
+    except UploadTooLargeError as exc:
+        return _upload_too_large(exc)
     run_request = RunRequest(
         endpoint="audio.translations",
         model=model_id,
@@ -907,6 +1192,7 @@ async def audio_translations(request: Request) -> Response:
     try:
         request_id, cancellation_token, disconnect_watcher = _begin_inference(
             request,
+            model_id=model_id,
             timeout_seconds=_inference_timeout_seconds(selected),
         )
     except RequestIdInUseError as exc:
@@ -921,6 +1207,7 @@ async def audio_translations(request: Request) -> Response:
         endpoint="audio.translations",
         model_id=model_id,
         cancellation_token=cancellation_token,
+        timings=timings,
     )
     start = time.perf_counter()
     stream_owns_cleanup = False
@@ -931,20 +1218,25 @@ async def audio_translations(request: Request) -> Response:
             "audio.translations.run",
             extra={"request_id": request_id, "model_id": model_id, "duration_ms": duration_ms},
         )
+        _record_queue_wait(timings, cancellation_token)
         if stream:
-            response = format_audio_transcription_response(
-                _finalize_inference_stream(
-                    result,
-                    request_id,
-                    cancellation_token,
-                    disconnect_watcher,
-                ),
-                response_format,
-                True,
+            events = _finalize_inference_stream(
+                result,
+                request_id,
+                cancellation_token,
+                disconnect_watcher,
+                model_id=model_id,
             )
+            if include_timings:
+                events = _attach_stream_timings(events, timings)
+            response = format_audio_transcription_response(events, response_format, True)
             stream_owns_cleanup = True
-            return response
-        return format_audio_transcription_response(result, response_format, False)
+            return _with_timing_headers(response, timings, cancellation_token)
+        with timings.phase("serialization"):
+            if include_timings and isinstance(result, dict) and response_format not in {"text", "srt", "vtt"}:
+                result = {**result, "timings": timings.as_payload()}
+            response = format_audio_transcription_response(result, response_format, False)
+        return _with_timing_headers(response, timings, cancellation_token)
     except (InferenceCancelledError, ModelBusyError) as exc:
         return _format_inference_error(exc)
     finally:
@@ -959,13 +1251,29 @@ async def doctor() -> JSONResponse:
 
 def main() -> None:
     import argparse
+    import multiprocessing
 
     import uvicorn
 
+    from local_runtime.core.importtime import DEFAULT_REPORT_ROWS, format_report, profile_imports
+
     parser = argparse.ArgumentParser(description="Local runtime gateway")
     parser.add_argument("--port", type=int, default=None)
     parser.add_argument("--config", type=str, default=None)
+    parser.add_argument(
+        "--importtime-report",
+        type=int,
+        nargs="?",
+        const=DEFAULT_REPORT_ROWS,
+        default=None,
+        metavar="ROWS",
+        help="print the slowest startup imports (python -X importtime) and exit",
+    )
+    multiprocessing.freeze_support()  # model workers re-enter the frozen sidecar executable
     args = parser.parse_args()
+    if args.importtime_report is not None:
+        print(format_report(profile_imports(), rows=args.importtime_report))
+        return
 
     config_path = Path(args.config) if args.config else None
     if config_path is not None:
@@ -8,7 +8,29 @@ from collections.abc import AsyncIterator
 from functools import lru_cache
 from typing import Any
 
-from local_runtime.cancellation import CancellationToken, acquire_model_lock
+from local_runtime.cancellation import (
+    MODEL_QUEUE_MAX_DEPTH,
+    CancellationToken,
+    ModelRequestQueue,
+    acquire_model_lock,
+)
+from local_runtime.core.metrics import observe_generation
+from local_runtime.core.timing import GenerationClock
+from local_runtime.helpers.continuous_batching import (
+    BatchSequence,
+    ContinuousBatchEngine,
+    HFBatchBackend,
+    IncrementalDetokenizer,
+    collect_eos_token_ids,
+)
+from local_runtime.helpers.json_constraint import (
+    IncrementalJsonValidator,
+    TokenConstraint,
+    TokenVocabulary,
+    compile_json_schema,
+    torch_restrict_logits,
+)
+from local_runtime.helpers.prefix_cache import PrefixKVCache, hf_prefill_prefix, hf_retain_sequence, kv_layers
 from local_runtime.helpers.responses_helpers import new_response
 from local_runtime.runtime_types import RunContext, RunRequest
 
@@ -33,6 +55,7 @@ SPEC = {
         "endpoint": "responses",
         "advertised_model_name": "qwen3-hf",
         "supports_stream": True,
+        "supports_continuation": True,
     },
     "limits": {
         "timeout_sec": 300,
@@ -50,6 +73,7 @@ SPEC = {
     "execution": {
         "mode": "inprocess",
         "warmup_on_start": False,
+        "idle_ttl_sec": 1800,
     },
     "launch": {
         "enabled": False,
@@ -83,6 +107,11 @@ DEFAULT_MAX_TOKENS = int(
 DEFAULT_TEMPERATURE = float(os.getenv("LOCAL_RUNTIME_QWEN_HF_TEMPERATURE", "0.7"))
 DEFAULT_TOP_P = float(os.getenv("LOCAL_RUNTIME_QWEN_HF_TOP_P", "0.8"))
 DEFAULT_TOP_K = int(os.getenv("LOCAL_RUNTIME_QWEN_HF_TOP_K", "20"))
+# On CPU and CUDA, concurrent requests share one decode loop (the continuous batching engine).
+# LOCAL_RUNTIME_QWEN_HF_MAX_BATCH overrides the cap on every device; 1 turns batching off.
+DEFAULT_MAX_BATCH_SIZE = 4
+MAX_BATCH_SIZE_OVERRIDE = int(os.getenv("LOCAL_RUNTIME_QWEN_HF_MAX_BATCH", "0") or "0")
+BATCHED_DEVICE_TYPES = frozenset({"cpu", "cuda"})
 
 
 @lru_cache(maxsize=1)
@@ -172,11 +201,78 @@ def _cancellation_stopping_criteria(token: CancellationToken | None):
 
     class CancellationStoppingCriteria(StoppingCriteria):
         def __call__(self, *_args, **_kwargs):
-            return token.cancelled
+            return token.is_set()
 
     return StoppingCriteriaList([CancellationStoppingCriteria()])
 
 
+def _stopping_criteria(
+    token: CancellationToken | None,
+    validator: IncrementalJsonValidator | None,
+    tokenizer: Any,
+    prompt_length: int,
+    clock: GenerationClock | None = None,
+):
+    criteria = _cancellation_stopping_criteria(token)
+    if clock is not None:
+        from transformers import StoppingCriteria, StoppingCriteriaList  # type: ignore
+
+        class FirstTokenStoppingCriteria(StoppingCriteria):
+            # Called once per generated token.
+            def __call__(self, *_args, **_kwargs):
+                clock.token()
+                return False
+
+        if criteria is None:
+            criteria = StoppingCriteriaList()
+        criteria.append(FirstTokenStoppingCriteria())
+    if validator is None:
+        return criteria
+    from transformers import StoppingCriteria, StoppingCriteriaList  # type: ignore
+
+    detokenizer = IncrementalDetokenizer(lambda ids: tokenizer.decode(ids, skip_special_tokens=True))
+
+    class SchemaValidationStoppingCriteria(StoppingCriteria):
+        def __call__(self, input_ids, *_args, **_kwargs):
+            for token_id in input_ids[0, prompt_length + len(detokenizer.token_ids) :].tolist():
+                validator.feed(detokenizer.push(token_id))
+            return validator.stopped
+
+    if criteria is None:
+        criteria = StoppingCriteriaList()
+    criteria.append(SchemaValidationStoppingCriteria())
+    return criteria
+
+
+def _schema_logits_processors(constraint: TokenConstraint | None, prompt_length: int, greedy: bool):
+    if constraint is None:
+        return None
+    torch, _, _, _ = _load_backend()
+    from transformers import LogitsProcessor, LogitsProcessorList  # type: ignore
+
+    class SchemaLogitsProcessor(LogitsProcessor):
+        def __call__(self, input_ids, scores):
+            constraint.consume(input_ids[0, prompt_length + constraint.consumed :].tolist())
+            if greedy and constraint.allows(int(scores[0].argmax().item())):
+                return scores
+            return torch_restrict_logits(torch, scores, constraint)
+
+    return LogitsProcessorList([SchemaLogitsProcessor()])
+
+
+def _token_constraint(instance: dict[str, Any], schema: dict | None) -> TokenConstraint | None:
+    if not schema:
+        return None
+    vocabulary = instance.get("token_vocabulary")
+    if vocabulary is None:
+        tokenizer = instance["tokenizer"]
+        vocabulary = TokenVocabulary.from_tokenizer(
+            tokenizer, collect_eos_token_ids(instance["model"], tokenizer)
+        )
+        instance["token_vocabulary"] = vocabulary
+    return TokenConstraint(compile_json_schema(schema, constrained=True), vocabulary)
+
+
 def _select_device() -> str:
     torch, _, _, _ = _load_backend()
     override = os.getenv("LOCAL_RUNTIME_QWEN3_HF_DEVICE")
@@ -190,6 +286,13 @@ def _select_device() -> str:
     return "cpu"
 
 
+def _max_batch_size(device: str) -> int:
+    if MAX_BATCH_SIZE_OVERRIDE > 0:
+        return MAX_BATCH_SIZE_OVERRIDE
+    # Merged-KV decoding is not yet verified on MPS, so Metal keeps one generation at a time.
+    return DEFAULT_MAX_BATCH_SIZE if device.split(":", 1)[0] in BATCHED_DEVICE_TYPES else 1
+
+
 def load(ctx: RunContext) -> dict[str, Any]:
     _, AutoModelForCausalLM, AutoTokenizer, _ = _load_backend()
     model_ref = os.getenv("LOCAL_RUNTIME_QWEN3_HF_MODEL", SPEC["backend"]["model_ref"])
@@ -219,15 +322,37 @@ def load(ctx: RunContext) -> dict[str, Any]:
     device = _select_device()
     model.to(device)
     model.eval()
-    ctx.logger.info("qwen3_hf.load.ready", extra={"model_id": SPEC["id"], "device": device})
-    return {
+    max_batch_size = _max_batch_size(device)
+    ctx.logger.info(
+        "qwen3_hf.load.ready",
+        extra={"model_id": SPEC["id"], "device": device, "max_batch_size": max_batch_size},
+    )
+    instance = {
         "model": model,
         "tokenizer": tokenizer,
         "device": device,
         "model_ref": model_ref,
         "revision": revision,
-        "lock": threading.Lock(),
+        "lock": ModelRequestQueue(SPEC["id"]),
+        "prefix_cache": PrefixKVCache.from_env(),
     }
+    if max_batch_size > 1:
+        torch, _, _, _ = _load_backend()
+        instance["batch_engine"] = ContinuousBatchEngine(
+            HFBatchBackend(torch, model, tokenizer, device, prefix_cache=instance["prefix_cache"]),
+            max_batch_size=max_batch_size,
+            max_pending=MODEL_QUEUE_MAX_DEPTH,
+            logger=ctx.logger,
+            name="qwen3-hf-batch",
+        )
+    return instance
+
+
+def shutdown(instance: dict[str, Any], ctx: RunContext) -> None:
+    engine = instance.get("batch_engine")
+    if engine is not None:
+        engine.shutdown()
+        ctx.logger.info("qwen3_hf.batch_engine.stopped", extra={"model_id": SPEC["id"]})
 
 
 def warmup(instance: dict[str, Any], ctx: RunContext) -> None:
@@ -260,27 +385,119 @@ def warmup(instance: dict[str, Any], ctx: RunContext) -> None:
         )
 
 
+async def _generate_batched(
+    instance: dict[str, Any],
+    prompt: str,
+    params: dict[str, Any],
+    token: CancellationToken | None = None,
+    constraint: TokenConstraint | None = None,
+    validator: IncrementalJsonValidator | None = None,
+    retain_kv: bool = False,
+    clock: GenerationClock | None = None,
+) -> AsyncIterator[str]:
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[str | Exception | None] = asyncio.Queue()
+    clock = clock or GenerationClock()
+
+    def _post(item: str | Exception | None) -> None:
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    if token is not None:
+        token.raise_if_cancelled()
+    with clock.phase("tokenize"):
+        encoded = await asyncio.to_thread(instance["tokenizer"], prompt)
+    sequence = BatchSequence(
+        prompt_ids=list(encoded["input_ids"]),
+        params=params,
+        on_text=_post,
+        on_done=_post,
+        token=token,
+        constraint=constraint,
+        validator=validator,
+        retain_kv=retain_kv,
+    )
+    clock.prompt_tokens = len(sequence.prompt_ids)
+    clock.start()
+    instance["batch_engine"].submit(sequence)
+
+    async def _events() -> AsyncIterator[str]:
+        completed = False
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    completed = True
+                    break
+                if isinstance(item, Exception):
+                    completed = True
+                    raise item
+                clock.token()
+                yield item
+        finally:
+            # Chunks are detokenized text, not tokens; the engine counts the tokens.
+            clock.output_tokens = sequence.generated
+            clock.finish()
+            if not completed and token is not None:
+                token.cancel()
+
+    return _events()
+
+
 async def _generate(
     instance: dict[str, Any],
     prompt: str,
     params: dict[str, Any],
     token: CancellationToken | None = None,
+    constraint: TokenConstraint | None = None,
+    validator: IncrementalJsonValidator | None = None,
+    retain_kv: bool = False,
+    clock: GenerationClock | None = None,
 ) -> str:
+    if instance.get("batch_engine") is not None:
+        chunks = await _generate_batched(
+            instance, prompt, params, token, constraint, validator, retain_kv, clock=clock
+        )
+        return "".join([chunk async for chunk in chunks])
     torch, _, _, _ = _load_backend()
     tokenizer = instance["tokenizer"]
     model = instance["model"]
     device = instance["device"]
+    clock = clock or GenerationClock()
 
     def _invoke() -> str:
         if token is not None:
             token.raise_if_cancelled()
-        inputs = tokenizer(prompt, return_tensors="pt").to(device)
+        with clock.phase("tokenize"):
+            inputs = tokenizer(prompt, return_tensors="pt").to(device)
+        clock.prompt_tokens = inputs.input_ids.shape[-1]
         generation_kwargs = _generation_kwargs(params)
-        stopping_criteria = _cancellation_stopping_criteria(token)
+        stopping_criteria = _stopping_criteria(token, validator, tokenizer, inputs.input_ids.shape[-1], clock)
         if stopping_criteria is not None:
             generation_kwargs["stopping_criteria"] = stopping_criteria
+        logits_processors = _schema_logits_processors(
+            constraint, inputs.input_ids.shape[-1], not generation_kwargs["do_sample"]
+        )
+        if logits_processors is not None:
+            generation_kwargs["logits_processor"] = logits_processors
+        prefix_cache = instance.get("prefix_cache")
+        retain = retain_kv and prefix_cache is not None
+        if retain:
+            generation_kwargs["return_dict_in_generate"] = True
         with torch.inference_mode(), acquire_model_lock(instance["lock"], token):
-            output = model.generate(**inputs, **generation_kwargs)
+            clock.start()
+            prefix, _ = hf_prefill_prefix(model, prefix_cache, inputs.input_ids)
+            if prefix is not None:
+                generation_kwargs["past_key_values"] = prefix
+            try:
+                output = model.generate(**inputs, **generation_kwargs)
+            finally:
+                clock.finish()
+            if retain:
+                hf_retain_sequence(
+                    prefix_cache, output.sequences[0].tolist(), kv_layers(output.past_key_values)
+                )
+                output = output.sequences
         if token is not None:
             token.raise_if_cancelled()
         generated = output[0][inputs.input_ids.shape[-1] :]
@@ -294,12 +511,18 @@ async def _generate_stream(
     prompt: str,
     params: dict[str, Any],
     token: CancellationToken | None = None,
+    constraint: TokenConstraint | None = None,
+    validator: IncrementalJsonValidator | None = None,
+    clock: GenerationClock | None = None,
 ) -> AsyncIterator[str]:
+    if instance.get("batch_engine") is not None:
+        return await _generate_batched(instance, prompt, params, token, constraint, validator, clock=clock)
     torch, _, _, TextIteratorStreamer = _load_backend()
     tokenizer = instance["tokenizer"]
     model = instance["model"]
     device = instance["device"]
     streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+    clock = clock or GenerationClock()
     loop = asyncio.get_running_loop()
     queue: asyncio.Queue[str | Exception | None] = asyncio.Queue()
     ready: asyncio.Future[None] = loop.create_future()
@@ -316,18 +539,34 @@ async def _generate_stream(
         try:
             if token is not None:
                 token.raise_if_cancelled()
-            inputs = tokenizer(prompt, return_tensors="pt").to(device)
+            with clock.phase("tokenize"):
+                inputs = tokenizer(prompt, return_tensors="pt").to(device)
+            clock.prompt_tokens = inputs.input_ids.shape[-1]
             generation_kwargs = dict(
                 **inputs,
                 **_generation_kwargs(params),
                 streamer=streamer,
             )
-            stopping_criteria = _cancellation_stopping_criteria(token)
+            stopping_criteria = _stopping_criteria(
+                token, validator, tokenizer, inputs.input_ids.shape[-1], clock
+            )
             if stopping_criteria is not None:
                 generation_kwargs["stopping_criteria"] = stopping_criteria
+            logits_processors = _schema_logits_processors(
+                constraint, inputs.input_ids.shape[-1], not generation_kwargs["do_sample"]
+            )
+            if logits_processors is not None:
+                generation_kwargs["logits_processor"] = logits_processors
             with torch.inference_mode(), acquire_model_lock(instance["lock"], token):
                 loop.call_soon_threadsafe(_mark_ready)
-                model.generate(**generation_kwargs)
+                clock.start()
+                prefix, _ = hf_prefill_prefix(model, instance.get("prefix_cache"), inputs.input_ids)
+                if prefix is not None:
+                    generation_kwargs["past_key_values"] = prefix
+                try:
+                    model.generate(**generation_kwargs)
+                finally:
+                    clock.finish()
             if token is not None:
                 token.raise_if_cancelled()
         except Exception as exc:  # noqa: BLE001 - propagate arbitrary backend errors to the async caller
@@ -371,15 +610,33 @@ async def run(req: RunRequest, ctx: RunContext):
     instance = await ctx.registry.ensure_instance(model_id, ctx)
     if not instance:
         raise RuntimeError("Qwen3 HF model not initialized.")
-    prompt = _prepare_prompt(payload, tokenizer=instance.get("tokenizer"))
+    # A continuation resumes the assistant turn after a previous attempt's valid JSON prefix.
+    continuation = req.assistant_prefix or ""
+    with ctx.timings.phase("tokenize"):
+        prompt = _prepare_prompt(payload, tokenizer=instance.get("tokenizer")) + continuation
     params = _generation_params(payload)
+    constraint = (
+        await asyncio.to_thread(_token_constraint, instance, req.response_schema)
+        if req.constrained_decoding
+        else None
+    )
+    if constraint is not None and continuation and not constraint.resume(continuation):
+        constraint = None
+    validator = (
+        IncrementalJsonValidator(req.response_schema) if req.response_schema and constraint is None else None
+    )
+    if validator is not None and continuation:
+        validator.feed(continuation)
     run_meta = {
         "model_id": model_id,
         "stream": bool(req.stream),
         "prompt_chars": len(prompt),
+        "constrained": constraint is not None,
+        "continuation_chars": len(continuation),
     }
     ctx.logger.info("qwen3_hf.run.start", extra=run_meta)
     start = time.perf_counter()
+    clock = GenerationClock(ctx.timings)
 
     if req.stream:
         chunks = await _generate_stream(
@@ -387,6 +644,9 @@ async def run(req: RunRequest, ctx: RunContext):
             prompt,
             params,
             ctx.cancellation_token,
+            constraint,
+            validator,
+            clock=clock,
         )
 
         async def generator() -> AsyncIterator[dict]:
@@ -404,6 +664,8 @@ async def run(req: RunRequest, ctx: RunContext):
                     }
                 response["output_text"] = accumulated
                 response["output"][0]["content"][0]["text"] = accumulated
+                response["usage"] = clock.usage()
+                observe_generation(model_id, response["usage"])
                 yield {
                     "event": "response.output_text.done",
                     "data": {"id": response["id"], "text": accumulated},
@@ -415,6 +677,7 @@ async def run(req: RunRequest, ctx: RunContext):
                     "qwen3_hf.run.complete",
                     extra={
                         **run_meta,
+                        **clock.usage(),
                         "duration_ms": duration_ms,
                         "output_chars": len(accumulated),
                     },
@@ -422,15 +685,28 @@ async def run(req: RunRequest, ctx: RunContext):
 
         return generator()
 
-    reply = await _generate(instance, prompt, params, ctx.cancellation_token)
+    reply = await _generate(
+        instance,
+        prompt,
+        params,
+        ctx.cancellation_token,
+        constraint,
+        validator,
+        retain_kv=bool(req.response_schema),
+        clock=clock,
+    )
     payload = new_response(model_id, reply, request_id=ctx.request_id)
+    payload["usage"] = clock.usage()
+    observe_generation(model_id, payload["usage"])
     duration_ms = round((time.perf_counter() - start) * 1000, 2)
     ctx.logger.info(
         "qwen3_hf.run.complete",
         extra={
             **run_meta,
+            **payload["usage"],
             "duration_ms": duration_ms,
             "output_chars": len(reply),
+            "validation": validator.status if validator is not None else None,
         },
     )
     return payload
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import os
 import threading
 import time
@@ -8,7 +9,17 @@ from collections.abc import AsyncIterator, Callable
 from pathlib import Path
 from typing import Any
 
-from local_runtime.cancellation import CancellationToken, acquire_model_lock
+from local_runtime.cancellation import CancellationToken, ModelRequestQueue, acquire_model_lock
+from local_runtime.core.metrics import observe_generation
+from local_runtime.core.timing import GenerationClock
+from local_runtime.helpers.json_constraint import (
+    IncrementalJsonValidator,
+    TokenConstraint,
+    TokenVocabulary,
+    compile_json_schema,
+    mlx_restrict_logits,
+)
+from local_runtime.helpers.prefix_cache import PrefixKVCache
 from local_runtime.helpers.responses_helpers import new_response
 from local_runtime.runtime_types import RunContext, RunRequest
 
@@ -33,6 +44,7 @@ SPEC = {
         "endpoint": "responses",
         "advertised_model_name": "qwen3-mlx",
         "supports_stream": True,
+        "supports_continuation": True,
     },
     "limits": {
         "timeout_sec": 300,
@@ -50,6 +62,7 @@ SPEC = {
     "execution": {
         "mode": "inprocess",
         "warmup_on_start": False,
+        "idle_ttl_sec": 1800,
     },
     "launch": {
         "enabled": False,
@@ -160,6 +173,35 @@ def _build_sampling_components(params: dict[str, Any]):
     return sampler, logits_processors
 
 
+def _schema_logits_processor(constraint: TokenConstraint, greedy: bool) -> Callable[[Any, Any], Any]:
+    import mlx.core as mx  # type: ignore
+
+    prompt_length: list[int] = []
+
+    def _processor(tokens: Any, logits: Any) -> Any:
+        if not prompt_length:
+            prompt_length.append(int(tokens.size))
+        constraint.consume(tokens[prompt_length[0] + constraint.consumed :].tolist())
+        if greedy and constraint.allows(int(mx.argmax(logits, axis=-1).item())):
+            return logits
+        return mlx_restrict_logits(mx, logits, constraint)
+
+    return _processor
+
+
+def _token_constraint(instance: dict, schema: dict | None) -> TokenConstraint | None:
+    if not schema:
+        return None
+    vocabulary = instance.get("token_vocabulary")
+    if vocabulary is None:
+        wrapper = instance["tokenizer"]
+        tokenizer = getattr(wrapper, "_tokenizer", wrapper)
+        eos_token_ids = getattr(wrapper, "eos_token_ids", None) or [tokenizer.eos_token_id]
+        vocabulary = TokenVocabulary.from_tokenizer(tokenizer, eos_token_ids)
+        instance["token_vocabulary"] = vocabulary
+    return TokenConstraint(compile_json_schema(schema, constrained=True), vocabulary)
+
+
 def _extract_response_text(response: Any) -> str:
     text = getattr(response, "text", None)
     if isinstance(text, str):
@@ -167,37 +209,122 @@ def _extract_response_text(response: Any) -> str:
     return str(response)
 
 
+def _encode_prompt(tokenizer: Any, prompt: str) -> list[int]:
+    # Mirrors mlx_lm.stream_generate so cached and uncached prompts tokenize identically.
+    bos_token = getattr(tokenizer, "bos_token", None)
+    add_special_tokens = bos_token is None or not prompt.startswith(bos_token)
+    return list(tokenizer.encode(prompt, add_special_tokens=add_special_tokens))
+
+
+def _restore_prefix(instance: dict, prompt: str) -> tuple[str | list[int], Any | None, list[int]]:
+    """Return the prompt left to prefill, a prompt cache holding the shared prefix, and the prompt ids.
+
+    Must be called while holding the model lock; the cached state is copied before
+    generation mutates it.
+    """
+    prefix_cache: PrefixKVCache | None = instance.get("prefix_cache")
+    if prefix_cache is None:
+        return prompt, None, []
+    import mlx.core as mx  # type: ignore
+    from mlx_lm.models.cache import make_prompt_cache, trim_prompt_cache  # type: ignore
+
+    model = instance["model"]
+    token_ids = _encode_prompt(instance["tokenizer"], prompt)
+    target = prefix_cache.boundary(len(token_ids))
+    hit = prefix_cache.lookup(token_ids)
+    if hit is not None:
+        prompt_cache = copy.deepcopy(hit.state)
+        trim_prompt_cache(prompt_cache, hit.state_length - hit.length)
+        cached_length = hit.length
+    else:
+        prompt_cache = make_prompt_cache(model)
+        cached_length = 0
+    if target > cached_length:
+        model(mx.array(token_ids[cached_length:target])[None], cache=prompt_cache)
+        mx.eval([entry.state for entry in prompt_cache])
+        cached_length = target
+        prefix_cache.store(
+            token_ids[:target],
+            copy.deepcopy(prompt_cache),
+            sum(entry.nbytes for entry in prompt_cache),
+        )
+    return token_ids[cached_length:], prompt_cache, token_ids
+
+
+def _retain_generation(instance: dict, token_ids: list[int], prompt_cache: Any) -> None:
+    """Store the prompt + output KV state so a continuation can resume from it (model lock held)."""
+    from mlx_lm.models.cache import trim_prompt_cache  # type: ignore
+
+    prefix_cache: PrefixKVCache = instance["prefix_cache"]
+    target = prefix_cache.boundary(min(len(token_ids), prompt_cache[0].offset) + 1)
+    if not target:
+        return
+    state = copy.deepcopy(prompt_cache)
+    trim_prompt_cache(state, state[0].offset - target)
+    prefix_cache.store(token_ids[:target], state, sum(entry.nbytes for entry in state))
+
+
 def _iterate_generation(
     instance: dict,
     prompt: str,
     params: dict[str, Any],
     token: CancellationToken | None,
     on_lock_acquired: Callable[[], None] | None = None,
+    constraint: TokenConstraint | None = None,
+    validator: IncrementalJsonValidator | None = None,
+    retain_kv: bool = False,
+    clock: GenerationClock | None = None,
 ):
     from mlx_lm import stream_generate  # type: ignore
 
     if token is not None:
         token.raise_if_cancelled()
     sampler, logits_processors = _build_sampling_components(params)
+    if constraint is not None:
+        logits_processors = [
+            *(logits_processors or []),
+            _schema_logits_processor(constraint, params["temperature"] <= 0),
+        ]
     previous_text = ""
+    clock = clock or GenerationClock()
     with acquire_model_lock(instance["lock"], token):
         if on_lock_acquired is not None:
             on_lock_acquired()
-        for response in stream_generate(
-            instance["model"],
-            instance["tokenizer"],
-            prompt=prompt,
-            max_tokens=params["max_tokens"],
-            sampler=sampler,
-            logits_processors=logits_processors,
-        ):
-            if token is not None:
-                token.raise_if_cancelled()
-            text = _extract_response_text(response)
-            delta = text.removeprefix(previous_text)
-            previous_text = text
-            if delta:
-                yield delta
+        clock.start()
+        remaining_prompt, prompt_cache, token_ids = _restore_prefix(instance, prompt)
+        # With a prefix cache the full prompt was tokenized here; otherwise stream_generate reports it.
+        clock.prompt_tokens = len(token_ids)
+        generation_kwargs: dict[str, Any] = {}
+        if prompt_cache is not None:
+            generation_kwargs["prompt_cache"] = prompt_cache
+        try:
+            for response in stream_generate(
+                instance["model"],
+                instance["tokenizer"],
+                prompt=remaining_prompt,
+                max_tokens=params["max_tokens"],
+                sampler=sampler,
+                logits_processors=logits_processors,
+                **generation_kwargs,
+            ):
+                clock.token()
+                if not token_ids:
+                    clock.prompt_tokens = getattr(response, "prompt_tokens", 0)
+                if token is not None and token.is_set():
+                    token.raise_if_cancelled()
+                if retain_kv:
+                    token_ids.append(response.token)
+                text = _extract_response_text(response)
+                delta = text.removeprefix(previous_text)
+                previous_text = text
+                if delta:
+                    yield delta
+                    if validator is not None and validator.feed(delta) != validator.PENDING:
+                        break
+        finally:
+            clock.finish()
+        if retain_kv and prompt_cache is not None:
+            _retain_generation(instance, token_ids, prompt_cache)
     if token is not None:
         token.raise_if_cancelled()
 
@@ -207,9 +334,24 @@ async def _generate_text(
     prompt: str,
     params: dict[str, Any],
     token: CancellationToken | None = None,
+    constraint: TokenConstraint | None = None,
+    validator: IncrementalJsonValidator | None = None,
+    retain_kv: bool = False,
+    clock: GenerationClock | None = None,
 ) -> str:
     def _invoke() -> str:
-        return "".join(_iterate_generation(instance, prompt, params, token))
+        return "".join(
+            _iterate_generation(
+                instance,
+                prompt,
+                params,
+                token,
+                constraint=constraint,
+                validator=validator,
+                retain_kv=retain_kv,
+                clock=clock,
+            )
+        )
 
     return await asyncio.to_thread(_invoke)
 
@@ -219,6 +361,9 @@ async def _generate_stream(
     prompt: str,
     params: dict[str, Any],
     token: CancellationToken | None = None,
+    constraint: TokenConstraint | None = None,
+    validator: IncrementalJsonValidator | None = None,
+    clock: GenerationClock | None = None,
 ) -> AsyncIterator[str]:
     loop = asyncio.get_running_loop()
     queue: asyncio.Queue[str | Exception | None] = asyncio.Queue()
@@ -240,6 +385,9 @@ async def _generate_stream(
                 params,
                 token,
                 lambda: loop.call_soon_threadsafe(_mark_ready),
+                constraint,
+                validator,
+                clock=clock,
             ):
                 loop.call_soon_threadsafe(queue.put_nowait, delta)
         except Exception as exc:  # noqa: BLE001 - propagate arbitrary backend errors to the async caller
@@ -298,7 +446,8 @@ def load(ctx: RunContext) -> dict[str, Any]:
         "tokenizer": tokenizer,
         "model_ref": model_ref,
         "revision": revision,
-        "lock": threading.Lock(),
+        "lock": ModelRequestQueue(SPEC["id"]),
+        "prefix_cache": PrefixKVCache.from_env(),
     }
 
 
@@ -342,15 +491,33 @@ async def run(req: RunRequest, ctx: RunContext):
     instance = await ctx.registry.ensure_instance(model_id, ctx)
     if not instance:
         raise RuntimeError("Qwen3 MLX model not initialized.")
-    prompt = _prepare_prompt(payload, tokenizer=instance.get("tokenizer"))
+    # A continuation resumes the assistant turn after a previous attempt's valid JSON prefix.
+    continuation = req.assistant_prefix or ""
+    with ctx.timings.phase("tokenize"):
+        prompt = _prepare_prompt(payload, tokenizer=instance.get("tokenizer")) + continuation
     params = _generation_params(payload)
+    constraint = (
+        await asyncio.to_thread(_token_constraint, instance, req.response_schema)
+        if req.constrained_decoding
+        else None
+    )
+    if constraint is not None and continuation and not constraint.resume(continuation):
+        constraint = None
+    validator = (
+        IncrementalJsonValidator(req.response_schema) if req.response_schema and constraint is None else None
+    )
+    if validator is not None and continuation:
+        validator.feed(continuation)
     run_meta = {
         "model_id": model_id,
         "stream": bool(req.stream),
         "prompt_chars": len(prompt),
+        "constrained": constraint is not None,
+        "continuation_chars": len(continuation),
     }
     ctx.logger.info("qwen3_mlx.run.start", extra=run_meta)
     start = time.perf_counter()
+    clock = GenerationClock(ctx.timings)
 
     if req.stream:
         chunks = await _generate_stream(
@@ -358,6 +525,9 @@ async def run(req: RunRequest, ctx: RunContext):
             prompt,
             params,
             ctx.cancellation_token,
+            constraint,
+            validator,
+            clock=clock,
         )
 
         async def generator() -> AsyncIterator[dict]:
@@ -375,6 +545,8 @@ async def run(req: RunRequest, ctx: RunContext):
                     }
                 response["output_text"] = accumulated
                 response["output"][0]["content"][0]["text"] = accumulated
+                response["usage"] = clock.usage()
+                observe_generation(model_id, response["usage"])
                 yield {
                     "event": "response.output_text.done",
                     "data": {"id": response["id"], "text": accumulated},
@@ -386,6 +558,7 @@ async def run(req: RunRequest, ctx: RunContext):
                     "qwen3_mlx.run.complete",
                     extra={
                         **run_meta,
+                        **clock.usage(),
                         "duration_ms": duration_ms,
                         "output_chars": len(accumulated),
                     },
@@ -393,15 +566,28 @@ async def run(req: RunRequest, ctx: RunContext):
 
         return generator()
 
-    reply = await _generate_text(instance, prompt, params, ctx.cancellation_token)
+    reply = await _generate_text(
+        instance,
+        prompt,
+        params,
+        ctx.cancellation_token,
+        constraint,
+        validator,
+        retain_kv=bool(req.response_schema),
+        clock=clock,
+    )
     payload = new_response(model_id, reply, request_id=ctx.request_id)
+    payload["usage"] = clock.usage()
+    observe_generation(model_id, payload["usage"])
     duration_ms = round((time.perf_counter() - start) * 1000, 2)
     ctx.logger.info(
         "qwen3_mlx.run.complete",
         extra={
             **run_meta,
+            **payload["usage"],
             "duration_ms": duration_ms,
             "output_chars": len(reply),
+            "validation": validator.status if validator is not None else None,
         },
     )
     return payload
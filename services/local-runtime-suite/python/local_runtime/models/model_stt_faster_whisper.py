@@ -5,11 +5,14 @@ import os
 import tempfile
 import threading
 import time
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Callable, Iterator
 from typing import Any
 
-from local_runtime.cancellation import CancellationToken, acquire_model_lock
-from local_runtime.helpers.multipart_helpers import UploadedFile
+from local_runtime.cancellation import CancellationToken, ModelRequestQueue, acquire_model_lock
+from local_runtime.core.metrics import observe_transcription
+from local_runtime.core.timing import RequestTimings, timed
+from local_runtime.helpers.multipart_helpers import BufferReader, UploadedFile
+from local_runtime.helpers.transcription_cache import TranscriptionCache, transcription_cache_key
 from local_runtime.runtime_types import RunContext, RunRequest
 
 SPEC = {
@@ -50,6 +53,7 @@ SPEC = {
     "execution": {
         "mode": "inprocess",
         "warmup_on_start": False,
+        "idle_ttl_sec": 1800,
     },
     "launch": {
         "enabled": False,
@@ -77,6 +81,10 @@ SPEC = {
 }
 
 
+# Whisper feature extraction expects 16 kHz mono audio.
+SAMPLING_RATE = 16000
+
+
 def load(ctx: RunContext) -> dict[str, Any]:
     try:
         from faster_whisper import WhisperModel  # type: ignore
@@ -118,7 +126,10 @@ def load(ctx: RunContext) -> dict[str, Any]:
         "model": model,
         "model_ref": model_ref,
         "revision": revision,
-        "lock": threading.Lock(),
+        "device": device,
+        "compute_type": compute_type,
+        "lock": ModelRequestQueue(SPEC["id"]),
+        "transcription_cache": TranscriptionCache.from_env(ctx.cache_dir, "faster-whisper"),
     }
 
 
@@ -134,9 +145,25 @@ def _extract_upload(req: RunRequest) -> UploadedFile:
         filename = getattr(file_entry, "filename", "audio")
         content_type = getattr(file_entry, "content_type", "application/octet-stream")
         data = getattr(file_entry, "data", None)
-    if not isinstance(data, (bytes, bytearray)):
+    if not isinstance(data, (bytes, bytearray, memoryview)):
         raise TypeError("Invalid audio payload.")
-    return UploadedFile(filename=filename, content_type=content_type, data=bytes(data))
+    return UploadedFile(filename=filename, content_type=content_type, data=data)
+
+
+def _decode_in_memory(upload: UploadedFile) -> Any | None:
+    """Decode the upload with PyAV straight from memory into float32 PCM at Whisper's rate.
+
+    Returns ``None`` when the container cannot be decoded from a buffer, in which case
+    the caller falls back to a temp file that ``transcribe`` opens itself.
+    """
+    try:
+        from faster_whisper import decode_audio  # type: ignore
+    except ImportError:
+        return None
+    try:
+        return decode_audio(BufferReader(upload.data), sampling_rate=SAMPLING_RATE)
+    except Exception:  # noqa: BLE001 - any PyAV/FFmpeg failure falls back to the temp file path
+        return None
 
 
 def _write_temp_audio(upload: UploadedFile, cache_dir: str) -> str:
@@ -176,44 +203,168 @@ def _serialize_segment(segment: Any, index: int) -> dict[str, Any]:
     return payload
 
 
-def _transcribe_sync(
+def _iterate_segments(
     instance: dict[str, Any],
-    audio_path: str,
+    audio: Any,
     *,
     language: str | None,
     prompt: str | None,
     token: CancellationToken | None = None,
-) -> tuple[str, list[dict[str, Any]], str | None, float | None]:
-    beam_size = max(1, int(os.getenv("LOCAL_RUNTIME_FASTER_WHISPER_BEAM_SIZE", "5")))
+    on_lock_acquired: Callable[[], None] | None = None,
+    on_info: Callable[[Any], None] | None = None,
+    timings: RequestTimings | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield serialized segments as faster-whisper decodes them, holding the model lock throughout."""
     if token is not None:
         token.raise_if_cancelled()
-    with acquire_model_lock(instance["lock"], token):
+    with acquire_model_lock(instance["lock"], token), timed(timings, "transcribe"):
+        if on_lock_acquired is not None:
+            on_lock_acquired()
         segments_iter, info = instance["model"].transcribe(
-            audio_path,
+            audio,
             language=language or None,
             initial_prompt=prompt or None,
-            beam_size=beam_size,
+            beam_size=_beam_size(),
             vad_filter=True,
             word_timestamps=True,
         )
-        segments = []
+        if on_info is not None:
+            on_info(info)
         for index, segment in enumerate(segments_iter):
             if token is not None:
                 token.raise_if_cancelled()
-            segments.append(_serialize_segment(segment, index))
+            yield _serialize_segment(segment, index)
     if token is not None:
         token.raise_if_cancelled()
+
+
+def _transcribe_sync(
+    instance: dict[str, Any],
+    audio: Any,
+    *,
+    language: str | None,
+    prompt: str | None,
+    token: CancellationToken | None = None,
+    timings: RequestTimings | None = None,
+) -> tuple[str, list[dict[str, Any]], str | None, float | None]:
+    infos: list[Any] = []
+    segments = list(
+        _iterate_segments(
+            instance,
+            audio,
+            language=language,
+            prompt=prompt,
+            token=token,
+            on_info=infos.append,
+            timings=timings,
+        )
+    )
     text = " ".join(segment["text"] for segment in segments if segment["text"]).strip()
+    return (text, segments, *_language_fields(infos[0] if infos else None))
+
+
+def _beam_size() -> int:
+    return max(1, int(os.getenv("LOCAL_RUNTIME_FASTER_WHISPER_BEAM_SIZE", "5")))
+
+
+def _language_fields(info: Any) -> tuple[str | None, float | None]:
     detected_language = getattr(info, "language", None)
     language_probability = getattr(info, "language_probability", None)
     return (
-        text,
-        segments,
         str(detected_language) if detected_language else None,
         float(language_probability) if language_probability is not None else None,
     )
 
 
+def _transcription_response(
+    transcript: str,
+    segments: list[dict[str, Any]],
+    language: str | None,
+    language_probability: float | None,
+) -> dict[str, Any]:
+    response: dict[str, Any] = {"text": transcript, "segments": segments, "language": language}
+    if language_probability is not None:
+        response["language_probability"] = language_probability
+    return response
+
+
+async def _replay_stream(response: dict[str, Any]) -> AsyncIterator[dict]:
+    for segment in response["segments"]:
+        if segment["text"]:
+            yield {"event": "transcript.text.delta", "data": {"text": segment["text"]}}
+    yield {"event": "transcript.text.done", "data": {"text": response["text"]}}
+
+
+async def _stream_segments(
+    instance: dict[str, Any],
+    audio: Any,
+    *,
+    language: str | None,
+    prompt: str | None,
+    token: CancellationToken | None = None,
+    on_info: Callable[[Any], None] | None = None,
+    on_finished: Callable[[], None] | None = None,
+    timings: RequestTimings | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Forward segments from a worker thread as they are decoded.
+
+    Returns once the model lock is held, so queueing errors surface before a stream
+    starts. ``on_finished`` runs on the worker thread after the model is released.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[dict[str, Any] | Exception | None] = asyncio.Queue()
+    ready: asyncio.Future[None] = loop.create_future()
+
+    def _mark_ready() -> None:
+        if not ready.done():
+            ready.set_result(None)
+
+    def _mark_failed(exc: Exception) -> None:
+        if not ready.done():
+            ready.set_exception(exc)
+
+    def _reader() -> None:
+        try:
+            for segment in _iterate_segments(
+                instance,
+                audio,
+                language=language,
+                prompt=prompt,
+                token=token,
+                on_lock_acquired=lambda: loop.call_soon_threadsafe(_mark_ready),
+                on_info=on_info,
+                timings=timings,
+            ):
+                loop.call_soon_threadsafe(queue.put_nowait, segment)
+        except Exception as exc:  # noqa: BLE001 - propagate arbitrary backend errors to the async caller
+            loop.call_soon_threadsafe(_mark_failed, exc)
+            loop.call_soon_threadsafe(queue.put_nowait, exc)
+        finally:
+            if on_finished is not None:
+                on_finished()
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    threading.Thread(target=_reader, daemon=True).start()
+    await ready
+
+    async def _events() -> AsyncIterator[dict[str, Any]]:
+        completed = False
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    completed = True
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            if not completed and token is not None:
+                token.cancel()
+
+    return _events()
+
+
 async def run(req: RunRequest, ctx: RunContext):
     model_id = req.model or SPEC["id"]
     instance = await ctx.registry.ensure_instance(model_id, ctx)
@@ -228,26 +379,111 @@ async def run(req: RunRequest, ctx: RunContext):
         "language": language,
         "input_bytes": len(upload.data),
     }
-    ctx.logger.info("faster_whisper.run.start", extra=run_meta)
     start = time.perf_counter()
-    audio_path = _write_temp_audio(upload, ctx.cache_dir)
+    cache: TranscriptionCache | None = instance.get("transcription_cache")
+    cache_key: str | None = None
+    if cache is not None:
+        cache_key = await asyncio.to_thread(
+            transcription_cache_key,
+            upload.data,
+            model_id=model_id,
+            revision=instance.get("revision"),
+            model_ref=instance.get("model_ref"),
+            # "default" resolves to a device-specific quantization, so both select the weights.
+            device=instance.get("device"),
+            compute_type=instance.get("compute_type"),
+            language=language or None,
+            prompt=prompt or None,
+            beam_size=_beam_size(),
+            vad_filter=True,
+            word_timestamps=True,
+        )
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        if cached is not None:
+            duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            ctx.logger.info(
+                "faster_whisper.run.complete", extra={**run_meta, "duration_ms": duration_ms, "cache": "hit"}
+            )
+            return _replay_stream(cached) if req.stream else cached
+    audio = await asyncio.to_thread(_decode_in_memory, upload)
+    audio_path = _write_temp_audio(upload, ctx.cache_dir) if audio is None else None
+    run_meta["decode"] = "file" if audio_path else "memory"
+    ctx.logger.info("faster_whisper.run.start", extra=run_meta)
+
+    def _cleanup() -> None:
+        if audio_path is None:
+            return
+        try:
+            os.remove(audio_path)
+        except OSError:
+            ctx.logger.warning(
+                "faster_whisper.temp_cleanup_failed",
+                extra={"model_id": model_id},
+            )
+
+    async def _store(response: dict[str, Any]) -> None:
+        if cache is not None and cache_key is not None:
+            await asyncio.to_thread(cache.put, cache_key, response)
+
+    source = audio if audio_path is None else audio_path
+    if req.stream:
+        infos: list[Any] = []
+        segments = await _stream_segments(
+            instance,
+            source,
+            language=language,
+            prompt=prompt,
+            token=ctx.cancellation_token,
+            on_info=infos.append,
+            on_finished=_cleanup,
+            timings=ctx.timings,
+        )
+
+        async def generator() -> AsyncIterator[dict]:
+            collected: list[dict[str, Any]] = []
+            texts: list[str] = []
+            try:
+                async for segment in segments:
+                    collected.append(segment)
+                    if segment["text"]:
+                        texts.append(segment["text"])
+                        yield {"event": "transcript.text.delta", "data": {"text": segment["text"]}}
+                transcript = " ".join(texts).strip()
+                detected_language, language_probability = _language_fields(infos[0] if infos else None)
+                observe_transcription(model_id, collected, time.perf_counter() - start)
+                await _store(
+                    _transcription_response(
+                        transcript, collected, detected_language or language, language_probability
+                    )
+                )
+                yield {"event": "transcript.text.done", "data": {"text": transcript}}
+            finally:
+                duration_ms = round((time.perf_counter() - start) * 1000, 2)
+                ctx.logger.info(
+                    "faster_whisper.run.complete",
+                    extra={
+                        **run_meta,
+                        "duration_ms": duration_ms,
+                        "segments": len(collected),
+                        "text_chars": sum(len(text) for text in texts),
+                    },
+                )
+
+        return generator()
+
     try:
         transcript, payload_segments, detected_language, language_probability = await asyncio.to_thread(
             _transcribe_sync,
             instance,
-            audio_path,
+            source,
             language=language,
             prompt=prompt,
             token=ctx.cancellation_token,
+            timings=ctx.timings,
         )
     finally:
-        try:
-            os.remove(audio_path)
-        except OSError:
-            ctx.logger.warning(
-                "faster_whisper.temp_cleanup_failed",
-                extra={"model_id": model_id},
-            )
+        _cleanup()
+    observe_transcription(model_id, payload_segments, time.perf_counter() - start)
     ctx.logger.info(
         "faster_whisper.run.output",
         extra={
@@ -257,32 +493,10 @@ async def run(req: RunRequest, ctx: RunContext):
             "detected_language": detected_language,
         },
     )
-
-    if req.stream:
-
-        async def generator() -> AsyncIterator[dict]:
-            for segment in payload_segments:
-                if segment["text"]:
-                    yield {"event": "transcript.text.delta", "data": {"text": segment["text"]}}
-            yield {"event": "transcript.text.done", "data": {"text": transcript}}
-
-        async def tracked() -> AsyncIterator[dict]:
-            try:
-                async for event in generator():
-                    yield event
-            finally:
-                duration_ms = round((time.perf_counter() - start) * 1000, 2)
-                ctx.logger.info("faster_whisper.run.complete", extra={**run_meta, "duration_ms": duration_ms})
-
-        return tracked()
-
-    response = {
-        "text": transcript,
-        "segments": payload_segments,
-        "language": detected_language or language,
-    }
-    if language_probability is not None:
-        response["language_probability"] = language_probability
+    response = _transcription_response(
+        transcript, payload_segments, detected_language or language, language_probability
+    )
+    await _store(response)
     duration_ms = round((time.perf_counter() - start) * 1000, 2)
     ctx.logger.info("faster_whisper.run.complete", extra={**run_meta, "duration_ms": duration_ms})
     return response
@@ -10,8 +10,11 @@ from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Any
 
-from local_runtime.cancellation import CancellationToken, acquire_model_lock
+from local_runtime.cancellation import CancellationToken, ModelRequestQueue, acquire_model_lock
+from local_runtime.core.metrics import observe_transcription
+from local_runtime.core.timing import RequestTimings, timed
 from local_runtime.helpers.multipart_helpers import UploadedFile
+from local_runtime.helpers.transcription_cache import TranscriptionCache, transcription_cache_key
 from local_runtime.runtime_types import RunContext, RunRequest
 
 SPEC = {
@@ -52,6 +55,7 @@ SPEC = {
     "execution": {
         "mode": "inprocess",
         "warmup_on_start": False,
+        "idle_ttl_sec": 1800,
     },
     "launch": {
         "enabled": False,
@@ -173,8 +177,9 @@ def load(ctx: RunContext) -> dict[str, Any]:
         "model": model,
         "model_ref": model_name,
         "revision": revision,
-        "lock": threading.Lock(),
+        "lock": ModelRequestQueue(SPEC["id"]),
         "ffmpeg_path": ffmpeg_path,
+        "transcription_cache": TranscriptionCache.from_env(ctx.cache_dir, "parakeet-mlx"),
     }
 
 
@@ -194,9 +199,9 @@ def _extract_upload(req: RunRequest) -> UploadedFile:
         filename = getattr(file_entry, "filename", "audio")
         content_type = getattr(file_entry, "content_type", "application/octet-stream")
         data = getattr(file_entry, "data", None)
-    if not isinstance(data, (bytes, bytearray)):
+    if not isinstance(data, (bytes, bytearray, memoryview)):
         raise TypeError("Invalid audio payload.")
-    return UploadedFile(filename=filename, content_type=content_type, data=bytes(data))
+    return UploadedFile(filename=filename, content_type=content_type, data=data)
 
 
 def _write_temp_audio(upload: UploadedFile, cache_dir: str) -> str:
@@ -215,19 +220,21 @@ def _write_temp_audio(upload: UploadedFile, cache_dir: str) -> str:
         return handle.name
 
 
+def _sentence_settings() -> dict[str, Any]:
+    return {
+        "max_words": int(os.getenv("LOCAL_RUNTIME_STT_SENTENCE_MAX_WORDS", "30")),
+        "silence_gap": float(os.getenv("LOCAL_RUNTIME_STT_SENTENCE_SILENCE_GAP", "4.0")),
+        "max_duration": float(os.getenv("LOCAL_RUNTIME_STT_SENTENCE_MAX_DURATION", "40.0")),
+    }
+
+
 def _build_decoding_config():
     try:
         from parakeet_mlx import DecodingConfig, SentenceConfig  # type: ignore
     except ImportError:
         return None
 
-    return DecodingConfig(
-        sentence=SentenceConfig(
-            max_words=int(os.getenv("LOCAL_RUNTIME_STT_SENTENCE_MAX_WORDS", "30")),
-            silence_gap=float(os.getenv("LOCAL_RUNTIME_STT_SENTENCE_SILENCE_GAP", "4.0")),
-            max_duration=float(os.getenv("LOCAL_RUNTIME_STT_SENTENCE_MAX_DURATION", "40.0")),
-        )
-    )
+    return DecodingConfig(sentence=SentenceConfig(**_sentence_settings()))
 
 
 def _build_transcribe_kwargs(
@@ -249,13 +256,14 @@ async def _run_transcribe(
     overlap_duration: float,
     decoding_config,
     token: CancellationToken | None = None,
+    timings: RequestTimings | None = None,
 ) -> Any:
     kwargs = _build_transcribe_kwargs(chunk_duration, overlap_duration, decoding_config)
 
     def _invoke():
         if token is not None:
             token.raise_if_cancelled()
-        with acquire_model_lock(instance["lock"], token):
+        with acquire_model_lock(instance["lock"], token), timed(timings, "transcribe"):
             result = instance["model"].transcribe(audio_path, **kwargs)
         if token is not None:
             token.raise_if_cancelled()
@@ -304,10 +312,8 @@ async def run(req: RunRequest, ctx: RunContext):
     if not instance:
         raise RuntimeError("Parakeet MLX model is not initialized.")
     upload = _extract_upload(req)
-    audio_path = _write_temp_audio(upload, ctx.cache_dir)
 
     form_data = req.form or {}
-    decoding_config = _build_decoding_config()
     chunk_duration, overlap_duration = _normalise_transcribe_window(
         form_data.get("chunk_duration", DEFAULT_CHUNK_SECONDS),
         form_data.get("overlap_duration", DEFAULT_OVERLAP_SECONDS),
@@ -322,26 +328,51 @@ async def run(req: RunRequest, ctx: RunContext):
     language = form_data.get("language")
     if language:
         run_meta["language"] = language
-    ctx.logger.info("parakeet_mlx.run.start", extra=run_meta)
     start = time.perf_counter()
-    try:
-        result = await _run_transcribe(
-            instance,
-            audio_path,
+    cache: TranscriptionCache | None = instance.get("transcription_cache")
+    cache_key: str | None = None
+    cached = None
+    if cache is not None:
+        cache_key = await asyncio.to_thread(
+            transcription_cache_key,
+            upload.data,
+            model_id=model_id,
+            revision=instance.get("revision"),
+            model_ref=instance.get("model_ref"),
             chunk_duration=chunk_duration,
             overlap_duration=overlap_duration,
-            decoding_config=decoding_config,
-            token=ctx.cancellation_token,
+            sentence=_sentence_settings(),
+            local_attention=os.getenv("LOCAL_RUNTIME_STT_LOCAL_ATTENTION", "0").lower(),
         )
-        transcript, payload_segments = _parse_result(result)
-    finally:
+        cached = await asyncio.to_thread(cache.get, cache_key)
+    if cached is not None:
+        transcript, payload_segments = cached["text"], cached["segments"]
+        run_meta["cache"] = "hit"
+    else:
+        audio_path = _write_temp_audio(upload, ctx.cache_dir)
+        ctx.logger.info("parakeet_mlx.run.start", extra=run_meta)
         try:
-            os.remove(audio_path)
-        except OSError:
-            ctx.logger.warning(
-                "parakeet_mlx.temp_cleanup_failed",
-                extra={"model_id": model_id},
+            result = await _run_transcribe(
+                instance,
+                audio_path,
+                chunk_duration=chunk_duration,
+                overlap_duration=overlap_duration,
+                decoding_config=_build_decoding_config(),
+                token=ctx.cancellation_token,
+                timings=ctx.timings,
             )
+            transcript, payload_segments = _parse_result(result)
+            observe_transcription(model_id, payload_segments, time.perf_counter() - start)
+        finally:
+            try:
+                os.remove(audio_path)
+            except OSError:
+                ctx.logger.warning(
+                    "parakeet_mlx.temp_cleanup_failed",
+                    extra={"model_id": model_id},
+                )
+        if cache is not None and cache_key is not None:
+            await asyncio.to_thread(cache.put, cache_key, {"text": transcript, "segments": payload_segments})
 
     ctx.logger.info(
         "parakeet_mlx.run.output",
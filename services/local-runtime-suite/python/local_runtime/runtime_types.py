@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from collections.abc import AsyncIterator
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from local_runtime.core.timing import RequestTimings
+
 if TYPE_CHECKING:
     from local_runtime.core.registry import ModelRegistry
 
@@ -21,6 +23,9 @@ class RunRequest(BaseModel):
     form: dict | None = None
     files: dict | None = None
     stream: bool | None = None
+    response_schema: dict | None = None
+    constrained_decoding: bool = False
+    assistant_prefix: str | None = None
 
 
 @dataclass
@@ -33,6 +38,7 @@ class RunContext:
     registry: ModelRegistry
     http_client: Any
     cancellation_token: Any | None = None
+    timings: RequestTimings = field(default_factory=RequestTimings)
 
 
 RunResult = dict | bytes | str | AsyncIterator[dict] | AsyncIterator[bytes]
@@ -31,6 +31,7 @@ class ApiSpec(BaseModel):
     endpoint: Literal["responses", "audio.speech", "audio.transcriptions", "audio.translations"]
     advertised_model_name: str
     supports_stream: bool
+    supports_continuation: bool = False
 
 
 class LimitsSpec(BaseModel):
@@ -57,6 +58,7 @@ class ExecutionSpec(BaseModel):
 
     mode: Literal["inprocess", "subprocess", "http_proxy"]
     warmup_on_start: bool
+    idle_ttl_sec: int | None = None
 
 
 class ReadySpec(BaseModel):
@@ -1 +0,0 @@
-"""Placeholder worker for LLM subprocess isolation."""
@@ -0,0 +1,408 @@
+"""Gateway side of subprocess model execution.
+
+A model whose ``execution.mode`` is ``"subprocess"`` is served by a ``WorkerPool``: one
+spawned process for accelerated models, or ``LOCAL_RUNTIME_CPU_WORKERS`` processes for
+CPU-only ones. ``SubprocessAdapter`` stands in for the adapter module, so the registry
+loads, warms up, evicts and unloads the pool exactly like an in-process instance while
+tokenization and decoding run outside the gateway's interpreter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from local_runtime.core.loader import LoadedModel
+from local_runtime.core.metrics import METRICS
+from local_runtime.runtime_types import RunRequest
+from local_runtime.spec import ModelSpec
+from local_runtime.workers.shared_buffers import SharedSegment, share_files
+from local_runtime.workers.worker import worker_main
+
+if TYPE_CHECKING:
+    from local_runtime.core.supervisor import Supervisor
+
+# "inprocess" or "subprocess" overrides every adapter's declared execution mode.
+EXECUTION_MODE_OVERRIDE = os.getenv("LOCAL_RUNTIME_EXECUTION_MODE", "").strip().lower()
+CPU_WORKERS = max(1, int(os.getenv("LOCAL_RUNTIME_CPU_WORKERS", "1") or "1"))
+WORKER_STOP_TIMEOUT_SECONDS = 5.0
+WORKER_PING_TIMEOUT_SECONDS = 5.0
+
+_END = object()
+
+
+class WorkerExitedError(RuntimeError):
+    """Raised for calls still in flight when a model worker process exits."""
+
+
+@dataclass(frozen=True)
+class WorkerSettings:
+    data_dir: str
+    cache_dir: str
+    platform: str
+    # Restarts workers that crash or stop answering; None leaves them unsupervised.
+    supervisor: Supervisor | None = None
+
+
+@dataclass
+class _Call:
+    ctx: Any
+    future: asyncio.Future[Any]
+    remove_callback: Callable[[], None]
+    events: asyncio.Queue[Any] | None = None
+    # Shared-memory copies of the request's uploads, released when the call finishes.
+    segments: list[SharedSegment] = field(default_factory=list)
+
+
+def execution_mode(spec: ModelSpec) -> str:
+    if EXECUTION_MODE_OVERRIDE in {"inprocess", "subprocess"}:
+        return EXECUTION_MODE_OVERRIDE
+    return spec.execution.mode
+
+
+def pool_size(spec: ModelSpec) -> int:
+    cpu_only = spec.backend.device_hint == "cpu" or spec.compat.acceleration == ["cpu"]
+    return CPU_WORKERS if cpu_only else 1
+
+
+def _replay_log(payload: dict[str, Any], pid: int) -> None:
+    name = payload.pop("logger", "local-runtime")
+    levelno = logging.getLevelName(str(payload.pop("level", "info")).upper())
+    if not isinstance(levelno, int):
+        levelno = logging.INFO
+    message = payload.pop("message", "")
+    payload.pop("timestamp", None)
+    record = logging.makeLogRecord(
+        {
+            **payload,
+            "name": name,
+            "levelno": levelno,
+            "levelname": logging.getLevelName(levelno),
+            "msg": message,
+            "worker_pid": pid,
+        }
+    )
+    logging.getLogger(name).handle(record)
+
+
+class ModelWorker:
+    """One spawned process serving one adapter, with calls multiplexed over a pipe.
+
+    Implements the supervisor's worker protocol: a restart spawns a new process and
+    runs ``load`` in it again.
+    """
+
+    kind = "model"
+
+    def __init__(self, loaded: LoadedModel, settings: WorkerSettings, index: int = 0) -> None:
+        self.module_name = loaded.name
+        self.spec = loaded.spec
+        self.settings = settings
+        self.index = index
+        self.name = f"{loaded.spec.id}#{index}"
+        self.alive = False
+        self._process: Any = None
+        self._conn: Any = None
+        self._reader: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._send_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._calls: dict[int, _Call] = {}
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid if self._process is not None else None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    @property
+    def running(self) -> bool:
+        return self.alive and self._process is not None and self._process.is_alive()
+
+    async def start(self, ctx: Any) -> None:
+        """Spawn the process and run the adapter's ``load`` hook in it."""
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe(duplex=True)
+        self._process = context.Process(
+            target=worker_main,
+            args=(
+                child_conn,
+                self.module_name,
+                {
+                    "spec": self.spec.model_dump(),
+                    "data_dir": self.settings.data_dir,
+                    "cache_dir": self.settings.cache_dir,
+                    "platform": self.settings.platform,
+                },
+            ),
+            name=f"model-worker:{self.spec.id}:{self.index}",
+            daemon=True,
+        )
+        await asyncio.to_thread(self._process.start)
+        child_conn.close()
+        self._loop = asyncio.get_running_loop()
+        self.alive = True
+        self._reader = threading.Thread(
+            target=self._read, name=f"model-worker-reader:{self.spec.id}:{self.index}", daemon=True
+        )
+        self._reader.start()
+        await self.call("load", ctx)
+
+    async def call(self, kind: str, ctx: Any, request: RunRequest | None = None) -> Any:
+        """Send one call; returns its result, or an async iterator for streamed results."""
+        if not self.alive or self._loop is None:
+            raise WorkerExitedError(f"The worker for {self.spec.id} is not running.")
+        call_id = next(self._ids)
+        token = getattr(ctx, "cancellation_token", None)
+        timings = getattr(ctx, "timings", None)
+        message: dict[str, Any] = {
+            "request_id": getattr(ctx, "request_id", f"worker:{self.name}"),
+            "elapsed": timings.elapsed_ms() / 1000 if timings is not None else 0.0,
+            "deadline_in": (
+                max(0.0, token.deadline - time.monotonic())
+                if token is not None and token.deadline is not None
+                else None
+            ),
+        }
+        segments: list[SharedSegment] = []
+        if request is not None:
+            files, segments = share_files(request.files)
+            message["request"] = request.model_copy(update={"files": files}) if segments else request
+        call = _Call(
+            ctx=ctx, future=self._loop.create_future(), remove_callback=lambda: None, segments=segments
+        )
+        self._calls[call_id] = call
+        self._send((kind, call_id, message))
+        if token is not None:
+            # Registered after the call is sent, so an early cancel still reaches the worker.
+            call.remove_callback = token.add_callback(lambda: self._send(("cancel", call_id, token.reason)))
+        try:
+            result = await call.future
+        except BaseException:
+            call.remove_callback()
+            if self._finish(call_id) is not None:
+                self._send(("cancel", call_id, "cancelled"))
+            raise
+        if call.events is None:
+            call.remove_callback()
+        return result
+
+    async def probe(self) -> bool:
+        """Round-trip a ping through the worker's event loop."""
+        try:
+            await asyncio.wait_for(self.call("ping", None), WORKER_PING_TIMEOUT_SECONDS)
+        except (asyncio.TimeoutError, WorkerExitedError):
+            return False
+        return True
+
+    async def stop(self) -> None:
+        await self.close()
+
+    def _send(self, message: tuple) -> None:
+        with self._send_lock:
+            try:
+                self._conn.send(message)
+            except (BrokenPipeError, EOFError, OSError):
+                pass  # the reader sees the exit and fails the pending calls
+
+    def _read(self) -> None:
+        pid = self.pid or 0
+        while True:
+            try:
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            if message[0] == "log":
+                _replay_log(message[1], pid)
+                continue
+            self._call_soon(self._dispatch, message)
+        self._call_soon(self._on_exit)
+
+    def _call_soon(self, callback: Callable[..., None], *args: Any) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # the loop closed after the check
+
+    def _dispatch(self, message: tuple) -> None:
+        kind, call_id = message[0], message[1]
+        call = self._calls.get(call_id)
+        if call is None:
+            return
+        if kind == "event":
+            if call.events is not None:
+                call.events.put_nowait(message[2])
+            return
+        _apply_extras(call.ctx, message[-1])
+        if kind == "stream":
+            call.events = asyncio.Queue()
+            call.future.set_result(self._stream(call_id, call, call.events))
+            return
+        self._finish(call_id)
+        if kind == "result":
+            if not call.future.done():
+                call.future.set_result(message[2])
+        elif kind == "end":
+            if call.events is not None:
+                call.events.put_nowait(_END)
+        elif kind == "error":
+            self._fail(call, message[2])
+
+    @staticmethod
+    def _fail(call: _Call, error: BaseException) -> None:
+        if call.events is not None:
+            call.events.put_nowait(error)
+        elif not call.future.done():
+            call.future.set_exception(error)
+
+    async def _stream(self, call_id: int, call: _Call, events: asyncio.Queue[Any]) -> AsyncIterator[Any]:
+        finished = False
+        try:
+            while True:
+                item = await events.get()
+                if item is _END:
+                    finished = True
+                    return
+                if isinstance(item, BaseException):
+                    finished = True
+                    raise item
+                yield item
+        finally:
+            call.remove_callback()
+            if not finished and self._finish(call_id) is not None:
+                self._send(("cancel", call_id, "cancelled"))
+
+    def _finish(self, call_id: int) -> _Call | None:
+        call = self._calls.pop(call_id, None)
+        if call is not None:
+            for segment in call.segments:
+                segment.release()
+        return call
+
+    def _on_exit(self) -> None:
+        self.alive = False
+        for call_id, call in list(self._calls.items()):
+            self._finish(call_id)
+            self._fail(call, WorkerExitedError(f"The worker for {self.spec.id} exited unexpectedly."))
+
+    async def close(self) -> None:
+        """Ask the worker to run its ``shutdown`` hook and exit; terminate it if it does not."""
+        if self._process is None:
+            return
+        self.alive = False
+        self._send(("stop",))
+        await asyncio.to_thread(self._process.join, WORKER_STOP_TIMEOUT_SECONDS)
+        if self._process.is_alive():
+            self._process.terminate()
+            await asyncio.to_thread(self._process.join, WORKER_STOP_TIMEOUT_SECONDS)
+        if self._reader is not None:
+            await asyncio.to_thread(self._reader.join, WORKER_STOP_TIMEOUT_SECONDS)
+        self._conn.close()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"pid": self.pid, "alive": self.alive, "in_flight": self.in_flight}
+
+
+def _apply_extras(ctx: Any, extras: dict[str, Any]) -> None:
+    timings = getattr(ctx, "timings", None)
+    if timings is not None:
+        for name, seconds in extras["timings"].items():
+            timings.record(name, seconds)
+    METRICS.replay(extras["metrics"])
+    token = getattr(ctx, "cancellation_token", None)
+    if token is not None and extras["queue_position"] is not None:
+        token.queue_position = extras["queue_position"]
+        token.queue_wait_ms = extras["queue_wait_ms"]
+
+
+class WorkerPool:
+    """The worker processes of one model; requests go to the least busy live worker."""
+
+    def __init__(self, loaded: LoadedModel, settings: WorkerSettings, size: int = 1) -> None:
+        self.model_id = loaded.spec.id
+        self.supervisor = settings.supervisor
+        self.workers = [ModelWorker(loaded, settings, index) for index in range(size)]
+
+    async def start(self, ctx: Any) -> None:
+        try:
+            await asyncio.gather(*(worker.start(ctx) for worker in self.workers))
+        except BaseException:
+            await self.close()
+            raise
+        if self.supervisor is not None:
+            for worker in self.workers:
+                self.supervisor.adopt(worker)
+
+    async def warmup(self, ctx: Any) -> None:
+        await asyncio.gather(*(worker.call("warmup", ctx) for worker in self.workers))
+
+    async def run(self, req: RunRequest, ctx: Any) -> Any:
+        alive = [worker for worker in self.workers if worker.alive]
+        if not alive:
+            raise WorkerExitedError(f"No worker for {self.model_id} is running.")
+        worker = min(alive, key=lambda candidate: candidate.in_flight)
+        return await worker.call("run", ctx, request=req)
+
+    async def close(self) -> None:
+        if self.supervisor is not None:
+            for worker in self.workers:
+                self.supervisor.forget(worker.name)
+        await asyncio.gather(*(worker.close() for worker in self.workers), return_exceptions=True)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [worker.snapshot() for worker in self.workers]
+
+
+class SubprocessAdapter:
+    """Adapter-module stand-in whose instance is the model's ``WorkerPool``."""
+
+    def __init__(self, loaded: LoadedModel, settings: WorkerSettings) -> None:
+        self.loaded = loaded
+        self.settings = settings
+        self.size = pool_size(loaded.spec)
+        hooks = {"load", "run", "shutdown"}
+        if loaded.has_hook("warmup"):
+            hooks.add("warmup")
+        self.hook_names = frozenset(hooks)
+
+    async def load(self, ctx: Any) -> WorkerPool:
+        pool = WorkerPool(self.loaded, self.settings, self.size)
+        await pool.start(ctx)
+        return pool
+
+    async def warmup(self, pool: WorkerPool, ctx: Any) -> None:
+        await pool.warmup(ctx)
+
+    async def shutdown(self, pool: WorkerPool, ctx: Any) -> None:
+        await pool.close()
+
+    async def run(self, req: RunRequest, ctx: Any) -> Any:
+        pool = await ctx.registry.ensure_instance(self.loaded.spec.id, ctx)
+        return await pool.run(req, ctx)
+
+
+def isolate_models(models: Iterable[LoadedModel], settings: WorkerSettings) -> list[LoadedModel]:
+    """Route every model whose execution mode is ``"subprocess"`` through a worker pool."""
+    isolated: list[LoadedModel] = []
+    for loaded in models:
+        if execution_mode(loaded.spec) != "subprocess":
+            isolated.append(loaded)
+            continue
+        adapter = SubprocessAdapter(loaded, settings)
+        isolated.append(
+            LoadedModel(name=loaded.name, module=adapter, spec=loaded.spec, hook_names=adapter.hook_names)
+        )
+    return isolated
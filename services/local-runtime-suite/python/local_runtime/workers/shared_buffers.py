@@ -0,0 +1,176 @@
+"""Shared-memory handoff of large request buffers to model worker processes.
+
+Uploads and decoded PCM are copied once into a ``multiprocessing.shared_memory``
+segment and only a ``SharedBuffer`` descriptor crosses the pipe; the worker maps the
+segment and the adapter reads it in place. The gateway owns each segment and unlinks
+it when the last reference is released, which happens when the call finishes, is
+cancelled or its worker exits. Workers only map and unmap.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any
+
+# Buffers smaller than this are cheaper to pickle than to map.
+SHARED_BUFFER_MIN_BYTES = int(os.getenv("LOCAL_RUNTIME_SHARED_BUFFER_MIN_KB", "64") or "64") * 1024
+
+
+@dataclass(frozen=True)
+class SharedBuffer:
+    """Picklable descriptor of a buffer held in a shared-memory segment."""
+
+    name: str
+    size: int
+    format: str = "B"
+    shape: tuple[int, ...] | None = None
+
+
+class SharedSegment:
+    """Gateway-side owner of one segment, unlinked when its reference count drops to zero."""
+
+    def __init__(self, data: Any) -> None:
+        view = memoryview(data)
+        if not view.c_contiguous:
+            raise ValueError("Only contiguous buffers can be shared.")
+        flat = view.cast("B")
+        self._memory = shared_memory.SharedMemory(create=True, size=max(1, flat.nbytes))
+        self._memory.buf[: flat.nbytes] = flat
+        self.descriptor = SharedBuffer(
+            name=self._memory.name,
+            size=flat.nbytes,
+            format=view.format,
+            shape=tuple(view.shape) if view.format != "B" or view.ndim != 1 else None,
+        )
+        self._refs = 1
+        self._lock = threading.Lock()
+
+    @property
+    def closed(self) -> bool:
+        return self._refs == 0
+
+    def acquire(self) -> SharedSegment:
+        with self._lock:
+            if self._refs == 0:
+                raise RuntimeError("Shared segment has already been released.")
+            self._refs += 1
+        return self
+
+    def release(self) -> None:
+        with self._lock:
+            if self._refs == 0:
+                return
+            self._refs -= 1
+            if self._refs:
+                return
+        self._memory.close()
+        try:
+            self._memory.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class AttachedBuffer:
+    """Worker-side mapping of a ``SharedBuffer``; ``data`` is a view, not a copy."""
+
+    def __init__(self, descriptor: SharedBuffer) -> None:
+        self.descriptor = descriptor
+        self._memory: shared_memory.SharedMemory | None = None
+        self._mapping: mmap.mmap | None = None
+        if sys.version_info >= (3, 13):
+            self._memory = shared_memory.SharedMemory(descriptor.name, track=False)
+            buffer = self._memory.buf
+        elif os.name == "nt":
+            # Windows segments are not tracked; the mapping lives while any handle is open.
+            self._memory = shared_memory.SharedMemory(descriptor.name)
+            buffer = self._memory.buf
+        else:
+            # Before 3.13 attaching registers the segment with the resource tracker that the
+            # worker shares with the gateway, so map it directly and leave ownership alone.
+            import _posixshmem
+
+            fd = _posixshmem.shm_open(f"/{descriptor.name}", os.O_RDWR, mode=0o600)
+            try:
+                self._mapping = mmap.mmap(fd, max(1, descriptor.size))
+            finally:
+                os.close(fd)
+            buffer = memoryview(self._mapping)
+        view = buffer[: descriptor.size]
+        if descriptor.format != "B" or descriptor.shape is not None:
+            view = view.cast(descriptor.format, descriptor.shape or [descriptor.size // view.itemsize])
+        self.data: memoryview | None = view
+
+    def close(self) -> None:
+        """Unmap the segment; a view the adapter still holds keeps the mapping until it is dropped."""
+        self.data = None
+        try:
+            if self._memory is not None:
+                self._memory.close()
+            elif self._mapping is not None:
+                self._mapping.close()
+        except BufferError:
+            pass
+
+
+def _shareable(value: Any) -> bool:
+    try:
+        return memoryview(value).nbytes >= SHARED_BUFFER_MIN_BYTES
+    except TypeError:
+        return False
+
+
+def share_files(files: dict[str, Any] | None) -> tuple[dict[str, Any] | None, list[SharedSegment]]:
+    """Move large ``data`` (and ``pcm``) buffers of upload entries into shared segments.
+
+    Returns the entries with descriptors in place of those buffers and the segments the
+    caller must release once the worker is done with them.
+    """
+    if not files:
+        return files, []
+    segments: list[SharedSegment] = []
+    shared: dict[str, Any] = {}
+    try:
+        for field, entry in files.items():
+            if not isinstance(entry, dict):
+                shared[field] = entry
+                continue
+            entry = dict(entry)
+            for key in ("data", "pcm"):
+                if _shareable(entry.get(key)):
+                    segment = SharedSegment(entry[key])
+                    segments.append(segment)
+                    entry[key] = segment.descriptor
+            shared[field] = entry
+    except BaseException:
+        for segment in segments:
+            segment.release()
+        raise
+    return shared, segments
+
+
+def attach_files(files: dict[str, Any] | None) -> tuple[dict[str, Any] | None, list[AttachedBuffer]]:
+    """Replace ``SharedBuffer`` descriptors in upload entries with views of the mapped segments."""
+    if not files:
+        return files, []
+    attached: list[AttachedBuffer] = []
+    resolved: dict[str, Any] = {}
+    try:
+        for field, entry in files.items():
+            if isinstance(entry, dict):
+                entry = dict(entry)
+                for key, value in entry.items():
+                    if isinstance(value, SharedBuffer):
+                        buffer = AttachedBuffer(value)
+                        attached.append(buffer)
+                        entry[key] = buffer.data
+            resolved[field] = entry
+    except BaseException:
+        for buffer in attached:
+            buffer.close()
+        raise
+    return resolved, attached
@@ -1 +0,0 @@
-"""Placeholder worker for STT subprocess isolation."""
@@ -1 +0,0 @@
-"""Placeholder worker for TTS subprocess isolation."""
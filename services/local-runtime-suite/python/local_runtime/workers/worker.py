@@ -0,0 +1,234 @@
+"""Entry point of a model worker process.
+
+The gateway sends ``load``, ``warmup``, ``run``, ``ping``, ``cancel`` and ``stop`` messages over a
+duplex pipe. The worker imports the adapter, runs its hooks through its own
+``ModelRegistry`` on its own event loop, and answers with results, stream events and
+errors tagged by call id. Log records, metric observations and phase timings travel
+back with the replies so the gateway reports them as if the adapter ran in-process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import logging
+import pickle
+import threading
+import time
+from multiprocessing.connection import Connection
+from typing import Any
+
+from local_runtime.cancellation import CancellationToken
+from local_runtime.core.loader import LazyModule, LoadedModel
+from local_runtime.core.logging import ContextFilter, StructuredFormatter, pop_log_context, push_log_context
+from local_runtime.core.metrics import METRICS
+from local_runtime.core.registry import ModelRegistry
+from local_runtime.core.timing import RequestTimings
+from local_runtime.runtime_types import RunContext
+from local_runtime.spec import validate_spec
+from local_runtime.workers.shared_buffers import AttachedBuffer, attach_files
+
+
+class _Sender:
+    """Serializes writes from the event loop, adapter threads and the log handler."""
+
+    def __init__(self, conn: Connection) -> None:
+        self._conn = conn
+        self._lock = threading.Lock()
+
+    def send(self, message: tuple) -> None:
+        with self._lock:
+            try:
+                self._conn.send(message)
+            except (BrokenPipeError, EOFError, OSError):
+                pass  # the gateway is gone; the inbox reader stops the worker
+
+
+class _PipeLogHandler(logging.Handler):
+    def __init__(self, sender: _Sender) -> None:
+        super().__init__()
+        self._sender = sender
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            payload = json.loads(self.format(record))
+        except Exception:  # noqa: BLE001 - logging must never crash the worker
+            return
+        self._sender.send(("log", payload))
+
+
+def _configure_logging(sender: _Sender) -> logging.Logger:
+    handler = _PipeLogHandler(sender)
+    handler.setFormatter(StructuredFormatter())
+    handler.addFilter(ContextFilter())
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.handlers = [handler]
+    return logging.getLogger("local-runtime")
+
+
+def _read_inbox(conn: Connection, loop: asyncio.AbstractEventLoop, inbox: asyncio.Queue) -> None:
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            message = ("stop",)
+        loop.call_soon_threadsafe(inbox.put_nowait, message)
+        if message[0] == "stop":
+            return
+
+
+def _portable(exc: BaseException) -> BaseException:
+    """Return ``exc`` if it survives a pickle round trip, otherwise a RuntimeError with its text."""
+    try:
+        pickle.loads(pickle.dumps(exc))
+    except Exception:  # noqa: BLE001 - adapter exceptions may hold arbitrary state
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
+    return exc
+
+
+def _extras(ctx: RunContext) -> dict[str, Any]:
+    """Phase timings and metric observations recorded since the previous reply."""
+    phases = dict(ctx.timings.phases)
+    ctx.timings.phases.clear()
+    token = ctx.cancellation_token
+    return {
+        "timings": phases,
+        "metrics": METRICS.take_pending(),
+        "queue_position": token.queue_position,
+        "queue_wait_ms": token.queue_wait_ms,
+    }
+
+
+class _Worker:
+    def __init__(self, conn: Connection, module_name: str, settings: dict[str, Any]) -> None:
+        self.sender = _Sender(conn)
+        self.logger = _configure_logging(self.sender)
+        # Imported on the first hook call, so an import failure is reported like a load failure.
+        self.module = LazyModule(module_name)
+        loaded = LoadedModel(name=module_name, module=self.module, spec=validate_spec(settings["spec"]))
+        self.model_id = loaded.spec.id
+        self.settings = settings
+        self.registry = ModelRegistry([loaded], settings["platform"], self.logger)
+        self.tokens: dict[int, CancellationToken] = {}
+
+    def context(self, call_id: int, call: dict[str, Any]) -> RunContext:
+        deadline_in = call.get("deadline_in")
+        token = CancellationToken(
+            call["request_id"],
+            deadline=None if deadline_in is None else time.monotonic() + deadline_in,
+        )
+        self.tokens[call_id] = token
+        timings = RequestTimings()
+        # Keep ``total`` relative to when the gateway received the request.
+        timings.started_at -= call.get("elapsed", 0.0)
+        return RunContext(
+            request_id=call["request_id"],
+            logger=self.logger,
+            data_dir=self.settings["data_dir"],
+            cache_dir=self.settings["cache_dir"],
+            platform=self.settings["platform"],
+            registry=self.registry,
+            http_client=None,
+            cancellation_token=token,
+            timings=timings,
+        )
+
+    def cancel(self, call_id: int, reason: str) -> None:
+        token = self.tokens.get(call_id)
+        if token is not None:
+            token.cancel(reason)
+
+    async def handle(self, kind: str, call_id: int, call: dict[str, Any]) -> None:
+        ctx = self.context(call_id, call)
+        log_token = push_log_context(request_id=ctx.request_id, model_id=self.model_id)
+        attached: list[AttachedBuffer] = []
+        try:
+            if kind == "load":
+                await self.registry.ensure_instance(self.model_id, ctx)
+                METRICS.take_pending()  # the gateway records the whole worker start as the load time
+                self.sender.send(("result", call_id, None, _extras(ctx)))
+            elif kind == "ping":
+                self.sender.send(("result", call_id, None, _extras(ctx)))
+            elif kind == "warmup":
+                await self._warmup(ctx)
+                self.sender.send(("result", call_id, None, _extras(ctx)))
+            else:
+                request = call["request"]
+                files, attached = attach_files(request.files)
+                if attached:
+                    request = request.model_copy(update={"files": files})
+                result = await self.module.run(request, ctx)
+                if not hasattr(result, "__aiter__"):
+                    self.sender.send(("result", call_id, result, _extras(ctx)))
+                    return
+                self.sender.send(("stream", call_id, _extras(ctx)))
+                try:
+                    async for item in result:
+                        self.sender.send(("event", call_id, item))
+                        # Stop producing for a consumer that went away, even if the adapter does not check.
+                        ctx.cancellation_token.raise_if_cancelled()
+                finally:
+                    aclose = getattr(result, "aclose", None)
+                    if aclose is not None:
+                        await aclose()
+                self.sender.send(("end", call_id, _extras(ctx)))
+        except Exception as exc:  # noqa: BLE001 - every failure is reported to the gateway
+            self.sender.send(("error", call_id, _portable(exc), _extras(ctx)))
+        finally:
+            for buffer in attached:
+                buffer.close()
+            self.tokens.pop(call_id, None)
+            pop_log_context(log_token)
+
+    async def _warmup(self, ctx: RunContext) -> None:
+        instance = await self.registry.ensure_instance(self.model_id, ctx)
+        hook = getattr(self.module, "warmup", None)
+        if hook is None:
+            return
+        if inspect.iscoroutinefunction(hook):
+            await hook(instance, ctx)
+        else:
+            await asyncio.to_thread(hook, instance, ctx)
+
+    async def shutdown(self) -> None:
+        try:
+            await self.registry.shutdown(lambda request_id: self.context(-1, {"request_id": request_id}))
+        except Exception:
+            self.logger.exception("worker.shutdown.error", extra={"model_id": self.model_id})
+
+
+async def _serve(conn: Connection, module_name: str, settings: dict[str, Any]) -> None:
+    worker = _Worker(conn, module_name, settings)
+    inbox: asyncio.Queue[tuple] = asyncio.Queue()
+    threading.Thread(
+        target=_read_inbox,
+        args=(conn, asyncio.get_running_loop(), inbox),
+        name="model-worker-inbox",
+        daemon=True,
+    ).start()
+    tasks: set[asyncio.Task[None]] = set()
+    while True:
+        message = await inbox.get()
+        kind = message[0]
+        if kind == "stop":
+            break
+        if kind == "cancel":
+            worker.cancel(message[1], message[2])
+            continue
+        task = asyncio.create_task(worker.handle(kind, message[1], message[2]))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    for task in list(tasks):
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await worker.shutdown()
+
+
+def worker_main(conn: Connection, module_name: str, settings: dict[str, Any]) -> None:
+    """Serve one adapter until the gateway sends ``stop`` or closes the pipe."""
+    try:
+        asyncio.run(_serve(conn, module_name, settings))
+    finally:
+        conn.close()
@@ -24,6 +24,8 @@ hiddenimports += [
 ]
 
 datas = []
+# Adapter sources let the loader read each SPEC without importing the backend module.
+datas += collect_data_files("local_runtime.models", include_py_files=True)
 datas += collect_data_files("mlx_lm", include_py_files=False)
 datas += collect_data_files("parakeet_mlx", include_py_files=False)
 datas += collect_data_files("imageio_ffmpeg", include_py_files=False)
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import pytest
+
+from local_runtime.helpers.multipart_helpers import UploadTooLargeError, read_multipart_form
+
 
 def test_audio_speech_disabled(client):
     response = client.post("/v1/audio/speech", json={"input": "Audio please", "response_format": "wav"})
@@ -16,3 +20,58 @@ def test_audio_transcription_json(client):
     payload = response.json()
     assert "text" in payload
     assert isinstance(payload["segments"], list)
+
+
+def test_audio_transcription_rejects_oversized_uploads_while_streaming(client, monkeypatch):
+    monkeypatch.setattr("local_runtime.main._max_upload_mb", lambda _endpoint: 1)
+    files = {"file": ("clip.wav", b"\x00" * (2 * 1024 * 1024), "audio/wav")}
+    response = client.post("/v1/audio/transcriptions", data={"response_format": "json"}, files=files)
+    assert response.status_code == 413
+    assert response.json()["error"]["code"] == "file_too_large"
+
+
+def test_audio_transcription_rejects_non_multipart_bodies(client):
+    response = client.post("/v1/audio/transcriptions", json={"file": "clip.wav"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_multipart_reader_stops_at_the_limit_and_buffers_files_once():
+    boundary = "limit-boundary"
+    head = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="model"\r\n\r\nwhisper\r\n'
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="a.wav"\r\n'
+        "Content-Type: audio/wav\r\n\r\n"
+    ).encode()
+    chunk = b"\x01" * (256 * 1024)
+
+    class StreamingRequest:
+        def __init__(self, chunks: int) -> None:
+            self.headers = {"content-type": f"multipart/form-data; boundary={boundary}"}
+            self.chunks = chunks
+            self.read = 0
+
+        async def stream(self):
+            yield head
+            for _ in range(self.chunks):
+                self.read += 1
+                yield chunk
+            yield f"\r\n--{boundary}--\r\n".encode()
+
+    small = StreamingRequest(chunks=2)
+    fields, files = await read_multipart_form(small, 1)
+    assert fields == {"model": "whisper"}
+    assert isinstance(files["file"].data, bytearray)
+    assert (files["file"].filename, files["file"].content_type) == ("a.wav", "audio/wav")
+    assert len(files["file"].data) == 2 * len(chunk)
+
+    oversized = StreamingRequest(chunks=100)
+    with pytest.raises(UploadTooLargeError):
+        await read_multipart_form(oversized, 1)
+    assert oversized.read == 5
+
+    declared = StreamingRequest(chunks=100)
+    declared.headers["content-length"] = str(100 * len(chunk))
+    with pytest.raises(UploadTooLargeError):
+        await read_multipart_form(declared, 1)
+    assert declared.read == 0
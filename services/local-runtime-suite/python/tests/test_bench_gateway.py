@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).resolve().parents[2] / "tools" / "bench_gateway.py"
+SPEC = importlib.util.spec_from_file_location("bench_gateway", SCRIPT_PATH)
+assert SPEC and SPEC.loader
+bench_gateway = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = bench_gateway
+SPEC.loader.exec_module(bench_gateway)
+
+
+def test_percentile_interpolates_between_samples() -> None:
+    values = [0.4, 0.1, 0.2, 0.3]
+
+    assert bench_gateway.percentile(values, 0.5) == pytest.approx(0.25)
+    assert bench_gateway.percentile(values, 1.0) == pytest.approx(0.4)
+    assert bench_gateway.percentile([], 0.95) == 0.0
+
+
+def test_parse_mix_rejects_unknown_kinds() -> None:
+    assert bench_gateway.parse_mix("plain=3, stream") == {"plain": 3, "stream": 1}
+    with pytest.raises(ValueError, match="Unknown request kind"):
+        bench_gateway.parse_mix("plain=1,embed=1")
+    with pytest.raises(ValueError, match="positive weight"):
+        bench_gateway.parse_mix("plain=0")
+
+
+def test_summary_reports_overhead_errors_and_throughput() -> None:
+    samples = [
+        bench_gateway.Sample("plain", 200, 0.120, 0.100),
+        bench_gateway.Sample("plain", 200, 0.130, 0.100),
+        bench_gateway.Sample("plain", 503, 0.001, 0.100),
+        bench_gateway.Sample("stream", 200, 0.400, 0.370, ttfb_s=0.060),
+    ]
+
+    report = bench_gateway.summarize(samples, elapsed_s=2.0)
+
+    assert report["throughput_rps"] == 2.0
+    assert report["overall"]["errors"] == 1
+    assert report["by_kind"]["plain"]["overhead_ms"]["p50"] == pytest.approx(25.0)
+    assert "ttfb_ms" not in report["by_kind"]["plain"]
+    assert report["by_kind"]["stream"]["ttfb_ms"]["p50"] == pytest.approx(60.0)
+
+
+def test_compare_flags_latency_and_throughput_regressions() -> None:
+    baseline = {"throughput_rps": 100.0, "by_kind": {"plain": {"latency_ms": {"p95": 100.0}}}}
+    steady = {"throughput_rps": 95.0, "by_kind": {"plain": {"latency_ms": {"p95": 110.0}}}}
+    slower = {"throughput_rps": 70.0, "by_kind": {"plain": {"latency_ms": {"p95": 150.0}}}}
+
+    assert bench_gateway.compare(steady, baseline, 0.2) == []
+    regressions = bench_gateway.compare(slower, baseline, 0.2)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("plain p95 latency")
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "tools" / "bench_hot_path.py"
+SPEC = importlib.util.spec_from_file_location("bench_hot_path", SCRIPT_PATH)
+assert SPEC and SPEC.loader
+bench_hot_path = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = bench_hot_path
+SPEC.loader.exec_module(bench_hot_path)
+
+
+def test_every_standalone_case_runs_and_reports_per_call_stats() -> None:
+    cases = bench_hot_path.build_cases()
+
+    results = {case.name: asyncio.run(bench_hot_path.measure(case, rounds=2, round_ms=0.5)) for case in cases}
+
+    assert "sse.format_sse_event" in results
+    assert "schema.validate_against_schema" in results
+    for stats in results.values():
+        assert stats["rounds"] == 2
+        assert 0 < stats["min_us"] <= stats["median_us"]
+
+
+def test_stored_baseline_covers_every_case() -> None:
+    baseline = json.loads(bench_hot_path.BASELINE_PATH.read_text(encoding="utf-8"))
+
+    assert {case.name for case in bench_hot_path.build_cases()} <= set(baseline)
+    assert {"middleware.request_context", "middleware.asgi_stack_health"} <= set(baseline)
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance() -> None:
+    baseline = {"fast": {"min_us": 10.0}, "slow": {"min_us": 10.0}}
+    results = {"fast": {"min_us": 11.0}, "slow": {"min_us": 14.0}, "new": {"min_us": 1.0}}
+
+    regressions = bench_hot_path.compare(results, baseline, 0.3)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("slow: 10.00 us -> 14.00 us")
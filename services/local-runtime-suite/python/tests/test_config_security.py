@@ -32,6 +32,7 @@ def test_protected_gateway_routes_require_pairing_key(client) -> None:
         "/doctor",
         "/health/details",
         "/runtime/config",
+        "/metrics",
     ):
         missing = client.get(path, headers={"Authorization": ""})
         assert missing.status_code == 401
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from local_runtime.cancellation import CancellationToken, InferenceCancelledError, ModelBusyError
+from local_runtime.helpers.continuous_batching import (
+    BatchSequence,
+    ContinuousBatchEngine,
+    HFBatchBackend,
+    IncrementalDetokenizer,
+)
+from local_runtime.models import model_llm_qwen3_hf
+
+EOS = 0
+
+
+class ScriptedBackend:
+    """Each prompt id selects a script of token ids; logits are the next scripted token."""
+
+    def __init__(self, scripts: dict[int, list[int]], *, step_delay: float = 0.0) -> None:
+        self.scripts = scripts
+        self.step_delay = step_delay
+        self.eos_token_ids = {EOS}
+        self.rows: list[list[int]] = []
+        self.batch_sizes: list[int] = []
+        self.resets = 0
+        self.retained: list[tuple[int, list[int]]] = []
+
+    def join(self, prompt_ids):
+        script = list(self.scripts[prompt_ids[0]]) + [EOS]
+        self.rows.append(script)
+        return script.pop(0)
+
+    def step(self, token_ids):
+        assert len(token_ids) == len(self.rows)
+        self.batch_sizes.append(len(token_ids))
+        time.sleep(self.step_delay)
+        return [row.pop(0) if row else EOS for row in self.rows]
+
+    def drop(self, keep):
+        self.rows = [self.rows[index] for index in keep]
+
+    def reset(self) -> None:
+        self.rows = []
+        self.resets += 1
+
+    def sample(self, logits, params):
+        return logits
+
+    def retain(self, row, token_ids):
+        self.retained.append((row, list(token_ids)))
+
+    def decode(self, token_ids):
+        return "".join(chr(token) for token in token_ids)
+
+
+class Collector:
+    def __init__(self) -> None:
+        self.text = ""
+        self.error: Exception | None = None
+        self.done = threading.Event()
+
+    def on_text(self, delta: str) -> None:
+        self.text += delta
+
+    def on_done(self, error: Exception | None) -> None:
+        self.error = error
+        self.done.set()
+
+
+def _sequence(prompt_id: int, collector: Collector, *, token=None, max_new_tokens: int = 64):
+    return BatchSequence(
+        prompt_ids=[prompt_id],
+        params={"max_new_tokens": max_new_tokens},
+        on_text=collector.on_text,
+        on_done=collector.on_done,
+        token=token,
+    )
+
+
+def _codes(text: str) -> list[int]:
+    return [ord(char) for char in text]
+
+
+def test_concurrent_sequences_share_decode_steps_and_keep_their_own_text() -> None:
+    backend = ScriptedBackend({1: _codes("hello world"), 2: _codes("hi")}, step_delay=0.005)
+    engine = ContinuousBatchEngine(backend, max_batch_size=4, max_pending=4)
+    first, second = Collector(), Collector()
+    try:
+        engine.submit(_sequence(1, first))
+        engine.submit(_sequence(2, second))
+        assert first.done.wait(timeout=2)
+        assert second.done.wait(timeout=2)
+    finally:
+        engine.shutdown()
+
+    assert (first.text, first.error) == ("hello world", None)
+    assert (second.text, second.error) == ("hi", None)
+    assert max(backend.batch_sizes) == 2
+    assert backend.batch_sizes[-1] == 1
+
+
+def test_cancelled_sequence_leaves_without_stalling_the_batch() -> None:
+    backend = ScriptedBackend({1: _codes("a" * 200), 2: _codes("steady")}, step_delay=0.002)
+    engine = ContinuousBatchEngine(backend, max_batch_size=2, max_pending=0)
+    token = CancellationToken("lrq_" + "a" * 32)
+    long_running, steady = Collector(), Collector()
+    try:
+        engine.submit(_sequence(1, long_running, token=token, max_new_tokens=500))
+        engine.submit(_sequence(2, steady))
+        assert steady.done.wait(timeout=2)
+        token.cancel()
+        assert long_running.done.wait(timeout=2)
+    finally:
+        engine.shutdown()
+
+    assert steady.text == "steady"
+    assert isinstance(long_running.error, InferenceCancelledError)
+    assert len(long_running.text) < 200
+
+
+def test_max_new_tokens_and_queue_bounds_are_enforced() -> None:
+    release = threading.Event()
+
+    class BlockingBackend(ScriptedBackend):
+        def join(self, prompt_ids):
+            release.wait(timeout=2)
+            return super().join(prompt_ids)
+
+    backend = BlockingBackend({1: _codes("abcdef"), 2: _codes("xyz")})
+    engine = ContinuousBatchEngine(backend, max_batch_size=1, max_pending=1)
+    first, second = Collector(), Collector()
+    try:
+        engine.submit(_sequence(1, first, max_new_tokens=3))
+        engine.submit(_sequence(2, second, token=CancellationToken("lrq_" + "b" * 32)))
+        with pytest.raises(ModelBusyError):
+            engine.submit(_sequence(2, Collector()))
+        release.set()
+        assert first.done.wait(timeout=2)
+        assert second.done.wait(timeout=2)
+    finally:
+        engine.shutdown()
+
+    assert first.text == "abc"
+    assert second.text == "xyz"
+
+
+def test_a_failing_join_fails_every_sequence_taken_off_the_queue() -> None:
+    release = threading.Event()
+
+    class FailingJoinBackend(ScriptedBackend):
+        def join(self, prompt_ids):
+            if prompt_ids[0] == 1:
+                release.wait(timeout=2)
+            if prompt_ids[0] == 2:
+                raise RuntimeError("prompt exceeds the context window")
+            return super().join(prompt_ids)
+
+    backend = FailingJoinBackend({1: _codes("a" * 50), 3: _codes("abc"), 4: _codes("ok")})
+    engine = ContinuousBatchEngine(backend, max_batch_size=4, max_pending=4)
+    active, failing, behind = Collector(), Collector(), Collector()
+    try:
+        engine.submit(_sequence(1, active))
+        engine.submit(_sequence(2, failing))
+        engine.submit(_sequence(3, behind))
+        release.set()
+        for collector in (active, failing, behind):
+            assert collector.done.wait(timeout=2)
+        after = Collector()
+        engine.submit(_sequence(4, after))
+        assert after.done.wait(timeout=2)
+    finally:
+        engine.shutdown()
+
+    for collector in (active, failing, behind):
+        assert isinstance(collector.error, RuntimeError)
+        assert str(collector.error) == "prompt exceeds the context window"
+    assert (after.text, after.error) == ("ok", None)
+
+
+def test_finished_rows_that_ask_for_it_retain_their_kv_state() -> None:
+    backend = ScriptedBackend({1: _codes("long reply"), 2: _codes("ok")}, step_delay=0.002)
+    engine = ContinuousBatchEngine(backend, max_batch_size=2, max_pending=2)
+    first, second = Collector(), Collector()
+    try:
+        engine.submit(_sequence(1, first))
+        retained = _sequence(2, second)
+        retained.retain_kv = True
+        engine.submit(retained)
+        assert first.done.wait(timeout=2)
+        assert second.done.wait(timeout=2)
+    finally:
+        engine.shutdown()
+
+    assert backend.retained == [(1, [2, *_codes("ok")])]
+
+
+def _tiny_causal_lm():
+    torch = pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+    torch.manual_seed(0)
+    config = transformers.LlamaConfig(
+        vocab_size=64,
+        hidden_size=32,
+        intermediate_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        num_key_value_heads=2,
+        max_position_embeddings=64,
+        attn_implementation="eager",
+    )
+    return torch, transformers.LlamaForCausalLM(config).eval()
+
+
+def _unbatched_logits(torch, model, prompt: list[int], count: int) -> list:
+    """Greedy decoding of one prompt on its own, the reference batched rows must match."""
+    rows = []
+    with torch.inference_mode():
+        output = model(input_ids=torch.tensor([prompt]), use_cache=True)
+        for _ in range(count):
+            rows.append(output.logits[0, -1])
+            token = int(rows[-1].argmax())
+            output = model(
+                input_ids=torch.tensor([[token]]), past_key_values=output.past_key_values, use_cache=True
+            )
+    return rows
+
+
+def test_hf_batch_backend_pads_joins_and_drops_rows_without_changing_their_output() -> None:
+    torch, model = _tiny_causal_lm()
+    backend = HFBatchBackend(torch, model, SimpleNamespace(eos_token_id=None), "cpu")
+    prompts = {"long": [3, 5, 7, 9, 11, 13, 15, 17, 19], "short": [4, 6, 8, 10], "late": list(range(20, 32))}
+    rows: dict[str, list] = {name: [] for name in prompts}
+
+    def advance(*names: str) -> None:
+        logits = backend.step([int(rows[name][-1].argmax()) for name in names])
+        for name, row in zip(names, logits, strict=True):
+            rows[name].append(row)
+
+    rows["long"].append(backend.join(prompts["long"]))
+    advance("long")
+    # The shorter prompt joins a batch whose rows are already 10 positions long.
+    rows["short"].append(backend.join(prompts["short"]))
+    assert backend._attention_mask.tolist() == [[1] * 10, [0] * 6 + [1] * 4]
+    assert backend._positions.tolist() == [10, 4]
+    assert backend._layers[0][0].shape[2] == 10
+
+    for _ in range(3):
+        advance("long", "short")
+    backend.drop([1])
+    assert backend._attention_mask.tolist() == [[1] * 7]
+    assert backend._positions.tolist() == [7]
+    assert all(keys.shape[0] == values.shape[0] == 1 for keys, values in backend._layers)
+    assert all(keys.shape[2] == values.shape[2] == 7 for keys, values in backend._layers)
+
+    # A longer prompt now pads the remaining row instead.
+    rows["late"].append(backend.join(prompts["late"]))
+    assert backend._attention_mask.tolist() == [[0] * 5 + [1] * 7, [1] * 12]
+    assert backend._positions.tolist() == [7, 12]
+    for _ in range(2):
+        advance("short", "late")
+
+    for name, prompt in prompts.items():
+        expected = _unbatched_logits(torch, model, prompt, len(rows[name]))
+        assert [int(row.argmax()) for row in rows[name]] == [int(row.argmax()) for row in expected]
+        for got, want in zip(rows[name], expected, strict=True):
+            torch.testing.assert_close(got, want, atol=1e-4, rtol=1e-4)
+
+
+def test_incremental_detokenizer_holds_back_partial_characters() -> None:
+    encoded = "é!".encode()
+
+    def decode(token_ids):
+        return bytes(token_ids).decode("utf-8", errors="replace")
+
+    detokenizer = IncrementalDetokenizer(decode)
+
+    assert detokenizer.push(encoded[0]) == ""
+    assert detokenizer.push(encoded[1]) == "é"
+    assert detokenizer.push(encoded[2]) == "!"
+    assert detokenizer.flush() == ""
+
+
+@pytest.mark.asyncio
+async def test_qwen_hf_streams_through_the_batch_engine() -> None:
+    backend = ScriptedBackend({7: _codes("batched reply")})
+    engine = ContinuousBatchEngine(backend, max_batch_size=2, max_pending=2)
+
+    def tokenizer(prompt):
+        return {"input_ids": [7]}
+
+    try:
+        stream = await model_llm_qwen3_hf._generate_stream(
+            {"tokenizer": tokenizer, "batch_engine": engine},
+            "prompt",
+            model_llm_qwen3_hf._generation_params({}),
+            CancellationToken("lrq_" + "c" * 32),
+        )
+        chunks = [chunk async for chunk in stream]
+    finally:
+        engine.shutdown()
+
+    assert "".join(chunks) == "batched reply"
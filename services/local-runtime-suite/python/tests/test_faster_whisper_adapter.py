@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import sys
 import threading
@@ -148,3 +149,133 @@ async def test_faster_whisper_stream_emits_transcript_events(tmp_path) -> None:
         "transcript.text.done",
     ]
     assert events[-1]["data"]["text"] == "I hear you. What feels hardest?"
+
+
+def _upload_request() -> RunRequest:
+    return RunRequest(
+        endpoint="audio.transcriptions",
+        model=model_stt_faster_whisper.SPEC["id"],
+        files={"file": {"filename": "response.webm", "content_type": "audio/webm", "data": b"webm-bytes"}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_faster_whisper_decodes_uploads_in_memory(monkeypatch, tmp_path) -> None:
+    decoded = [0.0, 0.25, -0.25]
+    buffers: list[bytes] = []
+
+    def decode_audio(source, sampling_rate):
+        buffers.append(source.read())
+        assert sampling_rate == 16000
+        return decoded
+
+    class ArrayWhisperModel(FakeWhisperModel):
+        def transcribe(self, audio, **kwargs):
+            assert audio is decoded
+            return iter([SimpleNamespace(start=0.0, end=0.5, text=" Decoded.", words=[])]), SimpleNamespace(
+                language="en", language_probability=0.9
+            )
+
+    monkeypatch.setitem(sys.modules, "faster_whisper", SimpleNamespace(decode_audio=decode_audio))
+    context = build_context(tmp_path, ArrayWhisperModel())
+
+    result = await model_stt_faster_whisper.run(_upload_request(), context)
+
+    assert result["text"] == "Decoded."
+    assert buffers == [b"webm-bytes"]
+    assert not (tmp_path / "cache").exists()
+
+
+@pytest.mark.asyncio
+async def test_faster_whisper_falls_back_to_a_temp_file_when_buffer_decode_fails(
+    monkeypatch, tmp_path
+) -> None:
+    def decode_audio(_source, sampling_rate):
+        raise ValueError("container needs a seekable file")
+
+    monkeypatch.setitem(sys.modules, "faster_whisper", SimpleNamespace(decode_audio=decode_audio))
+    model = FakeWhisperModel()
+    context = build_context(tmp_path, model)
+
+    result = await model_stt_faster_whisper.run(_upload_request(), context)
+
+    assert result["text"] == "I hear you. What feels hardest?"
+    assert model.calls[0]["audio_bytes"] == b"webm-bytes"
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_faster_whisper_stream_forwards_segments_as_they_are_decoded(tmp_path) -> None:
+    release = threading.Event()
+
+    class SlowWhisperModel(FakeWhisperModel):
+        def transcribe(self, audio_path: str, **kwargs):
+            def segments():
+                yield SimpleNamespace(start=0.0, end=1.0, text=" First.", words=[])
+                assert release.wait(timeout=2)
+                yield SimpleNamespace(start=1.0, end=2.0, text=" Second.", words=[])
+
+            return segments(), SimpleNamespace(language="en", language_probability=0.9)
+
+    context = build_context(tmp_path, SlowWhisperModel())
+    request = _upload_request()
+    request.stream = True
+
+    stream = await model_stt_faster_whisper.run(request, context)
+    first = await asyncio.wait_for(anext(stream), timeout=1)
+    release.set()
+    rest = [event async for event in stream]
+
+    assert first == {"event": "transcript.text.delta", "data": {"text": "First."}}
+    assert [event["event"] for event in rest] == ["transcript.text.delta", "transcript.text.done"]
+    assert rest[-1]["data"]["text"] == "First. Second."
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_faster_whisper_reuses_cached_transcripts_for_identical_audio(tmp_path) -> None:
+    from local_runtime.helpers.transcription_cache import TranscriptionCache
+
+    model = FakeWhisperModel()
+    context = build_context(tmp_path, model)
+    cache = TranscriptionCache(tmp_path / "transcriptions", max_bytes=1024 * 1024)
+    context.registry.instance["transcription_cache"] = cache
+
+    first = await model_stt_faster_whisper.run(_upload_request(), context)
+    second = await model_stt_faster_whisper.run(_upload_request(), context)
+    request = _upload_request()
+    request.stream = True
+    stream = await model_stt_faster_whisper.run(request, context)
+    events = [event async for event in stream]
+    request = _upload_request()
+    request.form = {"language": "fr"}
+    await model_stt_faster_whisper.run(request, context)
+
+    assert second == first
+    assert events[-1] == {"event": "transcript.text.done", "data": {"text": first["text"]}}
+    assert len(model.calls) == 2
+    assert cache.snapshot()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_faster_whisper_cache_misses_after_switching_checkpoint_or_quantization(tmp_path) -> None:
+    from local_runtime.helpers.transcription_cache import TranscriptionCache
+
+    model = FakeWhisperModel()
+    context = build_context(tmp_path, model)
+    instance = context.registry.instance
+    instance.update(
+        model_ref="base",
+        revision="r1",
+        compute_type="default",
+        transcription_cache=TranscriptionCache(tmp_path / "transcriptions", max_bytes=1024 * 1024),
+    )
+
+    await model_stt_faster_whisper.run(_upload_request(), context)
+    instance["model_ref"] = "/models/whisper-small"
+    await model_stt_faster_whisper.run(_upload_request(), context)
+    instance["compute_type"] = "int8"
+    await model_stt_faster_whisper.run(_upload_request(), context)
+    await model_stt_faster_whisper.run(_upload_request(), context)
+
+    assert len(model.calls) == 3
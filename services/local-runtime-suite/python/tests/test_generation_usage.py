@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from local_runtime.core.metrics import METRICS
+from local_runtime.core.timing import GenerationClock, RequestTimings
+from local_runtime.helpers.structured_enforcer import _merge_usage
+from local_runtime.models import model_llm_qwen3_mlx
+from local_runtime.runtime_types import RunContext, RunRequest
+
+
+def test_usage_counts_tokens_and_excludes_the_first_token_from_decode_rate() -> None:
+    timings = RequestTimings()
+    clock = GenerationClock(timings, requested_at=100.0)
+    clock.prompt_tokens = 12
+    clock.started_at = 100.5
+    clock.first_token_at = 101.0
+    clock.output_tokens = 21
+    clock.finished_at = 103.0
+
+    usage = clock.usage()
+
+    assert usage == {
+        "input_tokens": 12,
+        "output_tokens": 21,
+        "total_tokens": 33,
+        "time_to_first_token_ms": 1000.0,
+        "prefill_ms": 500.0,
+        "decode_tokens_per_second": 10.0,
+    }
+
+
+def test_usage_without_output_has_no_latency_figures() -> None:
+    usage = GenerationClock().usage()
+
+    assert usage["output_tokens"] == 0
+    assert usage["time_to_first_token_ms"] is None
+    assert usage["decode_tokens_per_second"] is None
+
+
+def test_structured_attempt_usage_sums_token_counts() -> None:
+    first = {"input_tokens": 10, "output_tokens": 4, "total_tokens": 14, "prefill_ms": 5.0}
+    second = {"input_tokens": 12, "output_tokens": 6, "total_tokens": 18, "prefill_ms": 2.0}
+
+    merged = _merge_usage(_merge_usage(None, first), second)
+
+    assert merged == {"input_tokens": 22, "output_tokens": 10, "total_tokens": 32, "prefill_ms": 2.0}
+    assert _merge_usage(merged, None) is merged
+
+
+def _mlx_context() -> RunContext:
+    instance = {"model": object(), "tokenizer": object(), "lock": threading.Lock()}
+
+    async def ensure_instance(_model_id, _ctx):
+        return instance
+
+    return RunContext(
+        request_id="req_usage",
+        logger=logging.getLogger("test.usage"),
+        data_dir="",
+        cache_dir="",
+        platform="darwin-arm64",
+        registry=SimpleNamespace(ensure_instance=ensure_instance),
+        http_client=None,
+    )
+
+
+def _stub_mlx(monkeypatch) -> None:
+    def stream_generate(*_args, **_kwargs):
+        for text in ("Hel", "Hello", "Hello!"):
+            yield SimpleNamespace(text=text, token=1, prompt_tokens=7)
+
+    monkeypatch.setitem(sys.modules, "mlx_lm", SimpleNamespace(stream_generate=stream_generate))
+    monkeypatch.setattr(model_llm_qwen3_mlx, "_build_sampling_components", lambda _params: ("sampler", []))
+
+
+@pytest.mark.asyncio
+async def test_mlx_stream_reports_usage_on_response_completed(monkeypatch) -> None:
+    _stub_mlx(monkeypatch)
+    METRICS.reset()
+    ctx = _mlx_context()
+    request = RunRequest(endpoint="responses", json={"input": "hi"}, stream=True)
+
+    events = [event async for event in await model_llm_qwen3_mlx.run(request, ctx)]
+
+    completed = events[-1]
+    assert completed["event"] == "response.completed"
+    usage = completed["data"]["usage"]
+    assert (usage["input_tokens"], usage["output_tokens"], usage["total_tokens"]) == (7, 3, 10)
+    assert usage["time_to_first_token_ms"] is not None
+    assert {"prefill", "decode", "tokenize"} <= set(ctx.timings.phases)
+    scrape = METRICS.render()
+    assert 'local_runtime_generated_tokens_total{model="local//llm/qwen3-mlx"} 3' in scrape
+    assert 'local_runtime_prompt_tokens_total{model="local//llm/qwen3-mlx"} 7' in scrape
+
+
+@pytest.mark.asyncio
+async def test_mlx_non_streaming_response_includes_usage(monkeypatch) -> None:
+    _stub_mlx(monkeypatch)
+    request = RunRequest(endpoint="responses", json={"input": "hi"})
+
+    payload = await model_llm_qwen3_mlx.run(request, _mlx_context())
+
+    assert payload["output_text"] == "Hello!"
+    assert payload["usage"]["output_tokens"] == 3
+    assert payload["usage"]["input_tokens"] == 7
@@ -13,9 +13,11 @@ import pytest
 from local_runtime.cancellation import (
     ActiveRequestRegistry,
     CancellationToken,
+    DisconnectMonitor,
     InferenceCancelledError,
     InferenceTimeoutError,
     ModelBusyError,
+    ModelRequestQueue,
     RequestIdInUseError,
     acquire_model_lock,
     validate_client_request_id,
@@ -46,6 +48,48 @@ def test_request_registry_rejects_collisions_and_cancellation_is_idempotent() ->
     registry.cancel(CLIENT_REQUEST_ID)
 
 
+class _ReceiveChannel:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.messages: asyncio.Queue[dict] = asyncio.Queue()
+
+    async def __call__(self) -> dict:
+        self.calls += 1
+        return await self.messages.get()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_monitor_cancels_on_the_disconnect_message_without_polling() -> None:
+    monitor = DisconnectMonitor()
+    receive = _ReceiveChannel()
+    token = CancellationToken(request_id=CLIENT_REQUEST_ID)
+
+    waiter = monitor.watch(receive, token)
+    await asyncio.sleep(0.05)
+    assert receive.calls == 1
+    assert not token.cancelled
+    assert monitor.watching() == 1
+
+    receive.messages.put_nowait({"type": "http.disconnect"})
+    await asyncio.wait_for(waiter, timeout=1)
+    assert token.cancelled
+    assert monitor.watching() == 0
+
+
+@pytest.mark.asyncio
+async def test_disconnect_monitor_stops_waiters_without_cancelling_tokens() -> None:
+    monitor = DisconnectMonitor()
+    tokens = [CancellationToken(request_id=f"req_{index}") for index in range(3)]
+    waiters = [monitor.watch(_ReceiveChannel(), token) for token in tokens]
+
+    waiters[0].cancel()
+    await monitor.close()
+
+    assert all(waiter.done() for waiter in waiters)
+    assert monitor.watching() == 0
+    assert not any(token.cancelled for token in tokens)
+
+
 @pytest.mark.parametrize(
     "request_id",
     [
@@ -80,6 +124,159 @@ def test_model_lock_fails_fast_instead_of_queueing() -> None:
     assert time.monotonic() - started < 0.5
 
 
+def test_model_queue_serves_waiters_in_arrival_order() -> None:
+    queue = ModelRequestQueue("local//test/queue", max_depth=4, max_wait_seconds=2)
+    order: list[str] = []
+    tokens = {name: CancellationToken(f"lrq_{name * 32}") for name in "bcd"}
+    assert queue.acquire()
+
+    def waiter(name: str) -> None:
+        with acquire_model_lock(queue, tokens[name]):
+            order.append(name)
+
+    threads = []
+    for name in "bcd":
+        thread = threading.Thread(target=waiter, args=(name,))
+        thread.start()
+        threads.append(thread)
+        while queue.snapshot()["depth"] < len(threads):
+            time.sleep(0.001)
+    queue.release()
+    for thread in threads:
+        thread.join(timeout=1)
+
+    assert order == ["b", "c", "d"]
+    assert [tokens[name].queue_position for name in "bcd"] == [1, 2, 3]
+    assert all(tokens[name].queue_wait_ms > 0 for name in "bcd")
+    assert queue.snapshot() == {
+        "busy": False,
+        "depth": 0,
+        "max_depth": 4,
+        "max_wait_seconds": 2,
+        "admitted": 4,
+        "rejected": 0,
+    }
+
+
+def test_model_queue_rejects_when_full_or_wait_expires() -> None:
+    queue = ModelRequestQueue("local//test/queue", max_depth=1, max_wait_seconds=0.05)
+    assert queue.acquire()
+    try:
+        started = time.monotonic()
+        with pytest.raises(ModelBusyError), acquire_model_lock(queue, CancellationToken(CLIENT_REQUEST_ID)):
+            pytest.fail("expired queue wait must not be admitted")
+        assert time.monotonic() - started < 0.5
+
+        entered = threading.Event()
+
+        def occupy_queue() -> None:
+            entered.set()
+            with pytest.raises(ModelBusyError):
+                queue.admit(max_wait_seconds=0.3)
+
+        occupant = threading.Thread(target=occupy_queue)
+        occupant.start()
+        assert entered.wait(timeout=1)
+        while queue.snapshot()["depth"] < 1:
+            time.sleep(0.001)
+        with pytest.raises(ModelBusyError, match="full"):
+            queue.admit(CancellationToken("lrq_" + "b" * 32))
+        occupant.join(timeout=1)
+    finally:
+        queue.release()
+    assert queue.snapshot()["rejected"] == 3
+
+
+def test_model_queue_waiter_leaves_when_cancelled() -> None:
+    queue = ModelRequestQueue("local//test/queue", max_depth=2, max_wait_seconds=5)
+    token = CancellationToken(CLIENT_REQUEST_ID)
+    assert queue.acquire()
+    errors: list[Exception] = []
+
+    def waiter() -> None:
+        try:
+            queue.admit(token)
+        except Exception as exc:  # noqa: BLE001 - captured for assertion on the main thread
+            errors.append(exc)
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    while queue.snapshot()["depth"] < 1:
+        time.sleep(0.001)
+    started = time.monotonic()
+    token.cancel()
+    thread.join(timeout=1)
+    queue.release()
+
+    assert time.monotonic() - started < 0.5
+    assert len(errors) == 1 and isinstance(errors[0], InferenceCancelledError)
+    assert queue.snapshot()["depth"] == 0
+    assert queue.acquire(blocking=False)
+    queue.release()
+
+
+def test_deadline_timer_cancels_tokens_without_anyone_polling() -> None:
+    fired = threading.Event()
+    token = CancellationToken(CLIENT_REQUEST_ID, deadline=time.monotonic() + 0.05)
+    token.add_callback(fired.set)
+    finished_early = CancellationToken("req_finished", deadline=time.monotonic() + 0.05)
+    finished_early.cancel()
+
+    assert fired.wait(timeout=2)
+    assert token.is_set()
+    with pytest.raises(InferenceTimeoutError):
+        token.raise_if_cancelled()
+    assert not isinstance(_raised(finished_early), InferenceTimeoutError)
+
+
+def _raised(token: CancellationToken) -> Exception | None:
+    try:
+        token.raise_if_cancelled()
+    except InferenceCancelledError as exc:
+        return exc
+    return None
+
+
+def test_cancellation_runs_callbacks_once_and_keeps_the_first_reason() -> None:
+    token = CancellationToken(CLIENT_REQUEST_ID)
+    calls: list[str] = []
+    token.add_callback(lambda: calls.append("kept"))
+    remove = token.add_callback(lambda: calls.append("removed"))
+    remove()
+
+    token.cancel()
+    token.cancel("timeout")
+    token.add_callback(lambda: calls.append("late"))
+
+    assert calls == ["kept", "late"]
+    assert type(_raised(token)) is InferenceCancelledError
+
+
+@pytest.mark.asyncio
+async def test_token_wait_wakes_the_coroutine_when_another_thread_cancels() -> None:
+    token = CancellationToken(CLIENT_REQUEST_ID)
+    timer = threading.Timer(0.05, token.cancel)
+    timer.start()
+
+    await asyncio.wait_for(token.wait(), timeout=2)
+
+    assert token.is_set()
+    await asyncio.wait_for(token.wait(), timeout=0.1)
+
+
+def test_model_queue_waiter_times_out_at_its_token_deadline() -> None:
+    queue = ModelRequestQueue("local//test/queue", max_depth=2, max_wait_seconds=5)
+    assert queue.acquire()
+    token = CancellationToken(CLIENT_REQUEST_ID, deadline=time.monotonic() + 0.1)
+    started = time.monotonic()
+
+    with pytest.raises(InferenceTimeoutError):
+        queue.admit(token)
+
+    assert time.monotonic() - started < 0.5
+    queue.release()
+
+
 @pytest.mark.asyncio
 async def test_qwen_mlx_cancellation_stops_iteration_and_releases_lock(monkeypatch) -> None:
     token = CancellationToken(CLIENT_REQUEST_ID)
@@ -449,6 +646,30 @@ def test_model_busy_is_returned_as_typed_409(client, monkeypatch) -> None:
     assert not app.state.active_requests.is_active(CLIENT_REQUEST_ID)
 
 
+def test_queue_position_is_reported_in_headers_and_health(client, monkeypatch) -> None:
+    queue = ModelRequestQueue("local//test/queue")
+    selected = _select_model("responses", None)
+
+    async def queued_fixture(_request, context):
+        with acquire_model_lock(queue, context.cancellation_token):
+            return "fixture response"
+
+    monkeypatch.setattr(selected.module, "run", queued_fixture)
+    monkeypatch.setitem(app.state.registry.model_instances, selected.spec.id, {"lock": queue})
+
+    response = client.post(
+        "/v1/responses",
+        headers={"X-Request-ID": CLIENT_REQUEST_ID},
+        json={"input": "fixture"},
+    )
+    details = client.get("/health/details")
+
+    assert response.status_code == 200
+    assert response.headers["x-queue-position"] == "0"
+    assert float(response.headers["x-queue-wait-ms"]) >= 0
+    assert details.json()["queues"][selected.spec.id]["admitted"] == 1
+
+
 def test_inference_deadline_is_returned_as_typed_504(client, monkeypatch) -> None:
     async def timeout_fixture(_request, _context):
         raise InferenceTimeoutError("The local inference request exceeded its deadline.")
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import json
+import random
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from local_runtime.helpers.continuous_batching import BatchSequence, ContinuousBatchEngine
+from local_runtime.helpers.json_constraint import (
+    IncrementalJsonValidator,
+    TokenConstraint,
+    TokenVocabulary,
+    compile_json_schema,
+)
+from local_runtime.helpers.structured_output import make_openai_strict_schema, validate_against_schema
+from local_runtime.models import model_llm_qwen3_mlx
+
+EVALUATION_SCHEMA = make_openai_strict_schema(
+    {
+        "type": "object",
+        "properties": {
+            "overall_score": {"type": "number"},
+            "label": {"type": "string", "enum": ["pass", "fail"]},
+            "criterion_scores": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "criterion_id": {"type": "string"},
+                        "score": {"type": "integer"},
+                        "rationale": {"type": "string"},
+                    },
+                },
+            },
+            "notes": {"type": ["string", "null"]},
+        },
+    }
+)
+VALID_DOCUMENT = {
+    "overall_score": 3.5,
+    "label": "pass",
+    "criterion_scores": [{"criterion_id": "c1", "score": 4, "rationale": 'said "hello" é'}],
+    "notes": None,
+}
+WORDS = [
+    '{"',
+    '"}',
+    '":',
+    '",',
+    '", "',
+    ' "',
+    "overall",
+    "_score",
+    "label",
+    "pass",
+    "fail",
+    "criterion",
+    "_scores",
+    "score",
+    "rationale",
+    "notes",
+    "null",
+    "true",
+    "12",
+    ".5",
+    "hello",
+    " world",
+    "\n  ",
+    "}",
+    "]",
+    "[{",
+    "}]",
+    "Sure",
+    "```json",
+]
+
+
+def _vocabulary() -> TokenVocabulary:
+    texts = [chr(code) for code in range(32, 127)] + WORDS + ["<eos>"]
+    return TokenVocabulary(texts, [len(texts) - 1])
+
+
+def _accepts(schema: dict, text: str, *, constrained: bool) -> bool:
+    automaton = compile_json_schema(schema, constrained=constrained)
+    return bool(automaton.advance_text(automaton.initial_state(), text))
+
+
+@pytest.mark.parametrize("constrained", [True, False])
+def test_automaton_accepts_documents_that_fit_the_schema(constrained: bool) -> None:
+    automaton = compile_json_schema(EVALUATION_SCHEMA, constrained=constrained)
+
+    for text in (json.dumps(VALID_DOCUMENT), json.dumps(VALID_DOCUMENT, separators=(",", ":"))):
+        state = automaton.advance_text(automaton.initial_state(), text)
+        assert automaton.is_finished(state)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        'Sure! {"overall_score": 1}',
+        '{"unexpected": 1',
+        '{"overall_score": "high"',
+        '{"label": "maybe"',
+        '{"criterion_scores": [{"score": 1.5',
+        '{"overall_score": 1, "overall_score"',
+    ],
+)
+def test_automaton_rejects_prefixes_that_cannot_become_valid(text: str) -> None:
+    assert not _accepts(EVALUATION_SCHEMA, text, constrained=True)
+
+
+def test_validation_mode_allows_pretty_printing_but_constrained_mode_does_not() -> None:
+    pretty = json.dumps(VALID_DOCUMENT, indent=2)
+
+    assert _accepts(EVALUATION_SCHEMA, pretty, constrained=False)
+    assert not _accepts(EVALUATION_SCHEMA, pretty, constrained=True)
+
+
+def test_required_keys_must_be_present_before_the_object_closes() -> None:
+    schema = {"type": "object", "properties": {"a": {"type": "integer"}}, "required": ["a"]}
+
+    assert not _accepts(schema, "{}", constrained=True)
+    assert _accepts(schema, '{"a":1}', constrained=True)
+    assert _accepts(schema, '{"a":1,"free":[true,null]}', constrained=True)
+
+
+def test_token_masks_follow_the_grammar() -> None:
+    vocabulary = _vocabulary()
+    constraint = TokenConstraint(compile_json_schema(EVALUATION_SCHEMA, constrained=True), vocabulary)
+
+    opening = {vocabulary.texts[token_id] for token_id in constraint.allowed().token_ids}
+    assert opening == {" ", "{", '{"'}
+
+    constraint.consume(vocabulary.texts.index(char) for char in '{"notes":"')
+    inside_string = constraint.allowed()
+    assert inside_string.include_plain
+    assert vocabulary.texts.index('",') in inside_string.token_ids
+    assert vocabulary.texts.index("\n  ") not in inside_string.token_ids
+
+    constraint.consume(vocabulary.texts.index(char) for char in 'x"')
+    after_value = {vocabulary.texts[token_id] for token_id in constraint.allowed().token_ids}
+    assert after_value == {" ", ","}
+
+
+def test_only_end_of_output_is_allowed_once_the_root_closes() -> None:
+    vocabulary = _vocabulary()
+    schema = {"type": "object", "properties": {"a": {"type": "null"}}, "additionalProperties": False}
+    constraint = TokenConstraint(compile_json_schema(schema, constrained=True), vocabulary)
+
+    constraint.consume(vocabulary.texts.index(text) for text in ['{"', "a", '":', "null", "}"])
+
+    assert constraint.finished
+    assert constraint.allowed().token_ids == tuple(vocabulary.eos_token_ids)
+    assert not constraint.allows(vocabulary.texts.index(" "))
+
+
+class RandomPreferenceBackend:
+    """A fake model whose logits are random preferences over the toy vocabulary."""
+
+    def __init__(self, vocabulary: TokenVocabulary, seed: int) -> None:
+        self.vocabulary = vocabulary
+        self.eos_token_ids = set(vocabulary.eos_token_ids)
+        self.random = random.Random(seed)
+        self.restricted = 0
+
+    def _logits(self) -> list[float]:
+        return [self.random.random() for _ in range(self.vocabulary.size)]
+
+    def join(self, prompt_ids):
+        return self._logits()
+
+    def step(self, token_ids):
+        return [self._logits() for _ in token_ids]
+
+    def drop(self, keep):
+        pass
+
+    def reset(self) -> None:
+        pass
+
+    def sample(self, logits, params):
+        return max(range(len(logits)), key=logits.__getitem__)
+
+    def restrict(self, logits, constraint):
+        self.restricted += 1
+        mask = constraint.allowed()
+        allowed = set(mask.token_ids)
+        if mask.include_plain:
+            allowed.update(self.vocabulary.plain_token_ids)
+        return [score if index in allowed else float("-inf") for index, score in enumerate(logits)]
+
+    def decode(self, token_ids):
+        return "".join(self.vocabulary.texts[token_id] for token_id in token_ids)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_constrained_batch_generation_is_valid_on_the_first_attempt(seed: int) -> None:
+    vocabulary = _vocabulary()
+    backend = RandomPreferenceBackend(vocabulary, seed)
+    engine = ContinuousBatchEngine(backend, max_batch_size=1, max_pending=1)
+    chunks: list[str] = []
+    done = threading.Event()
+    schema = {
+        "type": "object",
+        "properties": {
+            "label": {"type": "string", "enum": ["pass", "fail"]},
+            "score": {"type": "integer"},
+            "notes": {"type": "string", "maxLength": 12},
+        },
+        "required": ["label", "score", "notes"],
+        "additionalProperties": False,
+    }
+    try:
+        engine.submit(
+            BatchSequence(
+                prompt_ids=[0],
+                params={"max_new_tokens": 200},
+                on_text=chunks.append,
+                on_done=lambda _error: done.set(),
+                constraint=TokenConstraint(compile_json_schema(schema, constrained=True), vocabulary),
+            )
+        )
+        assert done.wait(timeout=5)
+    finally:
+        engine.shutdown()
+
+    parsed = json.loads("".join(chunks))
+    assert validate_against_schema(parsed, schema) == []
+    assert backend.restricted > 0
+
+
+@pytest.mark.parametrize(
+    "text",
+    [json.dumps(VALID_DOCUMENT, indent=2) + "\nHope that helps!", "```json\n" + json.dumps(VALID_DOCUMENT)],
+)
+def test_validator_completes_when_the_root_value_closes(text: str) -> None:
+    validator = IncrementalJsonValidator(EVALUATION_SCHEMA)
+
+    statuses = [validator.feed(chunk) for chunk in (text[:10], text[10:])]
+
+    assert statuses == [validator.PENDING, validator.COMPLETE]
+    assert text[: validator.valid_chars].rstrip().endswith("}")
+
+
+@pytest.mark.parametrize(
+    ("text", "valid_chars"),
+    [
+        ("Sure, here is the JSON", 0),
+        ('{"unexpected": 1}', 2),
+        ('{"overall_score": "high"}', 18),
+    ],
+)
+def test_validator_rejects_at_the_first_invalid_character(text: str, valid_chars: int) -> None:
+    validator = IncrementalJsonValidator(EVALUATION_SCHEMA)
+
+    assert validator.feed(text) == validator.REJECTED
+    assert validator.valid_chars == valid_chars
+    assert validator.feed("}") == validator.REJECTED
+
+
+class ScriptedBackend(RandomPreferenceBackend):
+    """Always prefers the next token of a fixed script."""
+
+    def __init__(self, vocabulary: TokenVocabulary, script: list[str]) -> None:
+        super().__init__(vocabulary, seed=0)
+        self.script = [vocabulary.texts.index(text) for text in script]
+        self.position = 0
+
+    def _logits(self) -> list[float]:
+        logits = [0.0] * self.vocabulary.size
+        logits[self.script[min(self.position, len(self.script) - 1)]] = 1.0
+        self.position += 1
+        return logits
+
+
+def test_unconstrained_batch_generation_stops_once_the_output_is_invalid() -> None:
+    vocabulary = _vocabulary()
+    backend = ScriptedBackend(vocabulary, ["Sure", ",", " ", "hello"] * 50)
+    engine = ContinuousBatchEngine(backend, max_batch_size=1, max_pending=1)
+    chunks: list[str] = []
+    done = threading.Event()
+    validator = IncrementalJsonValidator(EVALUATION_SCHEMA)
+    try:
+        engine.submit(
+            BatchSequence(
+                prompt_ids=[0],
+                params={"max_new_tokens": 200},
+                on_text=chunks.append,
+                on_done=lambda _error: done.set(),
+                validator=validator,
+            )
+        )
+        assert done.wait(timeout=5)
+    finally:
+        engine.shutdown()
+
+    assert validator.status == validator.REJECTED
+    assert "".join(chunks) == "Sure"
+    assert backend.restricted == 0
+
+
+@pytest.mark.asyncio
+async def test_mlx_generation_stops_once_the_document_is_complete(monkeypatch) -> None:
+    produced: list[str] = []
+
+    def stream_generate(*_args, **_kwargs):
+        text = ""
+        for piece in ['{"a": ', "1}", "\n\nLet me know", " if you need more."]:
+            produced.append(piece)
+            text += piece
+            yield SimpleNamespace(text=text)
+
+    monkeypatch.setitem(sys.modules, "mlx_lm", SimpleNamespace(stream_generate=stream_generate))
+    monkeypatch.setattr(model_llm_qwen3_mlx, "_build_sampling_components", lambda _params: ("sampler", []))
+    validator = IncrementalJsonValidator({"type": "object", "properties": {"a": {"type": "integer"}}})
+
+    result = await model_llm_qwen3_mlx._generate_text(
+        {"model": object(), "tokenizer": object(), "lock": threading.Lock()},
+        "prompt",
+        model_llm_qwen3_mlx._generation_params({}),
+        validator=validator,
+    )
+
+    assert result == '{"a": 1}'
+    assert validator.status == validator.COMPLETE
+    assert len(produced) == 2
+
+
+def test_validator_reports_the_valid_prefix_without_the_preamble() -> None:
+    validator = IncrementalJsonValidator(EVALUATION_SCHEMA)
+    text = '```json\n{"overall_score": 3, "label": "maybe"}'
+
+    assert validator.feed(text) == validator.REJECTED
+    assert validator.valid_prefix(text) == '{"overall_score": 3, "label": "'
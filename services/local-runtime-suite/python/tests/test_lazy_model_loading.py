@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import logging
+
+from local_runtime.core.importtime import format_report, parse_importtime
+from local_runtime.core.loader import LazyModule, load_models, read_static_spec
+from local_runtime.core.registry import ModelRegistry
+
+
+def test_adapters_register_from_their_source_without_being_imported() -> None:
+    models = load_models()
+    registry = ModelRegistry(models, "linux-x64", logging.getLogger("test-lazy-models"))
+
+    assert models
+    assert all(isinstance(model.module, LazyModule) and not model.module.loaded for model in models)
+    assert all(model.has_hook("load") and model.has_hook("run") for model in models)
+    assert registry.models_by_endpoint["audio.transcriptions"]
+
+
+def test_static_spec_matches_the_imported_module() -> None:
+    from local_runtime.models import model_stt_faster_whisper
+
+    raw_spec, names = read_static_spec("local_runtime.models.model_stt_faster_whisper")
+
+    assert raw_spec == model_stt_faster_whisper.SPEC
+    assert {"load", "run", "SPEC", "SAMPLING_RATE"} <= names
+    assert "startup" not in names
+
+
+def test_lazy_module_imports_and_patches_the_real_module_on_first_use(monkeypatch) -> None:
+    from local_runtime.models import model_template
+
+    module = LazyModule("local_runtime.models.model_template")
+    sentinel = object()
+    monkeypatch.setattr(module, "SPEC", sentinel)
+
+    assert module.loaded
+    assert model_template.SPEC is sentinel
+
+
+def test_importtime_report_orders_modules_by_cumulative_time() -> None:
+    output = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     json.decoder
+import time:       300 |        420 |   json
+import time:      1500 |       1920 | local_runtime.main
+Traceback noise that is not a timing line
+"""
+    timings = parse_importtime(output)
+
+    assert [(timing.module, timing.depth) for timing in timings] == [
+        ("json.decoder", 2),
+        ("json", 1),
+        ("local_runtime.main", 0),
+    ]
+    report = format_report(timings, rows=2).splitlines()
+    assert report[0] == "total import time: 1.9 ms across 3 modules"
+    assert report[3].endswith("local_runtime.main")
+    assert report[4].endswith("json")
+    assert len(report) == 5
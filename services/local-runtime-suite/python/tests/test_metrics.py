@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from local_runtime.core.metrics import METRICS, MetricFamily, MetricsRegistry, observe_transcription
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    metrics = MetricsRegistry(namespace="test")
+    metrics.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        metrics.observe("latency_seconds", value, model="m")
+
+    text = metrics.render()
+
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert 'test_latency_seconds_bucket{model="m",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{model="m",le="1"} 3' in text
+    assert 'test_latency_seconds_bucket{model="m",le="+Inf"} 4' in text
+    assert 'test_latency_seconds_sum{model="m"} 4.05' in text
+    assert 'test_latency_seconds_count{model="m"} 4' in text
+
+
+def test_counters_collectors_and_label_escaping() -> None:
+    metrics = MetricsRegistry(namespace="test")
+    metrics.counter("failures_total", "Failures.")
+    metrics.inc("failures_total", model='a"b\\c')
+    metrics.inc("failures_total", model='a"b\\c')
+    metrics.inc("unknown_total")
+    metrics.set_collector(
+        "runtime", lambda: [MetricFamily("depth", "gauge", "Depth.", [({"model": "m"}, 2)])]
+    )
+
+    text = metrics.render()
+
+    assert 'test_failures_total{model="a\\"b\\\\c"} 2' in text
+    assert "unknown_total" not in text
+    assert "# TYPE test_depth gauge" in text
+    assert 'test_depth{model="m"} 2' in text
+
+
+def test_observe_transcription_uses_segment_end_as_audio_duration() -> None:
+    METRICS.reset()
+    observe_transcription("stt", [{"start": 0.0, "end": 4.0}, {"start": 4.0, "end": 10.0}], 2.5)
+    observe_transcription("stt", [], 1.0)
+
+    text = METRICS.render()
+
+    assert 'local_runtime_stt_real_time_factor_sum{model="stt"} 0.25' in text
+    assert 'local_runtime_stt_real_time_factor_count{model="stt"} 1' in text
+
+
+def test_metrics_endpoint_reports_requests_and_runtime_state(client) -> None:
+    METRICS.reset()
+    response = client.post("/v1/responses", json={"input": "Metrics test"})
+    assert response.status_code == 200
+
+    scrape = client.get("/metrics")
+
+    assert scrape.status_code == 200
+    assert scrape.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'local_runtime_request_duration_seconds_count{endpoint="responses",model=' in scrape.text
+    assert "local_runtime_queue_wait_seconds_count" in scrape.text
+    assert "local_runtime_active_requests 0" in scrape.text
+    assert "# TYPE local_runtime_resident_models gauge" in scrape.text
@@ -139,9 +139,11 @@ def test_qwen_hf_load_applies_an_immutable_test_revision(monkeypatch, tmp_path)
     )
 
     instance = model_llm_qwen3_hf.load(context)
+    instance["batch_engine"].shutdown()
 
     assert instance["model_ref"] == "tiny-random/qwen3"
     assert instance["revision"] == "immutable-revision"
+    assert instance["batch_engine"].max_batch_size == model_llm_qwen3_hf.DEFAULT_MAX_BATCH_SIZE
     assert calls == [
         (
             "tokenizer",
@@ -165,6 +167,17 @@ def test_qwen_hf_load_applies_an_immutable_test_revision(monkeypatch, tmp_path)
     ]
 
 
+def test_qwen_hf_batches_concurrent_requests_by_default_except_on_mps(monkeypatch) -> None:
+    assert model_llm_qwen3_hf._max_batch_size("cpu") == model_llm_qwen3_hf.DEFAULT_MAX_BATCH_SIZE
+    assert model_llm_qwen3_hf._max_batch_size("cuda:1") == model_llm_qwen3_hf.DEFAULT_MAX_BATCH_SIZE
+    assert model_llm_qwen3_hf._max_batch_size("mps") == 1
+
+    monkeypatch.setattr(model_llm_qwen3_hf, "MAX_BATCH_SIZE_OVERRIDE", 1)
+    assert model_llm_qwen3_hf._max_batch_size("cuda") == 1
+    monkeypatch.setattr(model_llm_qwen3_hf, "MAX_BATCH_SIZE_OVERRIDE", 8)
+    assert model_llm_qwen3_hf._max_batch_size("mps") == 8
+
+
 def test_qwen_mlx_load_applies_the_pinned_revision(monkeypatch, tmp_path) -> None:
     calls = []
     snapshot_calls = []
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from copy import deepcopy
+from types import SimpleNamespace
+
+import pytest
+
+from local_runtime.core.loader import LoadedModel
+from local_runtime.core.registry import ModelRegistry
+from local_runtime.core.residency import GIB
+from local_runtime.models import model_template
+from local_runtime.spec import ModelSpec
+
+# model_template.SPEC requires 4 GB, so this budget fits two resident models.
+TWO_MODEL_BUDGET = 9 * GIB
+
+
+def _registry(
+    names: list[str], shutdowns: list[str], *, idle_ttl_sec: int | None = None, loads: list[str] | None = None
+) -> ModelRegistry:
+    models = []
+    for name in names:
+        spec_data = deepcopy(model_template.SPEC)
+        spec_data["id"] = f"local//test/{name}"
+        spec_data["execution"]["idle_ttl_sec"] = idle_ttl_sec
+        spec = ModelSpec.model_validate(spec_data)
+
+        async def load(ctx, model_id=spec.id):
+            if loads is not None:
+                loads.append(model_id)
+            await asyncio.sleep(0)
+            return {"model_id": model_id}
+
+        async def shutdown(instance, ctx):
+            shutdowns.append(instance["model_id"])
+
+        module = SimpleNamespace(load=load, shutdown=shutdown)
+        models.append(LoadedModel(name=f"local_runtime.models.{name}", module=module, spec=spec))
+    return ModelRegistry(
+        models,
+        "test-platform",
+        logging.getLogger("test-model-residency"),
+        memory_budget_bytes=TWO_MODEL_BUDGET,
+    )
+
+
+@pytest.mark.asyncio
+async def test_loading_past_the_budget_evicts_the_least_recently_used_model() -> None:
+    shutdowns: list[str] = []
+    registry = _registry(["first", "second", "third"], shutdowns)
+
+    await registry.ensure_instance("local//test/first", None)
+    await registry.ensure_instance("local//test/second", None)
+    await registry.ensure_instance("local//test/first", None)
+    await registry.ensure_instance("local//test/third", None)
+
+    assert shutdowns == ["local//test/second"]
+    assert sorted(registry.model_instances) == ["local//test/first", "local//test/third"]
+    status = registry.residency_status()
+    assert status["used_bytes"] == 8 * GIB
+    assert status["unloads"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pinned_models_stay_resident_until_their_requests_finish() -> None:
+    shutdowns: list[str] = []
+    registry = _registry(["first", "second", "third", "fourth"], shutdowns)
+    registry.pin("local//test/first", "req-1")
+    registry.pin("local//test/second", "req-2")
+    await registry.ensure_instance("local//test/first", None)
+    await registry.ensure_instance("local//test/second", None)
+
+    await registry.ensure_instance("local//test/third", None)
+
+    assert shutdowns == []
+    assert registry.residency_status()["used_bytes"] == 12 * GIB
+
+    registry.unpin("req-2")
+    await registry.ensure_instance("local//test/fourth", None)
+
+    assert shutdowns == ["local//test/third", "local//test/second"]
+    assert sorted(registry.model_instances) == ["local//test/first", "local//test/fourth"]
+    assert registry.residency_status()["models"]["local//test/first"]["pins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unload_refuses_pinned_models() -> None:
+    shutdowns: list[str] = []
+    registry = _registry(["first"], shutdowns)
+    registry.pin("local//test/first", "req-1")
+    await registry.ensure_instance("local//test/first", None)
+
+    assert not await registry.unload("local//test/first", None, reason="test")
+    registry.unpin("req-1")
+    assert await registry.unload("local//test/first", None, reason="test")
+    assert shutdowns == ["local//test/first"]
+    assert registry.model_instances == {}
+
+
+@pytest.mark.asyncio
+async def test_idle_models_unload_and_reload_once_on_next_use() -> None:
+    shutdowns: list[str] = []
+    loads: list[str] = []
+    registry = _registry(["idle", "busy"], shutdowns, idle_ttl_sec=600, loads=loads)
+    await registry.ensure_instance("local//test/idle", None)
+    registry.pin("local//test/busy", "req-1")
+    await registry.ensure_instance("local//test/busy", None)
+    for resident in registry.residency.resident.values():
+        resident.last_used -= 601
+
+    assert await registry.unload_idle(lambda label: None) == ["local//test/idle"]
+    assert shutdowns == ["local//test/idle"]
+    assert "local//test/busy" in registry.model_instances
+
+    instances = await asyncio.gather(*(registry.ensure_instance("local//test/idle", None) for _ in range(5)))
+
+    assert all(instance is instances[0] for instance in instances)
+    assert loads == ["local//test/idle", "local//test/busy", "local//test/idle"]
+    assert await registry.unload_idle(lambda label: None) == []
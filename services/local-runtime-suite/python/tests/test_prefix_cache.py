@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from local_runtime.helpers.prefix_cache import PrefixKVCache
+
+SYSTEM_PROMPT = list(range(100, 112))
+
+
+def test_boundary_always_leaves_a_token_to_prefill() -> None:
+    cache = PrefixKVCache(max_bytes=1024, block_size=4)
+
+    assert [cache.boundary(length) for length in (0, 1, 4, 5, 8, 9)] == [0, 0, 0, 4, 4, 8]
+
+
+def test_requests_sharing_only_the_system_prompt_reuse_its_blocks() -> None:
+    cache = PrefixKVCache(max_bytes=1024, block_size=4)
+    first = SYSTEM_PROMPT + [1, 2, 3, 4, 5]
+    second = SYSTEM_PROMPT + [9, 9, 9, 9, 9]
+
+    assert cache.lookup(first) is None
+    assert cache.store(first[:16], "first-state", nbytes=16)
+    hit = cache.lookup(second)
+
+    assert hit is not None
+    assert (hit.length, hit.state, hit.state_length) == (12, "first-state", 16)
+    assert cache.lookup([1, 2, 3, 4, 5]) is None
+    assert cache.snapshot()["hits"] == 1
+    assert cache.snapshot()["misses"] == 2
+    assert cache.snapshot()["reused_tokens"] == 12
+
+
+def test_lookup_prefers_the_longest_matching_prefix() -> None:
+    cache = PrefixKVCache(max_bytes=1024, block_size=4)
+    cache.store(SYSTEM_PROMPT[:4], "short", nbytes=4)
+    cache.store(SYSTEM_PROMPT, "long", nbytes=12)
+
+    hit = cache.lookup(SYSTEM_PROMPT + [7])
+
+    assert hit is not None
+    assert (hit.length, hit.state) == (12, "long")
+
+
+def test_least_recently_used_entries_are_evicted_under_the_memory_cap() -> None:
+    cache = PrefixKVCache(max_bytes=20, block_size=4)
+    cache.store([1, 1, 1, 1], "a", nbytes=8)
+    cache.store([2, 2, 2, 2], "b", nbytes=8)
+    assert cache.lookup([1, 1, 1, 1, 0]) is not None
+    cache.store([3, 3, 3, 3], "c", nbytes=8)
+
+    assert cache.lookup([2, 2, 2, 2, 0]) is None
+    assert cache.lookup([1, 1, 1, 1, 0]) is not None
+    assert cache.lookup([3, 3, 3, 3, 0]) is not None
+    assert cache.snapshot()["evictions"] == 1
+    assert cache.snapshot()["bytes"] == 16
+
+
+def test_overlapping_entries_stay_reachable_after_one_is_evicted() -> None:
+    cache = PrefixKVCache(max_bytes=24, block_size=4)
+    cache.store(SYSTEM_PROMPT[:8], "short", nbytes=8)
+    cache.store(SYSTEM_PROMPT, "long", nbytes=12)
+    cache.store([5, 5, 5, 5], "other", nbytes=8)
+
+    hit = cache.lookup(SYSTEM_PROMPT[:8] + [0])
+
+    assert cache.snapshot()["entries"] == 2
+    assert hit is not None
+    assert (hit.length, hit.state, hit.state_length) == (8, "long", 12)
+
+
+def test_unaligned_or_oversized_states_are_not_stored() -> None:
+    cache = PrefixKVCache(max_bytes=8, block_size=4)
+
+    assert not cache.store([1, 2, 3], "unaligned", nbytes=1)
+    assert not cache.store([1, 2, 3, 4], "oversized", nbytes=9)
+    assert cache.snapshot()["entries"] == 0
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import time
+
+from local_runtime.core.timing import GenerationClock, RequestTimings
+
+
+def test_phases_accumulate_and_render_in_request_order() -> None:
+    timings = RequestTimings()
+    timings.record("serialization", 0.002)
+    timings.record("custom", 0.001)
+    timings.record("prefill", 0.25)
+    timings.record("prefill", 0.05)
+    timings.record("body_read", -1.0)
+
+    payload = timings.as_payload()
+
+    assert list(payload) == ["body_read", "prefill", "serialization", "custom", "total"]
+    assert payload["prefill"] == 300.0
+    assert payload["body_read"] == 0.0
+    header = timings.server_timing()
+    assert header.startswith(
+        "body_read;dur=0.00, prefill;dur=300.00, serialization;dur=2.00, custom;dur=1.00"
+    )
+    assert header.split(", ")[-1].startswith("total;dur=")
+
+
+def test_generation_clock_splits_prefill_and_decode() -> None:
+    timings = RequestTimings()
+    clock = GenerationClock(timings)
+    clock.start()
+    time.sleep(0.01)
+    clock.token()
+    time.sleep(0.01)
+    clock.token()
+    clock.finish()
+    clock.finish()
+
+    assert timings.phases["prefill"] >= 0.01
+    assert timings.phases["decode"] >= 0.01
+    assert timings.phases["prefill"] + timings.phases["decode"] < 1.0
+
+
+def test_generation_clock_without_tokens_is_all_prefill() -> None:
+    timings = RequestTimings()
+    clock = GenerationClock(timings)
+    clock.start()
+    clock.finish()
+    GenerationClock(None).finish()
+
+    assert timings.phases["decode"] == 0.0
+    assert "prefill" in timings.phases
+
+
+def test_responses_report_server_timing_and_optional_timings_field(client) -> None:
+    plain = client.post("/v1/responses", json={"input": "Timing test"})
+    assert plain.status_code == 200
+    assert "timings" not in plain.json()
+    phases = [entry.split(";")[0] for entry in plain.headers["server-timing"].split(", ")]
+    assert phases[:2] == ["body_read", "model_selection"]
+    assert "serialization" in phases
+    assert phases[-1] == "total"
+
+    detailed = client.post("/v1/responses?timings=true", json={"input": "Timing test"})
+    body = detailed.json()
+    assert {"body_read", "model_selection", "total"} <= set(body["timings"])
+
+
+def test_streamed_transcription_attaches_timings_to_the_final_event(client) -> None:
+    files = {"file": ("clip.wav", b"\x00" * 200, "audio/wav")}
+    response = client.post("/v1/audio/transcriptions?timings=1", data={"stream": "true"}, files=files)
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("multipart_parse;dur=")
+    events = [
+        json.loads(line.removeprefix("data: "))
+        for line in response.text.splitlines()
+        if line.startswith("data: {")
+    ]
+    assert "timings" in events[-1]
+    assert "multipart_parse" in events[-1]["timings"]
+    assert all("timings" not in event for event in events[:-1])
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import array
+import asyncio
+import io
+import logging
+import os
+from multiprocessing import shared_memory
+
+import pytest
+import worker_fixture_model
+
+from local_runtime.cancellation import CancellationToken, InferenceCancelledError
+from local_runtime.core.loader import LazyModule, LoadedModel
+from local_runtime.core.registry import ModelRegistry
+from local_runtime.helpers.multipart_helpers import BufferReader
+from local_runtime.runtime_types import RunContext, RunRequest
+from local_runtime.spec import validate_spec
+from local_runtime.workers.pool import WorkerExitedError, WorkerSettings, isolate_models
+from local_runtime.workers.shared_buffers import (
+    SHARED_BUFFER_MIN_BYTES,
+    AttachedBuffer,
+    SharedBuffer,
+    SharedSegment,
+    attach_files,
+    share_files,
+)
+
+MODEL_ID = worker_fixture_model.SPEC["id"]
+
+
+def _exists(name: str) -> bool:
+    try:
+        shared_memory.SharedMemory(name).close()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def test_share_and_attach_round_trip_uploads_and_pcm() -> None:
+    upload = bytearray(os.urandom(SHARED_BUFFER_MIN_BYTES + 3))
+    pcm = array.array("f", [0.25] * SHARED_BUFFER_MIN_BYTES)
+    files = {"file": {"filename": "a.wav", "data": upload, "pcm": pcm}, "small": {"data": b"tiny"}}
+
+    shared, segments = share_files(files)
+    assert len(segments) == 2
+    assert isinstance(shared["file"]["data"], SharedBuffer)
+    assert shared["small"]["data"] == b"tiny"
+    assert files["file"]["data"] is upload
+
+    resolved, attached = attach_files(shared)
+    data = resolved["file"]["data"]
+    samples = resolved["file"]["pcm"]
+    assert isinstance(data, memoryview) and data == upload
+    assert samples.format == "f" and samples.shape == (len(pcm),) and samples[-1] == 0.25
+    assert resolved["file"]["filename"] == "a.wav"
+    del data, samples, resolved
+    for buffer in attached:
+        buffer.close()
+        assert buffer.data is None
+    for segment in segments:
+        segment.release()
+
+
+def test_segment_is_unlinked_when_the_last_reference_is_released() -> None:
+    segment = SharedSegment(b"x" * 16)
+    name = segment.descriptor.name
+    segment.acquire()
+    segment.release()
+    assert _exists(name) and not segment.closed
+
+    segment.release()
+    assert segment.closed and not _exists(name)
+    segment.release()
+    with pytest.raises(RuntimeError):
+        segment.acquire()
+
+
+def test_attached_buffer_survives_views_held_past_close() -> None:
+    segment = SharedSegment(b"abcdef")
+    buffer = AttachedBuffer(segment.descriptor)
+    view = buffer.data
+    buffer.close()
+    assert bytes(view) == b"abcdef"
+    del view
+    segment.release()
+
+
+def test_buffer_reader_reads_and_seeks_without_copying() -> None:
+    data = memoryview(bytearray(b"0123456789"))
+    reader = BufferReader(data)
+    assert reader.read(4) == b"0123"
+    assert reader.seek(-2, io.SEEK_END) == 8
+    assert reader.read() == b"89"
+    reader.seek(2)
+    assert io.BufferedReader(reader).read(3) == b"234"
+    with pytest.raises(ValueError):
+        reader.seek(-1)
+
+
+def _registry(tmp_path) -> ModelRegistry:
+    fixture = LoadedModel(
+        name="worker_fixture_model",
+        module=LazyModule("worker_fixture_model"),
+        spec=validate_spec(worker_fixture_model.SPEC),
+        hook_names=frozenset({"SPEC", "load", "warmup", "run"}),
+    )
+    settings = WorkerSettings(data_dir=str(tmp_path), cache_dir=str(tmp_path), platform="linux-x64")
+    return ModelRegistry(isolate_models([fixture], settings), "linux-x64", logging.getLogger("test"))
+
+
+def _ctx(registry: ModelRegistry, token: CancellationToken | None = None) -> RunContext:
+    return RunContext(
+        request_id="req_shared",
+        logger=logging.getLogger("test"),
+        data_dir="",
+        cache_dir="",
+        platform="linux-x64",
+        registry=registry,
+        http_client=None,
+        cancellation_token=token,
+    )
+
+
+def _upload_request(action: str, data: bytes) -> RunRequest:
+    return RunRequest(
+        endpoint="responses",
+        json={"action": action},
+        files={"file": {"filename": "a.wav", "content_type": "audio/wav", "data": bytearray(data)}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_worker_reads_large_uploads_from_shared_memory_and_segments_are_released(
+    tmp_path, monkeypatch
+) -> None:
+    created: list[SharedSegment] = []
+    original = SharedSegment.__init__
+
+    def tracking_init(self, data) -> None:
+        original(self, data)
+        created.append(self)
+
+    monkeypatch.setattr(SharedSegment, "__init__", tracking_init)
+    registry = _registry(tmp_path)
+    adapter = registry.get_loaded(MODEL_ID).module
+    data = os.urandom(2 * SHARED_BUFFER_MIN_BYTES)
+    try:
+        result = await adapter.run(_upload_request("describe_file", data), _ctx(registry))
+        assert result == {"type": "memoryview", "size": len(data), "head": data[:4], "tail": data[-4:]}
+        small = await adapter.run(_upload_request("describe_file", b"tiny"), _ctx(registry))
+        assert small["type"] == "bytearray"
+
+        token = CancellationToken("req_shared")
+        waiting = asyncio.create_task(
+            adapter.run(_upload_request("wait_for_cancel", data), _ctx(registry, token))
+        )
+        await asyncio.sleep(0.2)
+        assert not created[-1].closed
+        token.cancel()
+        with pytest.raises(InferenceCancelledError):
+            await asyncio.wait_for(waiting, 5)
+        assert created[-1].closed
+
+        with pytest.raises(WorkerExitedError):
+            await adapter.run(_upload_request("exit", data), _ctx(registry))
+        assert len(created) == 3
+        assert all(segment.closed for segment in created)
+        assert not any(_exists(segment.descriptor.name) for segment in created)
+    finally:
+        await registry.shutdown(lambda request_id: _ctx(registry))
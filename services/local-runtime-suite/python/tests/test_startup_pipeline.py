@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from copy import deepcopy
+from types import SimpleNamespace
+
+import pytest
+
+from local_runtime.core.loader import LoadedModel
+from local_runtime.core.readiness import ReadinessTracker
+from local_runtime.core.registry import ModelRegistry
+from local_runtime.core.residency import GIB, LoadGate
+from local_runtime.core.startup import StartupStep, run_startup_graph
+from local_runtime.models import model_template
+from local_runtime.spec import ModelSpec
+
+
+@pytest.mark.asyncio
+async def test_steps_start_as_soon_as_their_own_dependencies_finish() -> None:
+    readiness = ReadinessTracker()
+    order: list[str] = []
+    slow_released = asyncio.Event()
+
+    async def record(name: str, wait: asyncio.Event | None = None) -> str:
+        order.append(f"{name}:start")
+        if wait is not None:
+            await wait.wait()
+        order.append(f"{name}:end")
+        return name
+
+    async def fail() -> None:
+        raise RuntimeError("weights missing")
+
+    async def release_slow() -> None:
+        order.append("selftest:fast")
+        slow_released.set()
+
+    outcomes = await run_startup_graph(
+        [
+            StartupStep("preload:slow", lambda: record("preload:slow", slow_released)),
+            StartupStep("preload:fast", lambda: record("preload:fast")),
+            StartupStep("preload:broken", fail),
+            StartupStep("selftest:fast", release_slow, after=("preload:fast", "startup:unknown")),
+            StartupStep("selftest:slow", lambda: record("selftest:slow"), after=("preload:slow",)),
+        ],
+        readiness,
+    )
+
+    assert order.index("selftest:fast") < order.index("preload:slow:end")
+    assert order.index("preload:slow:end") < order.index("selftest:slow:start")
+    assert outcomes["preload:fast"].result == "preload:fast"
+    assert str(outcomes["preload:broken"].error) == "weights missing"
+    timeline = {phase["name"]: phase for phase in readiness.as_payload()["startup_timeline"]}
+    assert timeline["preload:broken"]["status"] == "error"
+    assert timeline["preload:slow"]["start_ms"] < timeline["preload:fast"]["end_ms"]
+    assert all(len(phase["bar"]) == 40 and "#" in phase["bar"] for phase in timeline.values())
+
+
+@pytest.mark.asyncio
+async def test_load_gate_bounds_concurrent_loads_by_memory() -> None:
+    gate = LoadGate(capacity_bytes=9 * GIB)
+    running: list[int] = []
+    peak = 0
+
+    async def load() -> None:
+        nonlocal peak
+        async with gate.hold(4 * GIB):
+            running.append(1)
+            peak = max(peak, len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+
+    async def oversized() -> None:
+        async with gate.hold(32 * GIB):
+            await asyncio.sleep(0)
+
+    await asyncio.gather(load(), load(), load(), load())
+    await asyncio.wait_for(oversized(), timeout=1)
+
+    assert peak == 2
+    assert gate.active == 0 and gate.reserved_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_preload_loads_independent_models_concurrently() -> None:
+    active: list[str] = []
+    overlapped: list[bool] = []
+
+    def loaded_model(name: str) -> LoadedModel:
+        spec_data = deepcopy(model_template.SPEC)
+        spec_data["id"] = f"local//test/{name}"
+
+        async def load(ctx):
+            active.append(name)
+            await asyncio.sleep(0.02)
+            overlapped.append(len(active) > 1)
+            active.remove(name)
+            return {"model": name}
+
+        return LoadedModel(
+            name=f"local_runtime.models.{name}",
+            module=SimpleNamespace(load=load),
+            spec=ModelSpec.model_validate(spec_data),
+        )
+
+    registry = ModelRegistry(
+        [loaded_model("first"), loaded_model("second")],
+        "test-platform",
+        logging.getLogger("test-startup-pipeline"),
+        memory_budget_bytes=9 * GIB,
+    )
+
+    loaded = await registry.preload(["local//test/first", "local//test/second"], lambda label: None)
+
+    assert loaded == ["local//test/first", "local//test/second"]
+    assert any(overlapped)
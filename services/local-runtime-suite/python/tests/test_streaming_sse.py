@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+import asyncio
+
+import pytest
+
+from local_runtime.core.sse import SSEEncoder, encode_event_stream, format_sse_event
+
 
 def _collect_events(stream_response) -> list[str]:
     events: list[str] = []
@@ -27,3 +33,69 @@ def test_transcription_streaming_events(client):
         events = _collect_events(response)
     assert "transcript.text.delta" in events
     assert "transcript.text.done" in events
+
+
+def test_sse_encoder_matches_generic_framing_for_every_event():
+    encoder = SSEEncoder()
+    events = [
+        ("response.created", {"id": "resp_1", "status": "in_progress"}),
+        ("response.output_text.delta", {"id": "resp_1", "delta": 'Say "hi"\n— ok'}),
+        ("response.output_text.delta", {"id": "resp_1", "delta": "ünïcode"}),
+        ("response.output_text.delta", {"id": "resp_2", "delta": "new id"}),
+        ("response.output_text.delta", {"id": "resp_2", "delta": "x", "extra": 1}),
+        ("transcript.text.delta", {"text": "segment"}),
+    ]
+
+    for event, data in events:
+        assert encoder.encode(event, data) == format_sse_event(event, data).encode()
+
+
+async def _paced(items: list[tuple[float, dict]], closed: list[bool] | None = None):
+    try:
+        for delay, item in items:
+            await asyncio.sleep(delay)
+            yield item
+    finally:
+        if closed is not None:
+            closed.append(True)
+
+
+def _delta(text: str) -> dict:
+    return {"event": "response.output_text.delta", "data": {"id": "resp_1", "delta": text}}
+
+
+@pytest.mark.asyncio
+async def test_coalescing_batches_deltas_and_flushes_on_lifecycle_events():
+    items = [
+        (0, {"event": "response.created", "data": {"id": "resp_1"}}),
+        (0, _delta("a")),
+        (0, _delta("b")),
+        (0.2, _delta("c")),
+        (0, {"event": "response.completed", "data": {"id": "resp_1"}}),
+    ]
+
+    chunks = [chunk async for chunk in encode_event_stream(_paced(items), coalesce_seconds=0.05)]
+
+    assert [chunk.count(b"event: ") for chunk in chunks] == [1, 2, 2]
+    assert b"".join(chunks) == b"".join(
+        format_sse_event(item["event"], item["data"]).encode() for _delay, item in items
+    )
+
+
+@pytest.mark.asyncio
+async def test_coalescing_stream_propagates_errors_and_closes_the_source():
+    async def _failing():
+        yield _delta("a")
+        raise RuntimeError("model failed")
+
+    chunks = []
+    with pytest.raises(RuntimeError, match="model failed"):
+        async for chunk in encode_event_stream(_failing(), coalesce_seconds=0.05):
+            chunks.append(chunk)
+    assert chunks == [format_sse_event("response.output_text.delta", _delta("a")["data"]).encode()]
+
+    closed: list[bool] = []
+    stream = encode_event_stream(_paced([(0, _delta("a")), (10, _delta("b"))], closed), coalesce_seconds=0.01)
+    assert b"event: " in await anext(stream)
+    await stream.aclose()
+    assert closed == [True]
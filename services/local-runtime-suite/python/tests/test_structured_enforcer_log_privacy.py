@@ -41,7 +41,7 @@ async def test_schema_failure_logs_only_a_bounded_category(capsys) -> None:
         http_client=None,
     )
     selected = SimpleNamespace(
-        spec=SimpleNamespace(id="local//fixture/privacy"),
+        spec=SimpleNamespace(id="local//fixture/privacy", api=SimpleNamespace(supports_continuation=False)),
         module=InvalidStructuredModule,
     )
     schema = {
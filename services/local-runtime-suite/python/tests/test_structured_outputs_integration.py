@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from types import SimpleNamespace
 
 import pytest
@@ -9,18 +10,27 @@ class StructuredStubModule:
     def __init__(self, outputs: list[dict]):
         self.outputs = outputs
         self.calls = 0
+        self.response_schemas: list[dict | None] = []
+        self.constrained: list[bool] = []
+        self.prefixes: list[str | None] = []
 
     async def run(self, req, ctx):
         self.calls += 1
+        self.response_schemas.append(req.response_schema)
+        self.constrained.append(req.constrained_decoding)
+        self.prefixes.append(req.assistant_prefix)
         index = min(self.calls - 1, len(self.outputs) - 1)
         return self.outputs[index]
 
 
 @pytest.fixture
 def install_structured_stub(monkeypatch):
-    def _install(outputs: list[dict]):
+    def _install(outputs: list[dict], *, supports_continuation: bool = False):
         module = StructuredStubModule(outputs)
-        loaded = SimpleNamespace(spec=SimpleNamespace(id="local//test/structured"), module=module)
+        spec = SimpleNamespace(
+            id="local//test/structured", api=SimpleNamespace(supports_continuation=supports_continuation)
+        )
+        loaded = SimpleNamespace(spec=spec, module=module)
         monkeypatch.setattr(
             "local_runtime.main._select_model", lambda endpoint, requested, _loaded=loaded: _loaded
         )
@@ -73,3 +83,72 @@ def test_structured_streaming_emits_only_valid_json(client, install_structured_s
     assert "```" not in body
     data_lines = [line.removeprefix("data: ") for line in body.splitlines() if line.startswith("data: ")]
     assert any('\\"a\\":1' in line for line in data_lines)
+
+
+def test_structured_requests_pass_the_effective_schema_for_constrained_decoding(
+    client, install_structured_stub
+):
+    stub = install_structured_stub([{"output_text": '{"a":1}'}])
+    response = client.post("/v1/responses", json=_structured_payload())
+    assert response.status_code == 200
+    assert stub.response_schemas == [
+        {
+            "type": "object",
+            "properties": {"a": {"type": "number"}},
+            "required": ["a"],
+            "additionalProperties": False,
+        }
+    ]
+    assert stub.constrained == [True]
+
+
+def _scores_payload():
+    payload = _structured_payload()
+    payload["text"]["format"]["schema"] = {
+        "type": "object",
+        "properties": {
+            "criterion_scores": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"criterion_id": {"type": "string"}, "score": {"type": "integer"}},
+                },
+            }
+        },
+    }
+    return payload
+
+
+def test_late_errors_are_repaired_by_continuing_after_the_valid_prefix(client, install_structured_stub):
+    valid_prefix = (
+        '{"criterion_scores": [{"criterion_id": "c1", "score": 4}, {"criterion_id": "c2", "score": '
+    )
+    stub = install_structured_stub(
+        [
+            {"output_text": valid_prefix + '"high"}]}'},
+            {"output_text": "3}]}"},
+        ],
+        supports_continuation=True,
+    )
+    response = client.post("/v1/responses", json=_scores_payload())
+    assert response.status_code == 200
+    parsed = json.loads(response.json()["output"][0]["content"][0]["text"])
+    assert parsed["criterion_scores"][1] == {"criterion_id": "c2", "score": 3}
+    assert stub.prefixes == [None, valid_prefix]
+
+
+def test_failed_continuations_fall_back_to_full_regeneration(client, install_structured_stub):
+    stub = install_structured_stub(
+        [
+            {"output_text": '{"criterion_scores": [{"criterion_id": "c1", "score": "high"'},
+            {"output_text": '"high"}]}'},
+            {"output_text": '{"criterion_scores": []}'},
+        ],
+        supports_continuation=True,
+    )
+    response = client.post("/v1/responses", json=_scores_payload())
+    assert response.status_code == 200
+    assert json.loads(response.json()["output"][0]["content"][0]["text"]) == {"criterion_scores": []}
+    assert stub.prefixes[0] is None
+    assert stub.prefixes[1] == '{"criterion_scores": [{"criterion_id": "c1", "score": '
+    assert stub.prefixes[2] is None
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+
+import pytest
+import worker_fixture_model
+
+from local_runtime.cancellation import CancellationToken, InferenceCancelledError, InferenceTimeoutError
+from local_runtime.core.loader import LazyModule, LoadedModel
+from local_runtime.core.registry import ModelRegistry
+from local_runtime.runtime_types import RunContext, RunRequest
+from local_runtime.spec import validate_spec
+from local_runtime.workers import pool as worker_pool
+from local_runtime.workers.pool import (
+    SubprocessAdapter,
+    WorkerExitedError,
+    WorkerPool,
+    WorkerSettings,
+    execution_mode,
+    isolate_models,
+    pool_size,
+)
+
+MODEL_ID = worker_fixture_model.SPEC["id"]
+
+
+def _fixture_model() -> LoadedModel:
+    return LoadedModel(
+        name="worker_fixture_model",
+        module=LazyModule("worker_fixture_model"),
+        spec=validate_spec(worker_fixture_model.SPEC),
+        hook_names=frozenset({"SPEC", "load", "warmup", "run"}),
+    )
+
+
+def _registry(tmp_path) -> ModelRegistry:
+    settings = WorkerSettings(data_dir=str(tmp_path), cache_dir=str(tmp_path), platform="linux-x64")
+    return ModelRegistry(isolate_models([_fixture_model()], settings), "linux-x64", logging.getLogger("test"))
+
+
+def _ctx(registry: ModelRegistry, token: CancellationToken | None = None) -> RunContext:
+    return RunContext(
+        request_id="req_worker",
+        logger=logging.getLogger("test"),
+        data_dir="",
+        cache_dir="",
+        platform="linux-x64",
+        registry=registry,
+        http_client=None,
+        cancellation_token=token,
+    )
+
+
+def _request(**payload) -> RunRequest:
+    return RunRequest(endpoint="responses", json=payload or None)
+
+
+def test_execution_mode_honours_spec_and_override(monkeypatch) -> None:
+    spec = validate_spec(worker_fixture_model.SPEC)
+    inprocess = spec.model_copy(update={"execution": spec.execution.model_copy(update={"mode": "inprocess"})})
+
+    assert execution_mode(spec) == "subprocess"
+    assert execution_mode(inprocess) == "inprocess"
+    monkeypatch.setattr(worker_pool, "EXECUTION_MODE_OVERRIDE", "subprocess")
+    assert execution_mode(inprocess) == "subprocess"
+    monkeypatch.setattr(worker_pool, "EXECUTION_MODE_OVERRIDE", "inprocess")
+    assert execution_mode(spec) == "inprocess"
+
+    monkeypatch.setattr(worker_pool, "CPU_WORKERS", 3)
+    accelerated = spec.model_copy(
+        update={
+            "backend": spec.backend.model_copy(update={"device_hint": "auto"}),
+            "compat": spec.compat.model_copy(update={"acceleration": ["metal", "cpu"]}),
+        }
+    )
+    assert pool_size(spec) == 3
+    assert pool_size(accelerated) == 1
+
+
+def test_isolate_models_only_wraps_subprocess_models(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(worker_pool, "EXECUTION_MODE_OVERRIDE", "")
+    fixture = _fixture_model()
+    spec = fixture.spec
+    inprocess = LoadedModel(
+        name="in",
+        module=object(),
+        spec=spec.model_copy(update={"execution": spec.execution.model_copy(update={"mode": "inprocess"})}),
+    )
+    settings = WorkerSettings(data_dir=str(tmp_path), cache_dir=str(tmp_path), platform="linux-x64")
+
+    isolated, untouched = isolate_models([fixture, inprocess], settings)
+
+    assert untouched is inprocess
+    assert isinstance(isolated.module, SubprocessAdapter)
+    assert isolated.hook_names == {"load", "warmup", "run", "shutdown"}
+    assert not fixture.module.loaded  # the gateway never imports the adapter itself
+
+
+@pytest.mark.asyncio
+async def test_subprocess_adapter_runs_streams_fails_and_cancels_in_a_worker(tmp_path, caplog) -> None:
+    registry = _registry(tmp_path)
+    adapter = registry.get_loaded(MODEL_ID).module
+    assert await registry.preload_model(MODEL_ID, lambda rid: _ctx(registry), raise_errors=True)
+    pool = registry.model_instances[MODEL_ID]
+    assert isinstance(pool, WorkerPool)
+    worker_pid = pool.workers[0].pid
+    await adapter.warmup(pool, _ctx(registry))
+
+    ctx = _ctx(registry, CancellationToken("req_worker"))
+    with caplog.at_level(logging.INFO):
+        result = await adapter.run(_request(text="hi"), ctx)
+        for _ in range(100):
+            if any(record.getMessage() == "fixture.run" for record in caplog.records):
+                break
+            await asyncio.sleep(0.01)
+    assert result == {"pid": worker_pid, "warm": True, "request": {"text": "hi"}}
+    assert worker_pid != os.getpid()
+    assert "decode" in ctx.timings.phases
+    forwarded = [record for record in caplog.records if record.getMessage() == "fixture.run"]
+    assert forwarded and forwarded[0].worker_pid == worker_pid
+    assert forwarded[0].request_id == "req_worker"
+
+    stream = await adapter.run(RunRequest(endpoint="responses", stream=True), _ctx(registry))
+    assert [event["data"]["delta"] async for event in stream] == ["0", "1", "2"]
+
+    with pytest.raises(ValueError, match="fixture failure"):
+        await adapter.run(_request(action="fail"), _ctx(registry))
+
+    token = CancellationToken("req_cancel")
+    pending = asyncio.create_task(adapter.run(_request(action="wait_for_cancel"), _ctx(registry, token)))
+    await asyncio.sleep(0.2)
+    token.cancel()
+    with pytest.raises(InferenceCancelledError):
+        await asyncio.wait_for(pending, 5)
+
+    deadline = CancellationToken("req_deadline", deadline=time.monotonic() + 0.2)
+    with pytest.raises(InferenceTimeoutError):
+        await asyncio.wait_for(adapter.run(_request(action="wait_for_cancel"), _ctx(registry, deadline)), 5)
+    assert pool.workers[0].in_flight == 0
+
+    assert await registry.unload(MODEL_ID, _ctx(registry), reason="test")
+    assert not pool.workers[0].alive
+    assert not pool.workers[0]._process.is_alive()
+
+
+@pytest.mark.asyncio
+async def test_calls_fail_when_the_worker_process_exits(tmp_path) -> None:
+    registry = _registry(tmp_path)
+    adapter = registry.get_loaded(MODEL_ID).module
+    pool = await registry.ensure_instance(MODEL_ID, _ctx(registry))
+
+    with pytest.raises(WorkerExitedError):
+        await asyncio.wait_for(adapter.run(_request(action="exit"), _ctx(registry)), 10)
+    with pytest.raises(WorkerExitedError):
+        await adapter.run(_request(), _ctx(registry))
+    await pool.close()
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+
+import pytest
+import worker_fixture_model
+
+from local_runtime.core import supervisor as supervisor_module
+from local_runtime.core.loader import LazyModule, LoadedModel
+from local_runtime.core.registry import ModelRegistry
+from local_runtime.core.supervisor import CommandWorker, Supervisor, process_usage, restart_delay
+from local_runtime.runtime_types import RunContext, RunRequest
+from local_runtime.spec import LaunchSpec, ReadySpec, validate_spec
+from local_runtime.workers.pool import WorkerExitedError, WorkerSettings, isolate_models
+
+LOG_BACKEND = (
+    "import os, time; print('port', os.environ['BACKEND_PORT']); print('READY', flush=True); time.sleep(30)"
+)
+
+
+class _FakeWorker:
+    kind = "fake"
+
+    def __init__(self, name: str = "fake") -> None:
+        self.name = name
+        self.pid: int | None = None
+        self.running = False
+        self.healthy = True
+        self.starts = 0
+        self.fail_starts = 0
+
+    async def start(self, ctx) -> None:
+        self.starts += 1
+        if self.fail_starts:
+            self.fail_starts -= 1
+            raise RuntimeError("backend failed to start")
+        self.pid = os.getpid()
+        self.running = True
+
+    async def probe(self) -> bool:
+        return self.healthy
+
+    async def stop(self) -> None:
+        self.running = False
+
+
+async def _settle(supervisor: Supervisor) -> None:
+    await asyncio.gather(*list(supervisor._tasks))
+
+
+@pytest.fixture
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(supervisor_module, "RESTART_BACKOFF_INITIAL_SECONDS", 0.0)
+
+
+def test_restart_delay_backs_off_exponentially_up_to_the_cap() -> None:
+    delays = [restart_delay(attempt) for attempt in range(10)]
+
+    assert delays[:4] == [0.5, 1.0, 2.0, 4.0]
+    assert max(delays) == supervisor_module.RESTART_BACKOFF_MAX_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_supervisor_restarts_exited_and_unresponsive_workers(fast_backoff) -> None:
+    supervisor = Supervisor()
+    worker = _FakeWorker()
+    status = await supervisor.start_worker(worker)
+    assert (status.state, status.running, status.pid) == ("running", True, os.getpid())
+    assert status.rss_bytes is None or status.rss_bytes > 0
+
+    worker.running = False
+    await supervisor.check()
+    assert status.state == "backoff" and status.last_error == "exited"
+    await supervisor.check()
+    await _settle(supervisor)
+    assert (status.state, status.restarts, worker.starts) == ("running", 1, 2)
+
+    worker.healthy = False
+    for _ in range(supervisor_module.PROBE_FAILURES_BEFORE_RESTART - 1):
+        await supervisor.check()
+        assert status.state == "running"
+    await supervisor.check()
+    assert status.state == "backoff" and status.last_error == "unresponsive"
+    assert not worker.running
+
+    await supervisor.close()
+    assert supervisor.status() == []
+
+
+@pytest.mark.asyncio
+async def test_failed_starts_are_retried_and_adopted_workers_are_left_to_their_owner(fast_backoff) -> None:
+    supervisor = Supervisor()
+    flaky = _FakeWorker("flaky")
+    flaky.fail_starts = 2
+    status = supervisor.launch(flaky)
+    await _settle(supervisor)
+    for _ in range(2):
+        assert status.state == "backoff" and status.last_error == "backend failed to start"
+        await supervisor.check()
+        await _settle(supervisor)
+    assert status.state == "running" and flaky.starts == 3
+
+    adopted = _FakeWorker("adopted")
+    await adopted.start(None)
+    assert supervisor.adopt(adopted).running
+    await supervisor.close()
+    assert not flaky.running
+    assert adopted.running
+
+
+def test_process_usage_reads_this_process() -> None:
+    rss, cpu_seconds = process_usage(os.getpid())
+    if sys.platform.startswith("linux"):
+        assert rss and rss > 0
+        assert cpu_seconds is not None and cpu_seconds > 0
+
+
+def _launch(kind: str, cmd: list[str], **ready) -> LaunchSpec:
+    return LaunchSpec(
+        enabled=True,
+        type="command",
+        explain="test backend",
+        env={"BACKEND_PORT": "{port}"},
+        cmd=cmd,
+        ready=ReadySpec(kind=kind, timeout_sec=10, **ready),
+    )
+
+
+@pytest.mark.asyncio
+async def test_command_worker_waits_for_log_readiness_and_fails_early_exits() -> None:
+    ready = CommandWorker(
+        "log-backend",
+        _launch(
+            "log",
+            [sys.executable, "-c", LOG_BACKEND],
+            log_regex="^READY$",
+        ),
+    )
+    await ready.start()
+    assert ready.running
+    assert list(ready.output) == [f"port {ready.port}", "READY"]
+    assert await ready.probe()
+    await ready.stop()
+    assert not ready.running
+
+    crashing = CommandWorker(
+        "crashing", _launch("log", [sys.executable, "-c", "raise SystemExit(3)"], log_regex="READY")
+    )
+    with pytest.raises(RuntimeError, match="exited with code 3"):
+        await crashing.start()
+
+
+@pytest.mark.asyncio
+async def test_supervisor_restarts_a_killed_http_backend(fast_backoff) -> None:
+    worker = CommandWorker(
+        "http-backend",
+        _launch(
+            "http",
+            [sys.executable, "-m", "http.server", "{port}", "--bind", "127.0.0.1"],
+            http_url="http://127.0.0.1:{port}/",
+        ),
+    )
+    supervisor = Supervisor()
+    status = await supervisor.start_worker(worker)
+    first_pid = status.pid
+    assert status.state == "running" and await worker.probe()
+
+    os.kill(first_pid, 9)
+    for _ in range(100):
+        if not worker.running:
+            break
+        await asyncio.sleep(0.02)
+    await supervisor.check()
+    await supervisor.check()
+    await _settle(supervisor)
+
+    assert status.state == "running" and status.restarts == 1
+    assert status.pid not in (None, first_pid)
+    assert await worker.probe()
+    await supervisor.close()
+    assert not worker.running
+
+
+def _ctx(registry: ModelRegistry) -> RunContext:
+    return RunContext(
+        request_id="req_supervised",
+        logger=logging.getLogger("test"),
+        data_dir="",
+        cache_dir="",
+        platform="linux-x64",
+        registry=registry,
+        http_client=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_crashed_model_worker_is_restarted_and_serves_again(tmp_path, fast_backoff) -> None:
+    supervisor = Supervisor()
+    fixture = LoadedModel(
+        name="worker_fixture_model",
+        module=LazyModule("worker_fixture_model"),
+        spec=validate_spec(worker_fixture_model.SPEC),
+        hook_names=frozenset({"SPEC", "load", "warmup", "run"}),
+    )
+    settings = WorkerSettings(str(tmp_path), str(tmp_path), "linux-x64", supervisor=supervisor)
+    registry = ModelRegistry(isolate_models([fixture], settings), "linux-x64", logging.getLogger("test"))
+    model_id = fixture.spec.id
+    adapter = registry.get_loaded(model_id).module
+    pool = await registry.ensure_instance(model_id, _ctx(registry))
+    (status,) = supervisor.status()
+    first_pid = status.pid
+    assert status.kind == "model" and status.running
+    await supervisor.check()
+
+    with pytest.raises(WorkerExitedError):
+        await adapter.run(RunRequest(endpoint="responses", json={"action": "exit"}), _ctx(registry))
+    await supervisor.check()
+    assert status.state == "backoff"
+    await supervisor.check()
+    await _settle(supervisor)
+
+    result = await adapter.run(RunRequest(endpoint="responses"), _ctx(registry))
+    assert status.restarts == 1
+    assert result["pid"] == status.pid != first_pid
+
+    assert await registry.unload(model_id, _ctx(registry), reason="test")
+    assert supervisor.status() == []
+    assert not pool.workers[0].running
+    await supervisor.close()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from local_runtime.helpers.transcription_cache import TranscriptionCache, transcription_cache_key
+
+RESULT = {"text": "I hear you.", "segments": [{"start": 0.0, "end": 0.8, "text": "I hear you."}]}
+
+
+def test_key_covers_audio_model_and_decoding_settings() -> None:
+    base = transcription_cache_key(b"audio", model_id="stt", revision="r1", language="en", beam_size=5)
+
+    assert base == transcription_cache_key(
+        b"audio", model_id="stt", revision="r1", beam_size=5, language="en"
+    )
+    assert base != transcription_cache_key(
+        b"audio!", model_id="stt", revision="r1", language="en", beam_size=5
+    )
+    assert base != transcription_cache_key(
+        b"audio", model_id="stt", revision="r2", language="en", beam_size=5
+    )
+    assert base != transcription_cache_key(
+        b"audio", model_id="stt", revision="r1", language="fr", beam_size=5
+    )
+    assert base != transcription_cache_key(
+        b"audio", model_id="stt", revision="r1", language="en", beam_size=1
+    )
+
+
+def test_results_survive_a_restart_through_the_disk_tier(tmp_path) -> None:
+    cache = TranscriptionCache(tmp_path, max_bytes=1024 * 1024)
+    key = transcription_cache_key(b"audio", model_id="stt", revision=None)
+
+    assert cache.get(key) is None
+    assert cache.put(key, RESULT)
+    cached = cache.get(key)
+    cached["text"] = "mutated"
+
+    reopened = TranscriptionCache(tmp_path, max_bytes=1024 * 1024)
+
+    assert reopened.get(key) == RESULT
+    assert reopened.get(key) == RESULT
+    assert cache.snapshot()["memory_hits"] == 1
+    assert cache.snapshot()["misses"] == 1
+    assert reopened.snapshot()["disk_hits"] == 1
+    assert reopened.snapshot()["memory_hits"] == 1
+    assert reopened.snapshot()["entries"] == 1
+
+
+def test_least_recently_used_files_are_evicted_over_budget(tmp_path) -> None:
+    keys = [transcription_cache_key(bytes([index]), model_id="stt", revision=None) for index in range(3)]
+    probe = TranscriptionCache(tmp_path / "probe", max_bytes=1024 * 1024)
+    probe.put(keys[0], RESULT)
+    entry_bytes = probe.snapshot()["bytes"]
+    cache = TranscriptionCache(tmp_path / "cache", max_bytes=entry_bytes * 2, memory_entries=0)
+
+    cache.put(keys[0], RESULT)
+    cache.put(keys[1], RESULT)
+    assert cache.get(keys[0]) == RESULT
+    cache.put(keys[2], RESULT)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == RESULT
+    assert cache.get(keys[2]) == RESULT
+    snapshot = cache.snapshot()
+    assert snapshot["evictions"] == 1
+    assert snapshot["entries"] == 2
+    assert snapshot["bytes"] <= snapshot["max_bytes"]
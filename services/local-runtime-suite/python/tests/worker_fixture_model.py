@@ -0,0 +1,76 @@
+"""Adapter served from a worker process in the subprocess-execution tests."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+
+from local_runtime.runtime_types import RunContext, RunRequest
+
+SPEC = {
+    "id": "local//test/worker-fixture",
+    "kind": "llm",
+    "display": {"title": "Worker fixture", "description": "Test adapter.", "tags": ["test"]},
+    "compat": {
+        "platforms": ["darwin-arm64", "darwin-x64", "windows-x64", "linux-x64"],
+        "acceleration": ["cpu"],
+        "priority": 0,
+        "requires_ram_gb": 0,
+        "requires_vram_gb": 0,
+        "disk_gb": 0,
+    },
+    "api": {"endpoint": "responses", "advertised_model_name": "worker-fixture", "supports_stream": True},
+    "limits": {"timeout_sec": 30, "concurrency": 1, "max_input_mb": 1, "max_output_tokens_default": 16},
+    "backend": {"provider": "custom", "model_ref": "fixture", "device_hint": "cpu", "extra": {}},
+    "execution": {"mode": "subprocess", "warmup_on_start": False},
+    "launch": {
+        "enabled": False,
+        "type": "external",
+        "explain": "Test fixture.",
+        "env": {},
+        "cmd": [],
+        "ready": {"kind": "log", "timeout_sec": 1},
+    },
+    "ui_params": [],
+    "deps": {"python_extras": [], "pip": [], "system": [], "notes": ""},
+}
+
+
+def load(ctx: RunContext) -> dict:
+    return {"pid": os.getpid(), "warm": False}
+
+
+def warmup(instance: dict, ctx: RunContext) -> None:
+    instance["warm"] = True
+
+
+async def _events(count: int, ctx: RunContext):
+    for index in range(count):
+        yield {"event": "response.output_text.delta", "data": {"id": "resp_worker", "delta": str(index)}}
+        await asyncio.sleep(0)
+
+
+async def run(req: RunRequest, ctx: RunContext):
+    instance = await ctx.registry.ensure_instance(SPEC["id"], ctx)
+    action = (req.payload or {}).get("action")
+    if action == "fail":
+        raise ValueError("fixture failure")
+    if action == "exit":
+        os._exit(3)
+    if action == "describe_file":
+        data = req.files["file"]["data"]
+        return {
+            "type": type(data).__name__,
+            "size": len(data),
+            "head": bytes(data[:4]),
+            "tail": bytes(data[-4:]),
+        }
+    if action == "wait_for_cancel":
+        while True:
+            ctx.cancellation_token.raise_if_cancelled()
+            await asyncio.sleep(0.01)
+    if req.stream:
+        return _events(3, ctx)
+    with ctx.timings.phase("decode"):
+        ctx.logger.info("fixture.run", extra={"model_id": SPEC["id"]})
+    return {"pid": instance["pid"], "warm": instance["warm"], "request": req.payload}
@@ -0,0 +1,317 @@
+"""Microbenchmarks for the per-request code every gateway call goes through.
+
+Covers the request-context middleware (called directly and through the full ASGI
+stack with CORS), SSE framing, the structured log formatter and the JSON-schema
+helpers used by structured outputs. Each case is calibrated so one round takes
+roughly ``--round-ms`` and reports per-call statistics in microseconds.
+
+Results are compared against ``bench_hot_path_baseline.json`` on the fastest round,
+which is the statistic least disturbed by background load; a case that slows down by
+more than ``--max-regression`` fails the run. Baselines are only
+comparable on the machine that recorded them, so refresh the file with ``--save``
+when moving to new release hardware.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+PYTHON_PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PYTHON_PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PYTHON_PROJECT_ROOT))
+
+BASELINE_PATH = Path(__file__).with_name("bench_hot_path_baseline.json")
+ACCESS_TOKEN = "bench-hot-path-access-token-0123456789"
+BROWSER_ORIGIN = "http://localhost:5173"
+REQUEST_ID = "lrq_" + "0123456789abcdef" * 2
+STREAM_DELTAS = 64
+
+EVALUATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "overall_score": {"type": "integer", "minimum": 0, "maximum": 4},
+        "summary": {"type": "string"},
+        "criteria": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "score": {"type": "integer", "minimum": 0, "maximum": 4},
+                    "rationale": {"type": "string"},
+                },
+                "required": ["id", "score"],
+            },
+        },
+        "suggestions": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["overall_score"],
+}
+EVALUATION = {
+    "overall_score": 3,
+    "summary": "Accurate reflection with a warm, steady tone.",
+    "criteria": [
+        {"id": f"criterion_{index}", "score": index % 5, "rationale": "Named the client's feeling."}
+        for index in range(6)
+    ],
+    "suggestions": ["Slow down before the reflection.", "Name the underlying need."],
+}
+
+Runner = Callable[[int], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    run: Runner
+
+
+def _sync(function: Callable[[], Any]) -> Runner:
+    async def _run(iterations: int) -> None:
+        for _ in range(iterations):
+            function()
+
+    return _run
+
+
+def _http_scope(app: Any, method: str, path: str, headers: dict[str, str]) -> dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(name.encode(), value.encode()) for name, value in headers.items()],
+        "server": ("127.0.0.1", 8484),
+        "client": ("127.0.0.1", 50000),
+        "app": app,
+    }
+
+
+def build_cases(app: Any | None = None) -> list[Case]:
+    """Benchmark cases; the middleware cases need a started gateway ``app``."""
+    from local_runtime.api.openai_compat import format_responses_stream
+    from local_runtime.core.logging import StructuredFormatter
+    from local_runtime.core.sse import format_sse_event
+    from local_runtime.helpers.structured_output import make_openai_strict_schema, validate_against_schema
+
+    cases: list[Case] = []
+    if app is not None:
+        from starlette.requests import Request
+        from starlette.responses import Response
+
+        from local_runtime.main import request_context_middleware
+
+        headers = {
+            "host": "127.0.0.1:8484",
+            "origin": BROWSER_ORIGIN,
+            "authorization": f"Bearer {ACCESS_TOKEN}",
+            "x-request-id": REQUEST_ID,
+            "content-type": "application/json",
+        }
+        middleware_scope = _http_scope(app, "POST", "/v1/responses", headers)
+
+        async def _call_next(_request: Request) -> Response:
+            return Response(status_code=204)
+
+        async def _middleware(iterations: int) -> None:
+            for _ in range(iterations):
+                await request_context_middleware(Request(middleware_scope), _call_next)
+
+        health_scope = _http_scope(
+            app, "GET", "/health", {"host": "127.0.0.1:8484", "origin": BROWSER_ORIGIN}
+        )
+
+        async def _receive() -> dict[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def _send(_message: dict[str, Any]) -> None:
+            return None
+
+        async def _stack(iterations: int) -> None:
+            for _ in range(iterations):
+                await app(dict(health_scope), _receive, _send)
+
+        cases += [
+            Case("middleware.request_context", _middleware),
+            Case("middleware.asgi_stack_health", _stack),
+        ]
+
+    delta = {"id": "resp_0123456789abcdef", "delta": "reflect "}
+    stream_events = [
+        {"event": "response.created", "data": {"id": delta["id"], "status": "in_progress"}},
+        *({"event": "response.output_text.delta", "data": delta} for _ in range(STREAM_DELTAS)),
+        {"event": "response.completed", "data": {"id": delta["id"], "status": "completed"}},
+    ]
+
+    async def _events() -> AsyncIterator[dict]:
+        for event in stream_events:
+            yield event
+
+    async def _stream(iterations: int) -> None:
+        for _ in range(iterations):
+            async for _chunk in format_responses_stream(_events()):
+                pass
+
+    formatter = StructuredFormatter()
+    record = logging.getLogger("local-runtime").makeRecord(
+        "local-runtime",
+        logging.INFO,
+        __file__,
+        0,
+        "request.complete",
+        None,
+        None,
+        extra={
+            "request_id": REQUEST_ID,
+            "endpoint": "/v1/responses",
+            "status": 200,
+            "duration_ms": 12.34,
+        },
+    )
+    strict_schema = make_openai_strict_schema(EVALUATION_SCHEMA)
+
+    cases += [
+        Case(f"sse.format_responses_stream[{STREAM_DELTAS}_deltas]", _stream),
+        Case("sse.format_sse_event", _sync(lambda: format_sse_event("response.output_text.delta", delta))),
+        Case("logging.structured_format", _sync(lambda: formatter.format(record))),
+        Case(
+            "schema.validate_against_schema",
+            _sync(lambda: validate_against_schema(EVALUATION, strict_schema)),
+        ),
+        Case("schema.make_openai_strict_schema", _sync(lambda: make_openai_strict_schema(EVALUATION_SCHEMA))),
+    ]
+    return cases
+
+
+async def measure(case: Case, *, rounds: int, round_ms: float) -> dict[str, Any]:
+    """Calibrate iterations per round, then time ``rounds`` rounds; per-call stats in microseconds."""
+    await case.run(1)  # first calls pay for lazy imports and caches
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        await case.run(iterations)
+        elapsed = time.perf_counter() - start
+        if elapsed * 1000 >= round_ms or iterations >= 1_000_000:
+            break
+        iterations *= 2 if elapsed <= 0 else max(2, min(10, int(round_ms / 1000 / elapsed) + 1))
+    per_call: list[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await case.run(iterations)
+        per_call.append((time.perf_counter() - start) / iterations * 1_000_000)
+    median = statistics.median(per_call)
+    return {
+        "rounds": rounds,
+        "iterations": iterations,
+        "min_us": round(min(per_call), 3),
+        "median_us": round(median, 3),
+        "mean_us": round(statistics.fmean(per_call), 3),
+        "stddev_us": round(statistics.stdev(per_call), 3) if rounds > 1 else 0.0,
+        "ops_per_second": round(1_000_000 / median, 1) if median > 0 else 0.0,
+    }
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], max_regression: float) -> list[str]:
+    """Describe every case whose fastest round is more than ``max_regression`` slower than the baseline."""
+    regressions: list[str] = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        before, after = previous["min_us"], current["min_us"]
+        if before > 0 and after > before * (1 + max_regression):
+            regressions.append(
+                f"{name}: {before:.2f} us -> {after:.2f} us (+{(after / before - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def _prepare_environment(workdir: Path) -> None:
+    config_path = workdir / "config.json"
+    config_path.write_text(
+        json.dumps(
+            {
+                "access_token": ACCESS_TOKEN,
+                "data_dir": str(workdir / "data"),
+                "cache_dir": str(workdir / "cache"),
+            }
+        ),
+        encoding="utf-8",
+    )
+    os.environ["LOCAL_RUNTIME_CONFIG"] = str(config_path)
+    for name in ("LOCAL_RUNTIME_SELFTEST", "LOCAL_RUNTIME_PRELOAD_ALL", "LOCAL_RUNTIME_PRELOAD_DEFAULTS"):
+        os.environ[name] = "0"
+
+
+async def _run_all(selected: str | None, rounds: int, round_ms: float, log_stream: Any) -> dict[str, dict]:
+    from local_runtime.main import app
+
+    async with app.router.lifespan_context(app):
+        # Keep formatting and buffering costs but send the per-request lines nowhere.
+        for handler in logging.getLogger().handlers:
+            if isinstance(handler, logging.StreamHandler):
+                handler.setStream(log_stream)
+        results: dict[str, dict] = {}
+        for case in build_cases(app):
+            if selected and selected not in case.name:
+                continue
+            results[case.name] = await measure(case, rounds=rounds, round_ms=round_ms)
+        return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--select", help="only run cases whose name contains this text")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--round-ms", type=float, default=20.0)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="overwrite the baseline with these results")
+    parser.add_argument("--max-regression", type=float, default=0.3, help="allowed fractional slowdown")
+    args = parser.parse_args(argv)
+
+    with (
+        tempfile.TemporaryDirectory(prefix="bench-hot-path-") as workdir,
+        open(os.devnull, "w", encoding="utf-8") as log_stream,
+    ):
+        _prepare_environment(Path(workdir))
+        results = asyncio.run(_run_all(args.select, args.rounds, args.round_ms, log_stream))
+
+    width = max(len(name) for name in results)
+    for name, stats in results.items():
+        print(
+            f"{name:<{width}}  median {stats['median_us']:>10.2f} us  "
+            f"min {stats['min_us']:>10.2f} us  stddev {stats['stddev_us']:>8.2f} us  "
+            f"{stats['ops_per_second']:>12.1f} ops/s"
+        )
+    if args.save:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.write_text(f"{json.dumps(baseline, indent=2, sort_keys=True)}\n", encoding="utf-8")
+        return 0
+    if not args.baseline.exists():
+        return 0
+    regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.max_regression)
+    for regression in regressions:
+        print(f"regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""Throughput and latency benchmark for the local runtime gateway.
+
+Every adapter is replaced by a synthetic model with configurable prefill latency,
+decode rate and transcription time, so the numbers measure the gateway (routing,
+auth, queueing, validation, SSE framing) rather than a real backend. Per-request
+gateway overhead is the client-observed latency minus the synthetic model time.
+
+Two modes:
+
+* ``inprocess`` drives the ASGI app through ``httpx.ASGITransport``. There is no
+  socket, and streamed bodies are buffered, so time to first byte is not reported.
+* ``http`` serves the app with uvicorn on a loopback port and drives it over HTTP.
+
+The JSON report can be saved with ``--output`` and compared against a saved
+report with ``--baseline``; the command exits non-zero when a p95 latency or the
+throughput regresses by more than ``--max-regression``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[3]
+PYTHON_ROOT = ROOT / "services" / "local-runtime-suite" / "python"
+
+sys.path.insert(0, str(PYTHON_ROOT))
+
+ACCESS_TOKEN = "bench-gateway-access-token-0123456789"
+REQUEST_KINDS = ("plain", "stream", "schema", "transcribe")
+DEFAULT_MIX = "plain=4,stream=3,schema=2,transcribe=1"
+BENCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer", "minimum": 0, "maximum": 4},
+        "feedback": {"type": "string"},
+    },
+    "required": ["score", "feedback"],
+    "additionalProperties": False,
+}
+PROMPT_SENTENCE = "The client describes feeling overwhelmed at work. "
+BENCH_JSON = json.dumps(
+    {"score": 3, "feedback": "Clear reflection of the client's feeling."},
+)
+
+
+@dataclass(frozen=True)
+class SyntheticModel:
+    prefill_ms: float = 50.0
+    tokens_per_second: float = 200.0
+    output_tokens: int = 64
+    transcribe_ms: float = 100.0
+
+    def modeled_seconds(self, kind: str) -> float:
+        if kind == "transcribe":
+            return self.transcribe_ms / 1000
+        return self.prefill_ms / 1000 + self.output_tokens / self.tokens_per_second
+
+    async def run(self, req: Any, _ctx: Any) -> Any:
+        from local_runtime.helpers.responses_helpers import new_response
+
+        started = time.perf_counter()
+        if req.endpoint in {"audio.transcriptions", "audio.translations"}:
+            await _sleep_until(started + self.transcribe_ms / 1000)
+            text = "synthetic transcript " * 8
+            return {
+                "text": text.strip(),
+                "segments": [{"id": 0, "start": 0.0, "end": 4.0, "text": text}],
+            }
+        model_id = req.model or "bench"
+        text = BENCH_JSON if req.response_schema else "word " * self.output_tokens
+        if req.stream:
+            return self._stream(model_id, text, started, req)
+        await _sleep_until(started + self.modeled_seconds("plain"))
+        return new_response(model_id, text)
+
+    async def _stream(
+        self,
+        model_id: str,
+        text: str,
+        started: float,
+        req: Any,
+    ) -> AsyncIterator[dict]:
+        from local_runtime.helpers.responses_helpers import new_response
+
+        response = new_response(model_id, "")
+        yield {"event": "response.created", "data": response}
+        chunks = [text[index : index + 5] for index in range(0, len(text), 5)] or [""]
+        first_token_at = started + self.prefill_ms / 1000
+        chunk_seconds = self.output_tokens / self.tokens_per_second / len(chunks)
+        for index, chunk in enumerate(chunks):
+            # Pace against absolute deadlines so sleep overshoot does not accumulate.
+            await _sleep_until(first_token_at + index * chunk_seconds)
+            yield {
+                "event": "response.output_text.delta",
+                "data": {"id": response["id"], "delta": chunk},
+            }
+        response["output_text"] = text
+        yield {
+            "event": "response.output_text.done",
+            "data": {"id": response["id"], "text": text},
+        }
+        yield {"event": "response.completed", "data": response}
+
+
+async def _sleep_until(deadline: float) -> None:
+    remaining = deadline - time.perf_counter()
+    if remaining > 0:
+        await asyncio.sleep(remaining)
+
+
+@dataclass
+class Sample:
+    kind: str
+    status: int
+    latency_s: float
+    modeled_s: float
+    ttfb_s: float | None = None
+
+
+@dataclass
+class BenchConfig:
+    mode: str = "inprocess"
+    requests: int = 200
+    concurrency: int = 8
+    warmup: int = 8
+    mix: dict[str, int] = field(default_factory=lambda: parse_mix(DEFAULT_MIX))
+    prompt_chars: int = 2000
+    audio_kb: int = 256
+    seed: int = 7
+    model: SyntheticModel = field(default_factory=SyntheticModel)
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix: dict[str, int] = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        kind, _, weight = item.partition("=")
+        kind = kind.strip()
+        if kind not in REQUEST_KINDS:
+            raise ValueError(
+                f"Unknown request kind {kind!r}; expected one of {', '.join(REQUEST_KINDS)}",
+            )
+        mix[kind] = int(weight or 1)
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError(
+            "The request mix needs at least one kind with a positive weight",
+        )
+    return mix
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Linearly interpolated percentile of ``values`` (``fraction`` in 0..1)."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _distribution_ms(values: list[float]) -> dict[str, float]:
+    return {
+        "p50": round(percentile(values, 0.50) * 1000, 3),
+        "p95": round(percentile(values, 0.95) * 1000, 3),
+        "p99": round(percentile(values, 0.99) * 1000, 3),
+        "mean": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "max": round(max(values, default=0.0) * 1000, 3),
+    }
+
+
+def summarize(samples: list[Sample], elapsed_s: float) -> dict[str, Any]:
+    def _group(group: list[Sample]) -> dict[str, Any]:
+        ok = [sample for sample in group if sample.status < 400]
+        summary: dict[str, Any] = {
+            "count": len(group),
+            "errors": len(group) - len(ok),
+            "latency_ms": _distribution_ms([sample.latency_s for sample in ok]),
+            "overhead_ms": _distribution_ms(
+                [max(0.0, sample.latency_s - sample.modeled_s) for sample in ok],
+            ),
+        }
+        ttfb = [sample.ttfb_s for sample in ok if sample.ttfb_s is not None]
+        if ttfb:
+            summary["ttfb_ms"] = _distribution_ms(ttfb)
+        return summary
+
+    by_kind: dict[str, list[Sample]] = {}
+    for sample in samples:
+        by_kind.setdefault(sample.kind, []).append(sample)
+    return {
+        "requests": len(samples),
+        "elapsed_s": round(elapsed_s, 3),
+        "throughput_rps": round(len(samples) / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+        "overall": _group(samples),
+        "by_kind": {kind: _group(by_kind[kind]) for kind in sorted(by_kind)},
+    }
+
+
+def _request_plan(config: BenchConfig, count: int, rng: random.Random) -> list[str]:
+    kinds = [kind for kind, weight in config.mix.items() if weight > 0]
+    weights = [config.mix[kind] for kind in kinds]
+    return rng.choices(kinds, weights=weights, k=count)
+
+
+async def _send(
+    client: Any,
+    kind: str,
+    config: BenchConfig,
+    prompt: str,
+    audio: bytes,
+) -> Sample:
+    started = time.perf_counter()
+    ttfb: float | None = None
+    if kind == "transcribe":
+        response = await client.post(
+            "/v1/audio/transcriptions",
+            data={"response_format": "json"},
+            files={"file": ("bench.wav", audio, "audio/wav")},
+        )
+        status = response.status_code
+    elif kind == "stream":
+        async with client.stream(
+            "POST",
+            "/v1/responses",
+            json={"input": prompt, "stream": True},
+        ) as response:
+            status = response.status_code
+            async for _chunk in response.aiter_bytes():
+                if ttfb is None:
+                    ttfb = time.perf_counter() - started
+    else:
+        payload: dict[str, Any] = {"input": prompt}
+        if kind == "schema":
+            payload["text"] = {
+                "format": {
+                    "type": "json_schema",
+                    "name": "BenchResult",
+                    "schema": BENCH_SCHEMA,
+                    "strict": True,
+                }
+            }
+        response = await client.post("/v1/responses", json=payload)
+        status = response.status_code
+    latency = time.perf_counter() - started
+    if config.mode != "http":
+        ttfb = None
+    return Sample(kind, status, latency, config.model.modeled_seconds(kind), ttfb)
+
+
+async def _drive(client: Any, config: BenchConfig) -> dict[str, Any]:
+    rng = random.Random(config.seed)
+    repeats = config.prompt_chars // len(PROMPT_SENTENCE) + 1
+    prompt = (PROMPT_SENTENCE * repeats)[: config.prompt_chars]
+    audio = b"RIFF" + bytes(max(0, config.audio_kb * 1024 - 4))
+    for kind in _request_plan(config, config.warmup, rng):
+        await _send(client, kind, config, prompt, audio)
+
+    plan = _request_plan(config, config.requests, rng)
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for kind in plan:
+        queue.put_nowait(kind)
+    samples: list[Sample] = []
+
+    async def _worker() -> None:
+        while True:
+            try:
+                kind = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            samples.append(await _send(client, kind, config, prompt, audio))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(max(1, config.concurrency))))
+    return summarize(samples, time.perf_counter() - started)
+
+
+def _install_synthetic_models(app: Any, model: SyntheticModel) -> None:
+    # Gateway logs stay on (they are part of the overhead); per-request client logs are noise.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    for loaded in app.state.registry.list_models():
+        loaded.module.run = model.run
+
+
+def _client_kwargs(base_url: str) -> dict[str, Any]:
+    return {
+        "base_url": base_url,
+        "headers": {"Authorization": f"Bearer {ACCESS_TOKEN}"},
+        "timeout": 120.0,
+    }
+
+
+async def _run_inprocess(config: BenchConfig) -> dict[str, Any]:
+    import httpx
+    from local_runtime.main import app
+
+    async with app.router.lifespan_context(app):
+        _install_synthetic_models(app, config.model)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, **_client_kwargs("http://127.0.0.1:8484")
+        ) as client:
+            return await _drive(client, config)
+
+
+def _free_loopback_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _run_http(config: BenchConfig) -> dict[str, Any]:
+    import httpx
+    import uvicorn
+    from local_runtime.main import app
+
+    port = _free_loopback_port()
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"),
+    )
+    thread = threading.Thread(target=server.run, name="bench-gateway", daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            if not thread.is_alive():
+                raise RuntimeError("The gateway failed to start")
+            await asyncio.sleep(0.05)
+        _install_synthetic_models(app, config.model)
+        limits = httpx.Limits(
+            max_connections=config.concurrency,
+            max_keepalive_connections=config.concurrency,
+        )
+        client_kwargs = _client_kwargs(f"http://127.0.0.1:{port}")
+        async with httpx.AsyncClient(limits=limits, **client_kwargs) as client:
+            return await _drive(client, config)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+def _prepare_environment(workdir: Path) -> None:
+    config_path = workdir / "config.json"
+    config_path.write_text(
+        json.dumps(
+            {
+                "access_token": ACCESS_TOKEN,
+                "data_dir": str(workdir / "data"),
+                "cache_dir": str(workdir / "cache"),
+            }
+        ),
+        encoding="utf-8",
+    )
+    os.environ["LOCAL_RUNTIME_CONFIG"] = str(config_path)
+    for name in (
+        "LOCAL_RUNTIME_SELFTEST",
+        "LOCAL_RUNTIME_PRELOAD_ALL",
+        "LOCAL_RUNTIME_PRELOAD_DEFAULTS",
+    ):
+        os.environ[name] = "0"
+
+
+def run_benchmark(config: BenchConfig) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="bench-gateway-") as workdir:
+        _prepare_environment(Path(workdir))
+        runner = _run_http if config.mode == "http" else _run_inprocess
+        results = asyncio.run(runner(config))
+    return {
+        "config": {
+            "mode": config.mode,
+            "requests": config.requests,
+            "concurrency": config.concurrency,
+            "mix": config.mix,
+            "prompt_chars": config.prompt_chars,
+            "audio_kb": config.audio_kb,
+            "synthetic_model": config.model.__dict__,
+        },
+        **results,
+    }
+
+
+def compare(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    max_regression: float,
+) -> list[str]:
+    """Return descriptions of p95 latency and throughput regressions beyond ``max_regression``."""
+    regressions: list[str] = []
+    for kind, current in report["by_kind"].items():
+        previous = baseline.get("by_kind", {}).get(kind)
+        if not previous:
+            continue
+        before, after = previous["latency_ms"]["p95"], current["latency_ms"]["p95"]
+        if before > 0 and after > before * (1 + max_regression):
+            regressions.append(f"{kind} p95 latency {before:.1f} ms -> {after:.1f} ms")
+    before, after = baseline.get("throughput_rps", 0.0), report["throughput_rps"]
+    if before > 0 and after < before * (1 - max_regression):
+        regressions.append(f"throughput {before:.1f} rps -> {after:.1f} rps")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("inprocess", "http"), default="inprocess")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=8)
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help=f"weighted request kinds (default {DEFAULT_MIX})",
+    )
+    parser.add_argument("--prompt-chars", type=int, default=2000)
+    parser.add_argument("--audio-kb", type=int, default=256)
+    parser.add_argument("--prefill-ms", type=float, default=50.0)
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--output-tokens", type=int, default=64)
+    parser.add_argument("--transcribe-ms", type=float, default=100.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="write the JSON report to this file",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="compare against a previously saved report",
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="allowed fractional regression",
+    )
+    args = parser.parse_args(argv)
+
+    config = BenchConfig(
+        mode=args.mode,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        warmup=args.warmup,
+        mix=parse_mix(args.mix),
+        prompt_chars=args.prompt_chars,
+        audio_kb=args.audio_kb,
+        seed=args.seed,
+        model=SyntheticModel(
+            prefill_ms=args.prefill_ms,
+            tokens_per_second=args.tokens_per_second,
+            output_tokens=args.output_tokens,
+            transcribe_ms=args.transcribe_ms,
+        ),
+    )
+    report = run_benchmark(config)
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(f"{rendered}\n", encoding="utf-8")
+    print(rendered)
+    if args.baseline:
+        regressions = compare(
+            report,
+            json.loads(args.baseline.read_text(encoding="utf-8")),
+            args.max_regression,
+        )
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())